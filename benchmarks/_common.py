@@ -0,0 +1,34 @@
+"""
+Helpers shared by the benchmark scripts: timing of a call and writing the
+JSON results with a description of the interpreter and platform.
+"""
+
+import json
+import platform
+import time
+
+
+def measure(function, number, repeat):
+    """Return the best time per call in seconds over repeat runs of number calls."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None or elapsed < best else best
+    return best
+
+def meta():
+    """Describe the interpreter and platform the results were measured on."""
+    return dict(Python=platform.python_version(), Implementation=platform.python_implementation(),
+            Platform=platform.platform(), Time=time.strftime('%Y-%m-%dT%H:%M:%S%z'))
+
+def write_results(results, output=None):
+    """Write the results as JSON to the output file, or to stdout if it is None."""
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if output:
+        with open(output, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
@@ -0,0 +1,76 @@
+"""
+Call overhead of the ctypes and cffi bindings of the D2XX library.
+
+Measures GetQueueStatus, Write and Read of small transfers on an open
+device, once through ctypes and once through cffi (pyftd2xx.UseBinding).
+It needs the native D2XX library and a device; Read is only measured when
+the written data comes back, i.e. with TX connected to RX, and reported
+as null otherwise.
+
+Usage:
+    python benchmarks/bench_bindings.py [--library PATH] [--device INDEX] [--output results.json] [--quick]
+
+--library loads a D2XX library from a path, e.g. libftd2xx.so, instead of
+the one pyftd2xx finds itself. The results are written as JSON, to stdout
+if no output file is given.
+"""
+
+import argparse
+import ctypes
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import pyftd2xx as ft
+from _common import measure, meta, write_results
+
+
+BINDINGS = ('ctypes', 'cffi')
+SIZES = (1, 64)
+
+
+def bench_binding(handle, number, repeat):
+    """Nanoseconds per call of the hot path functions with the current binding."""
+    results = dict(GetQueueStatus=measure(lambda: ft.GetQueueStatus(handle), number, repeat) * 1e9)
+    for size in SIZES:
+        data = bytes(size)
+        ft.Purge(handle, ft.FT.PURGE_RX_TX)
+        results['Write.%d' % size] = measure(lambda: ft.Write(handle, data), number, repeat) * 1e9
+        # Every write of the measurement comes back with a loopback
+        deadline = time.monotonic() + 1.0
+        while ft.GetQueueStatus(handle) < size * number * repeat and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if ft.GetQueueStatus(handle) >= size * number * repeat:
+            results['Read.%d' % size] = measure(lambda: ft.Read(handle, size), number, repeat) * 1e9
+        else:
+            results['Read.%d' % size] = None
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--library', help='Path of the D2XX library to load.')
+    parser.add_argument('--device', type=int, default=0, help='Index of the device. Defaults to 0.')
+    parser.add_argument('--output', '-o', help='File to write the JSON results to, stdout if omitted.')
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations, for a smoke test.')
+    args = parser.parse_args(argv)
+    number, repeat = (200, 3) if args.quick else (2000, 5)
+    if args.library:
+        ft.UseBackend(ctypes.CDLL(args.library))
+    handle = ft.Open(args.device)
+    results = {}
+    try:
+        ft.SetTimeouts(handle, 100, 100)
+        for binding in BINDINGS:
+            ft.UseBinding(binding)
+            results[binding] = bench_binding(handle, number, repeat)
+    finally:
+        ft.UseBinding('ctypes')
+        ft.Close(handle)
+    results = dict(Meta=meta(), CallsNs=results)
+    write_results(results, args.output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Benchmarks of the pyftd2xx wrappers against the simulated D2XX library.
+
+Measures the per call overhead of the wrappers, the bulk read and write
+throughput over a range of chunk sizes and the cost of enumerating 1 to 128
+devices. The simulated library answers without doing any I/O, so the
+results are the cost of the Python and ctypes side alone.
+
+Usage:
+    python benchmarks/bench_wrappers.py [--output results.json] [--quick]
+
+The results are written as JSON, to stdout if no output file is given.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import pyftd2xx as ft
+from pyftd2xx._sim import SimulatedLibrary
+from _common import measure, meta, write_results
+
+
+CHUNK_SIZES = (64, 512, 4096, 16384, 65536, 262144)
+DEVICE_COUNTS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def bench_calls(number, repeat):
+    """Per call overhead of the wrappers on an open device."""
+    ft.UseBackend(SimulatedLibrary(4))
+    handle = ft.Open(0)
+    calls = {
+        'GetQueueStatus': lambda: ft.GetQueueStatus(handle),
+        'GetStatus': lambda: ft.GetStatus(handle),
+        'Write': lambda: ft.Write(handle, b'x'),
+        'Read': lambda: ft.Read(handle, 1),
+        'GetDeviceInfoList': ft.GetDeviceInfoList,
+        'ListDevices.NumberOnly': lambda: ft.ListDevices([ft.FT.LIST_NUMBER_ONLY]),
+        'ListDevices.All': lambda: ft.ListDevices([ft.FT.LIST_ALL, ft.FT.OPEN_BY_SERIAL_NUMBER]),
+    }
+    results = {}
+    for name, function in calls.items():
+        if name == 'Read':
+            # Keep one byte queued for every read
+            ft.Write(handle, b'x' * (number * repeat))
+        results[name] = measure(function, number, repeat) * 1e9
+    ft.Close(handle)
+    return results
+
+def bench_bulk(repeat, total):
+    """Throughput of Read and Write per chunk size in MB/s."""
+    library = SimulatedLibrary(1, Streaming=True)
+    ft.UseBackend(library)
+    handle = ft.Open(0)
+    results = {}
+    for size in CHUNK_SIZES:
+        data = bytes(size)
+        number = max(1, total // size)
+        read = measure(lambda: ft.Read(handle, size), number, repeat)
+        write = measure(lambda: ft.Write(handle, data), number, repeat)
+        results[str(size)] = dict(ReadMBps=size / read / 1e6, WriteMBps=size / write / 1e6)
+    ft.Close(handle)
+    return results
+
+def bench_enumeration(number, repeat):
+    """Time in microseconds to enumerate a number of devices."""
+    results = {}
+    for count in DEVICE_COUNTS:
+        ft.UseBackend(SimulatedLibrary(count))
+        results[str(count)] = dict(
+            CreateDeviceInfoList=measure(ft.CreateDeviceInfoList, number, repeat) * 1e6,
+            GetDeviceInfoList=measure(ft.GetDeviceInfoList, number, repeat) * 1e6,
+            ListDevices=measure(lambda: ft.ListDevices([ft.FT.LIST_ALL, ft.FT.OPEN_BY_SERIAL_NUMBER]), number, repeat) * 1e6)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', '-o', help='File to write the JSON results to, stdout if omitted.')
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations, for a smoke test.')
+    args = parser.parse_args(argv)
+    number, repeat, total = (200, 3, 1 << 20) if args.quick else (5000, 5, 16 << 20)
+    results = dict(
+        Meta=meta(),
+        CallsNs=bench_calls(number, repeat),
+        Bulk=bench_bulk(repeat, total),
+        EnumerationUs=bench_enumeration(max(1, number // 50), repeat))
+    write_results(results, args.output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,19 @@
 from .pyftd2xx import *
+from .instrumentation import *
+from .retry import *
+from .hotplug import *
+from .framing import *
+from .request import *
+from .multi import *
+from .timestamps import *
+from .record import *
+from .userarea import *
+from .events import *
+from .modem import *
+from .stream import *
+from .serialport import *
+from .writer import *
+from .multichannel import *
+from .samples import *
+from .bufferpool import *
 from . import _defines as FT
-
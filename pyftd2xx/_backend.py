@@ -0,0 +1,126 @@
+"""
+Python implemented stand-ins for the D2XX library. A Library subclass
+defines FT_* methods which receive exactly the ctypes arguments the wrappers
+pass to the foreign functions and return a FT_STATUS. Each method is exposed
+as a Function, which accepts restype, argtypes and errcheck like a ctypes
+function pointer, so _ftd2xx can bind a Library in place of the DLL.
+"""
+
+import ctypes as _c
+from . import _defines as _FT
+
+
+class Function(object):
+    """Stand-in for a ctypes foreign function calling a Python implementation"""
+    def __init__(self, name, implementation):
+        self.__name__ = name
+        self.__doc__ = implementation.__doc__
+        self.implementation = implementation
+        self.restype = None
+        self.argtypes = None
+        self.errcheck = None
+
+    def __call__(self, *args):
+        result = self.implementation(*args)
+        if self.errcheck is not None:
+            return self.errcheck(result, self, args)
+        return result
+
+
+class Library(object):
+    """Base class of Python implemented D2XX libraries. Functions which are not
+    implemented return FT_NOT_SUPPORTED, or FALSE for the FT_W32_ functions."""
+    def __init__(self):
+        for name in dir(type(self)):
+            if name.startswith('FT_'):
+                setattr(self, name, Function(name, getattr(self, name)))
+
+    def __getattr__(self, name):
+        if not name.startswith('FT_'):
+            raise AttributeError(name)
+        result = 0 if name.startswith('FT_W32_') else _FT.NOT_SUPPORTED
+        def unsupported(*args):
+            return result
+        function = Function(name, unsupported)
+        setattr(self, name, function)
+        return function
+
+
+class Unavailable(Library):
+    """Library used when the D2XX library could not be loaded. Every function raises
+    OSError telling why, instead of returning a status.
+
+    Args:
+        Reason (str): Why the library could not be loaded.
+    """
+    def __init__(self, Reason):
+        Library.__init__(self)
+        self.Reason = Reason
+
+    def __getattr__(self, name):
+        if not name.startswith('FT_'):
+            raise AttributeError(name)
+        def unavailable(*args):
+            raise OSError(self.Reason)
+        function = Function(name, unavailable)
+        setattr(self, name, function)
+        return function
+
+
+def Value(arg):
+    """Return the integer value of an argument passed by value."""
+    if arg is None:
+        return 0
+    if isinstance(arg, int):
+        return arg
+    return arg.value or 0
+
+def Target(arg):
+    """Return the ctypes object an argument passed by reference points to."""
+    target = getattr(arg, '_obj', None)
+    if target is not None:
+        return target
+    if isinstance(arg, _c._Pointer):
+        return arg.contents
+    return arg
+
+def Address(arg):
+    """Return the memory address an argument passed by reference points to."""
+    return _c.cast(arg, _c.c_void_p).value
+
+def Store(arg, value):
+    """Store a value through an argument passed by reference."""
+    Target(arg).value = value
+
+def ReadBuffer(arg, count):
+    """Return count bytes from the buffer an argument points to."""
+    return _c.string_at(Address(arg), count)
+
+def WriteBuffer(arg, data):
+    """Copy data into the buffer an argument points to."""
+    _c.memmove(Address(arg), data, len(data))
+
+def Load(Backend):
+    """Create a Python implemented library from its name.
+
+    Args:
+        Backend (str): 'sim' or 'sim:<count>' for simulated loopback devices, 'sim:<count>:stream'
+            for simulated devices streaming data, 'replay:<path>' to replay a recording made
+            with pyftd2xx.Recorder.
+
+    Raises:
+        ValueError: Unknown backend name.
+
+    Returns:
+        Library: The library.
+    """
+    if Backend == 'sim' or Backend.startswith('sim:'):
+        from ._sim import SimulatedLibrary
+        options = Backend.split(':')[1:]
+        streaming = 'stream' in options
+        counts = list(option for option in options if option != 'stream')
+        return SimulatedLibrary(int(counts[0] or 1) if counts else 1, Streaming=streaming)
+    if Backend.startswith('replay:'):
+        from ._replay import ReplayLibrary
+        return ReplayLibrary(Backend[len('replay:'):])
+    raise ValueError('Unknown backend %r' % Backend)
@@ -0,0 +1,132 @@
+"""
+cffi ABI mode binding of the hot path. The C declarations are generated
+from the ctypes prototypes in _ftd2xx, so both bindings call the same
+FT_* functions of the same library. Read, Write and GetQueueStatus are
+reimplemented on top of it: cffi converts the arguments in C, the output
+cell is allocated once per thread, buffers are passed with
+ffi.from_buffer instead of being wrapped in ctypes objects, and handles
+are passed as integers, declared uintptr_t, without any conversion.
+
+Calls through this binding bypass the hooks of _hooks, i.e. they are not
+instrumented, retried or recorded.
+"""
+
+import ctypes as _c
+import threading as _threading
+from . import _ftd2xx as _lib
+from ._errors import STATUS_ERRORS as _STATUS_ERRORS, StatusError as _StatusError
+from .bufferpool import DefaultPool as _pool
+
+
+_INTEGERS = {1: 'int8_t', 2: 'int16_t', 4: 'int32_t', 8: 'int64_t'}
+
+
+def _declaration(Type):
+    """C spelling of a ctypes type; pointers and structures of any kind become void *."""
+    if Type is None:
+        return 'void'
+    if Type is _c.c_char_p:
+        return 'char *'
+    if Type is _c.c_void_p or issubclass(Type, (_c._Pointer, _c._CFuncPtr)):
+        return 'void *'
+    if issubclass(Type, _c._SimpleCData) and Type._type_ in 'bBhHiIlLqQ?c':
+        name = _INTEGERS[_c.sizeof(Type)]
+        return name if Type(-1).value < 0 else 'u' + name
+    return 'void *'
+
+def CDef(Prototypes=None):
+    """Return cffi declarations of the FT_* functions.
+
+    Args:
+        Prototypes (dict, optional): Maps names to (restype, argtypes, errcheck, doc). Defaults to those of _ftd2xx.
+
+    Returns:
+        str: The declarations.
+    """
+    if Prototypes is None:
+        Prototypes = _lib._PROTOTYPES
+    lines = []
+    for name, (restype, argtypes, _, _) in sorted(Prototypes.items()):
+        args = list(_declaration(argtype) for argtype in argtypes or ())
+        if args and name not in _lib.NO_HANDLE and argtypes[0] is _lib.FT_HANDLE:
+            # Passed as integer, saves a cast per call
+            args[0] = 'uintptr_t'
+        args = ', '.join(args) or 'void'
+        lines.append('%s %s(%s);' % (_declaration(restype), name, args))
+    return '\n'.join(lines)
+
+def _library_path(Library):
+    path = getattr(Library, '_name', None)
+    if not isinstance(Library, _c.CDLL) or path is None:
+        raise ValueError('The cffi binding needs the native D2XX library, not %r' % (Library,))
+    return path
+
+
+class Binding(object):
+    """Hot path functions of pyftd2xx calling the D2XX library through cffi.
+
+    Args:
+        Library (ctypes.CDLL, str, optional): The loaded D2XX library, or its path. Defaults to the current library.
+
+    Raises:
+        ImportError: cffi is not installed.
+        ValueError: The library is a Python backend.
+        OSError: The library could not be loaded.
+    """
+    def __init__(self, Library=None):
+        import cffi
+        if Library is None:
+            Library = _lib._library
+        self.Path = Library if isinstance(Library, str) else _library_path(Library)
+        self.ffi = cffi.FFI()
+        self.ffi.cdef(CDef())
+        self.lib = self.ffi.dlopen(self.Path)
+        self._FT_GetQueueStatus = self.lib.FT_GetQueueStatus
+        self._FT_Read = self.lib.FT_Read
+        self._FT_Write = self.lib.FT_Write
+        self._from_buffer = self.ffi.from_buffer
+        self._local = _threading.local()
+
+    def _cells(self):
+        """DWORD output cell of the calling thread."""
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells = self._local.cells = self.ffi.new('uint32_t[1]')
+            return cells
+
+    @staticmethod
+    def _raise(Status, Name, Handle):
+        raise _STATUS_ERRORS.get(Status, _StatusError)(Status, Name, getattr(Handle, 'value', Handle))
+
+    def GetQueueStatus(self, Handle):
+        cells = self._cells()
+        status = self._FT_GetQueueStatus(getattr(Handle, 'value', Handle) or 0, cells)
+        if status:
+            self._raise(status, 'FT_GetQueueStatus', Handle)
+        return cells[0]
+
+    def Read(self, Handle, BytesToRead):
+        cells = self._cells()
+        buffer = _pool.Lease(BytesToRead)
+        try:
+            status = self._FT_Read(getattr(Handle, 'value', Handle) or 0, self._from_buffer(buffer), BytesToRead, cells)
+            if status:
+                self._raise(status, 'FT_Read', Handle)
+            return memoryview(buffer)[:cells[0]].tobytes()
+        finally:
+            _pool.Release(buffer)
+
+    def Write(self, Handle, Buffer):
+        if isinstance(Buffer, str):
+            Buffer = Buffer.encode('utf-8')
+        cells = self._cells()
+        try:
+            data = self._from_buffer(Buffer)
+        except (TypeError, BufferError):
+            # Objects without a contiguous buffer, accepted by the ctypes binding as well
+            data = self._from_buffer(bytes(Buffer))
+        status = self._FT_Write(getattr(Handle, 'value', Handle) or 0, data, len(data), cells)
+        if status:
+            self._raise(status, 'FT_Write', Handle)
+        return cells[0]
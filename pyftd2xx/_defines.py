@@ -1,3 +1,5 @@
+from enum import IntEnum as _IntEnum, IntFlag as _IntFlag
+
 # Device status
 STATUS = {
     0: 'FT_OK',
@@ -219,10 +221,144 @@ DEVICE_INFO_FLAGS = {
 FLAGS_OPENED = 1
 FLAGS_HISPEED = 2
 
+class DeviceFlags(_IntFlag):
+    """Flags of a device info list entry, as returned by DeviceInfo.FlagsValue"""
+    FLAGS_OPENED = 1
+    FLAGS_HISPEED = 2
+
 MAX_DESCRIPTION_SIZE = 256
 
+_JOINED = {}
+
 def JOIN_FLAGS(flags):
-    ret_flags = 0
-    for flag in flags:
-        ret_flags |= flag
+    """Return the combination of a list of flags. An int is returned unchanged,
+    lists are joined once and then looked up."""
+    if isinstance(flags, int):
+        return flags
+    key = tuple(flags)
+    ret_flags = _JOINED.get(key)
+    if ret_flags is None:
+        ret_flags = 0
+        for flag in key:
+            ret_flags |= flag
+        if len(_JOINED) < 256:
+            _JOINED[key] = ret_flags
     return ret_flags
+
+
+# Enum types
+# The module level constants above are replaced by the members of these types,
+# so they are still plain ints for the library but repr() shows their name.
+
+class _NamedIntEnum(_IntEnum):
+    """IntEnum whose str() is its name, e.g. for printing a device type."""
+    def __str__(self):
+        return self.name
+
+Status = _IntEnum('Status', list((name[3:], code) for code, name in STATUS.items()), module=__name__)
+Status.__doc__ = """FT_STATUS codes"""
+
+DeviceType = _NamedIntEnum('DeviceType', list((name, code) for code, name in DEVICES.items()), module=__name__)
+DeviceType.__doc__ = """Device types, str() gives their name, e.g. str(DeviceType.FT_DEVICE_232H) == 'FT_DEVICE_232H'"""
+
+class OpenFlags(_IntFlag):
+    """Flags of OpenEx"""
+    OPEN_BY_SERIAL_NUMBER = 1
+    OPEN_BY_DESCRIPTION = 2
+    OPEN_BY_LOCATION = 4
+
+class ListFlags(_IntFlag):
+    """Flags of ListDevices, one LIST_ flag combined with one OPEN_BY_ flag"""
+    LIST_NUMBER_ONLY = 0x80000000
+    LIST_BY_INDEX = 0x40000000
+    LIST_ALL = 0x20000000
+    OPEN_BY_SERIAL_NUMBER = 1
+    OPEN_BY_DESCRIPTION = 2
+    OPEN_BY_LOCATION = 4
+
+class WordLength(_IntEnum):
+    BITS_8 = 8
+    BITS_7 = 7
+
+class StopBits(_IntEnum):
+    STOP_BITS_1 = 0
+    STOP_BITS_2 = 2
+
+class Parity(_IntEnum):
+    PARITY_NONE = 0
+    PARITY_ODD = 1
+    PARITY_EVEN = 2
+    PARITY_MARK = 3
+    PARITY_SPACE = 4
+
+class FlowControl(_IntEnum):
+    FLOW_NONE = 0x0000
+    FLOW_RTS_CTS = 0x0100
+    FLOW_DTR_DSR = 0x0200
+    FLOW_XON_XOFF = 0x0400
+
+class Purge(_IntFlag):
+    PURGE_RX = 1
+    PURGE_TX = 2
+
+class Event(_IntFlag):
+    EVENT_RXCHAR = 1
+    EVENT_MODEM_STATUS = 2
+    EVENT_LINE_STATUS = 4
+
+class BitMode(_IntEnum):
+    BITMODE_RESET = 0x00
+    BITMODE_ASYNC_BITBANG = 0x01
+    BITMODE_MPSSE = 0x02
+    BITMODE_SYNC_BITBANG = 0x04
+    BITMODE_MCU_HOST = 0x08
+    BITMODE_FAST_SERIAL = 0x10
+    BITMODE_CBUS_BITBANG = 0x20
+    BITMODE_SYNC_FIFO = 0x40
+
+class ModemStatus(_IntFlag):
+    """Modem signals in the low byte of the FT_GetModemStatus value"""
+    CTS = 0x10
+    DSR = 0x20
+    RI = 0x40
+    DCD = 0x80
+
+class LineStatus(_IntFlag):
+    """Line status errors in the second byte of the FT_GetModemStatus value"""
+    OVERRUN_ERROR = 0x02
+    PARITY_ERROR = 0x04
+    FRAMING_ERROR = 0x08
+    BREAK_INTERRUPT = 0x10
+
+for _type in (Status, DeviceType, ListFlags, OpenFlags, WordLength, StopBits, Parity, FlowControl, Purge, Event, BitMode, DeviceFlags):
+    globals().update(_type.__members__)
+
+# Precomputed combinations
+LIST_ALL_BY_SERIAL_NUMBER = LIST_ALL | OPEN_BY_SERIAL_NUMBER
+LIST_ALL_BY_DESCRIPTION = LIST_ALL | OPEN_BY_DESCRIPTION
+LIST_ALL_BY_LOCATION = LIST_ALL | OPEN_BY_LOCATION
+LIST_BY_INDEX_BY_SERIAL_NUMBER = LIST_BY_INDEX | OPEN_BY_SERIAL_NUMBER
+LIST_BY_INDEX_BY_DESCRIPTION = LIST_BY_INDEX | OPEN_BY_DESCRIPTION
+LIST_BY_INDEX_BY_LOCATION = LIST_BY_INDEX | OPEN_BY_LOCATION
+PURGE_RX_TX = PURGE_RX | PURGE_TX
+EVENT_ALL = EVENT_RXCHAR | EVENT_MODEM_STATUS | EVENT_LINE_STATUS
+
+# Lookup tables from value to member, for flags including every combination of members
+_TABLES = {}
+for _type in (Status, DeviceType, ListFlags, OpenFlags, WordLength, StopBits, Parity, FlowControl, Purge, Event, BitMode, DeviceFlags, ModemStatus, LineStatus):
+    _values = set(_type._value2member_map_)
+    if issubclass(_type, _IntFlag):
+        _combined = {0}
+        for _member in _type:
+            _combined |= set(_value | _member for _value in _combined)
+        _values |= _combined
+    _TABLES[_type] = dict((_value, _type(_value)) for _value in _values)
+del _type, _values, _combined, _member
+
+def DECODE(Type, Value):
+    """Return the member of an enum type for a value returned by the library.
+    Unknown values of an IntEnum are returned as int."""
+    member = _TABLES[Type].get(Value)
+    if member is None:
+        return Type(Value) if issubclass(Type, _IntFlag) else Value
+    return member
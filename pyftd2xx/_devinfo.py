@@ -0,0 +1,139 @@
+"""
+Compact device information records. A DeviceInfo holds the raw fields of a
+FT_DEVICE_LIST_INFO_NODE in slots; strings, flags and the device type are
+only decoded when they are accessed. A whole node array is decoded with a
+single struct.iter_unpack over its memory, without touching the fields from
+Python one by one.
+
+A DeviceInfo is a read-only mapping with the keys of the dicts returned by
+earlier versions: iteration, len, in, indexing, keys, items and dict(info)
+work like on those dicts, and it compares equal to the same dict.
+"""
+
+import ctypes as _c
+import struct as _struct
+from collections.abc import Mapping as _Mapping
+from itertools import starmap as _starmap
+from operator import add as _add
+from . import _ftd2xx as _lib
+from . import _defines as _FT
+
+
+# Layout of FT_DEVICE_LIST_INFO_NODE: Flags, Type, ID, LocId, SerialNumber, Description, ftHandle
+_NODE = _struct.Struct('=4I16s64s' + ('Q' if _c.sizeof(_c.c_void_p) == 8 else 'I'))
+if _NODE.size != _c.sizeof(_lib.FT_DEVICE_LIST_INFO_NODE):
+    _NODE = None
+
+_KEYS = ('Index', 'Flags', 'Type', 'ID', 'LocId', 'SerialNumber', 'Description', 'Handle')
+
+# Names of every combination of the defined flags, the remaining bits are reserved
+_FLAGS_MASK = 0
+for _flag in _FT.DEVICE_INFO_FLAGS:
+    _FLAGS_MASK |= _flag
+_FLAG_NAMES = dict((value, tuple(name for flag, name in _FT.DEVICE_INFO_FLAGS.items() if value & flag))
+        for value in range(_FLAGS_MASK + 1))
+del _flag
+
+
+def _string(raw):
+    return raw.partition(b'\0')[0].decode('utf-8')
+
+
+class DeviceInfo(_Mapping):
+    """Information about one device. The fields are decoded on access and the
+    record can also be used like the dict returned by earlier versions.
+
+    Attributes:
+        Index (int): Index of the device in the device info list.
+        Flags (list(str)): The names of the device flags, e.g. 'FLAGS_OPENED'.
+        FlagsValue (FT.DeviceFlags): The device flags, reserved bits are kept.
+        Type (str): The device type.
+        TypeValue (FT.DeviceType): The device type, an int for types unknown to this module.
+        ID (int): The device ID.
+        LocId (int): The device location ID, also available as Location.
+        SerialNumber (str): The device serial number.
+        Description (str): The device description.
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device, if it is opened by this process.
+    """
+    __slots__ = ('_flags', '_type', 'ID', 'LocId', '_serial_number', '_description', '_handle', 'Index')
+
+    def __init__(self, Flags, Type, ID, LocId, SerialNumber, Description, Handle, Index):
+        self._flags = Flags
+        self._type = Type
+        self.ID = ID
+        self.LocId = LocId
+        self._serial_number = SerialNumber
+        self._description = Description
+        self._handle = Handle
+        self.Index = Index
+
+    @property
+    def Flags(self):
+        return list(_FLAG_NAMES[self._flags & _FLAGS_MASK])
+
+    @property
+    def FlagsValue(self):
+        return _FT.DECODE(_FT.DeviceFlags, self._flags)
+
+    @property
+    def Type(self):
+        return _FT.DEVICES.get(self._type, 'FT_DEVICE_UNKNOWN')
+
+    @property
+    def TypeValue(self):
+        return _FT.DECODE(_FT.DeviceType, self._type)
+
+    @property
+    def Location(self):
+        return self.LocId
+
+    @property
+    def SerialNumber(self):
+        return _string(self._serial_number)
+
+    @property
+    def Description(self):
+        return _string(self._description)
+
+    @property
+    def Handle(self):
+        return _lib.FT_HANDLE(self._handle or None)
+
+    def __getitem__(self, key):
+        if key in _KEYS or key == 'Location':
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(_KEYS)
+
+    def __len__(self):
+        return len(_KEYS)
+
+    def __contains__(self, key):
+        return key in _KEYS or key == 'Location'
+
+    def toDict(self):
+        """Return the decoded fields as a dict."""
+        return dict(self.items())
+
+    def __repr__(self):
+        return 'DeviceInfo(%s)' % ', '.join('%s=%r' % item for item in self.items())
+
+
+def DecodeNodes(Nodes, Count=None):
+    """Decode an array of FT_DEVICE_LIST_INFO_NODE into DeviceInfo records.
+
+    Args:
+        Nodes (ctypes.Array): The filled node array.
+        Count (int, optional): Number of valid nodes. Defaults to the length of the array.
+
+    Returns:
+        list(DeviceInfo): One record per node.
+    """
+    count = len(Nodes) if Count is None else min(Count, len(Nodes))
+    if _NODE is not None:
+        raw = memoryview(Nodes).cast('B')[:count * _NODE.size]
+        return list(_starmap(DeviceInfo, map(_add, _NODE.iter_unpack(raw), ((i,) for i in range(count)))))
+    return list(DeviceInfo(node.Flags, node.Type, node.ID, node.LocId, node.SerialNumber,
+            node.Description, node.ftHandle, i) for i, node in enumerate(Nodes[:count]))
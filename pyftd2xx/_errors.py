@@ -0,0 +1,134 @@
+"""
+Exceptions for FT_STATUS codes. Every status code other than FT_OK has its
+own subclass of StatusError. Codes that usually clear up by retrying or
+reopening the device additionally derive from TransientStatusError.
+
+The _errcheck functions are installed as ctypes errcheck on the bound FT_*
+functions, so a failing call raises directly and a successful call needs no
+further checking in the wrappers.
+"""
+
+from . import _defines as _FT
+
+
+class StatusError(Exception):
+    """Exception class for status messages
+
+    Attributes:
+        Status (FT.Status): The FT_STATUS code.
+        Function (str): Name of the FT_* function that failed. None if unknown.
+        Handle (int): Value of the handle the function was called with. None if unknown or not applicable.
+        message (str): The name of the status code.
+    """
+    def __init__(self, Status, Function=None, Handle=None):
+        Exception.__init__(self, Status, Function, Handle)
+        self.Status = _FT.DECODE(_FT.Status, Status)
+        self.Function = Function
+        self.Handle = Handle
+        self.message = _FT.STATUS.get(Status, 'FT_STATUS_%d' % Status)
+
+    def __str__(self):
+        if self.Function is None:
+            return self.message
+        return '%s (%s)' % (self.message, self.Function)
+
+class TransientStatusError(StatusError):
+    """Base class for status codes which may succeed when retried"""
+
+class InvalidHandleError(StatusError):
+    """FT_INVALID_HANDLE"""
+
+class DeviceNotFoundError(TransientStatusError):
+    """FT_DEVICE_NOT_FOUND"""
+
+class DeviceNotOpenedError(StatusError):
+    """FT_DEVICE_NOT_OPENED"""
+
+class IoError(TransientStatusError):
+    """FT_IO_ERROR"""
+
+class InsufficientResourcesError(TransientStatusError):
+    """FT_INSUFFICIENT_RESOURCES"""
+
+class InvalidParameterError(StatusError):
+    """FT_INVALID_PARAMETER"""
+
+class InvalidBaudRateError(StatusError):
+    """FT_INVALID_BAUD_RATE"""
+
+class DeviceNotOpenedForEraseError(StatusError):
+    """FT_DEVICE_NOT_OPENED_FOR_ERASE"""
+
+class DeviceNotOpenedForWriteError(StatusError):
+    """FT_DEVICE_NOT_OPENED_FOR_WRITE"""
+
+class FailedToWriteDeviceError(StatusError):
+    """FT_FAILED_TO_WRITE_DEVICE"""
+
+class EepromReadFailedError(StatusError):
+    """FT_EEPROM_READ_FAILED"""
+
+class EepromWriteFailedError(StatusError):
+    """FT_EEPROM_WRITE_FAILED"""
+
+class EepromEraseFailedError(StatusError):
+    """FT_EEPROM_ERASE_FAILED"""
+
+class EepromNotPresentError(StatusError):
+    """FT_EEPROM_NOT_PRESENT"""
+
+class EepromNotProgrammedError(StatusError):
+    """FT_EEPROM_NOT_PROGRAMMED"""
+
+class InvalidArgsError(StatusError):
+    """FT_INVALID_ARGS"""
+
+class NotSupportedError(StatusError):
+    """FT_NOT_SUPPORTED"""
+
+class OtherError(StatusError):
+    """FT_OTHER_ERROR"""
+
+class DeviceListNotReadyError(TransientStatusError):
+    """FT_DEVICE_LIST_NOT_READY"""
+
+
+# Exception class per status code
+STATUS_ERRORS = {
+    _FT.INVALID_HANDLE: InvalidHandleError,
+    _FT.DEVICE_NOT_FOUND: DeviceNotFoundError,
+    _FT.DEVICE_NOT_OPENED: DeviceNotOpenedError,
+    _FT.IO_ERROR: IoError,
+    _FT.INSUFFICIENT_RESOURCES: InsufficientResourcesError,
+    _FT.INVALID_PARAMETER: InvalidParameterError,
+    _FT.INVALID_BAUD_RATE: InvalidBaudRateError,
+    _FT.DEVICE_NOT_OPENED_FOR_ERASE: DeviceNotOpenedForEraseError,
+    _FT.DEVICE_NOT_OPENED_FOR_WRITE: DeviceNotOpenedForWriteError,
+    _FT.FAILED_TO_WRITE_DEVICE: FailedToWriteDeviceError,
+    _FT.EEPROM_READ_FAILED: EepromReadFailedError,
+    _FT.EEPROM_WRITE_FAILED: EepromWriteFailedError,
+    _FT.EEPROM_ERASE_FAILED: EepromEraseFailedError,
+    _FT.EEPROM_NOT_PRESENT: EepromNotPresentError,
+    _FT.EEPROM_NOT_PROGRAMMED: EepromNotProgrammedError,
+    _FT.INVALID_ARGS: InvalidArgsError,
+    _FT.NOT_SUPPORTED: NotSupportedError,
+    _FT.OTHER_ERROR: OtherError,
+    _FT.DEVICE_LIST_NOT_READY: DeviceListNotReadyError,
+}
+
+# Status codes which may succeed when retried
+TRANSIENT_STATUS = frozenset(status for status, error in STATUS_ERRORS.items()
+        if issubclass(error, TransientStatusError))
+
+
+def _errcheck(status, function, args):
+    """ctypes errcheck for functions taking a FT_HANDLE as first argument"""
+    if status:
+        raise STATUS_ERRORS.get(status, StatusError)(status, function.__name__, getattr(args[0], 'value', args[0]))
+    return status
+
+def _errcheck_no_handle(status, function, args):
+    """ctypes errcheck for functions without a FT_HANDLE"""
+    if status:
+        raise STATUS_ERRORS.get(status, StatusError)(status, function.__name__)
+    return status
@@ -0,0 +1,128 @@
+"""
+Waiting for D2XX event notifications. Only on Windows does a wait really
+block: FT_SetEventNotification signals a Win32 event which is waited on with
+the GIL released. D2XX on Linux and macOS signals a pthread condition
+instead, which is not supported here, so on those platforms the event status
+reported by FT_GetStatus is polled every PollInterval, DEFAULT_POLL_INTERVAL
+unless given. An event is then noticed up to one interval late, and each
+poll is a driver call.
+"""
+
+import sys as _sys
+import time as _time
+import ctypes as _c
+from . import pyftd2xx as _ft
+
+
+if _sys.platform == 'win32':
+    _kernel32 = _c.WinDLL('kernel32')
+    _kernel32.CreateEventW.restype = _c.c_void_p
+    _kernel32.CreateEventW.argtypes = [_c.c_void_p, _c.c_int, _c.c_int, _c.c_wchar_p]
+    _kernel32.WaitForSingleObject.restype = _c.c_uint32
+    _kernel32.WaitForSingleObject.argtypes = [_c.c_void_p, _c.c_uint32]
+    _kernel32.SetEvent.argtypes = [_c.c_void_p]
+    _kernel32.CloseHandle.argtypes = [_c.c_void_p]
+else:
+    _kernel32 = None
+
+_WAIT_OBJECT_0 = 0
+_INFINITE = 0xFFFFFFFF
+
+# Seconds between FT_GetStatus calls where notification is not available
+DEFAULT_POLL_INTERVAL = 0.001
+
+
+class EventWaiter(object):
+    """Wait for events of a device.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Mask (int): Combination of FT.EVENT_ flags to wait for.
+        PollInterval (float, optional): Polling interval in seconds where notification is not available,
+            i.e. on every platform but Windows. Defaults to DEFAULT_POLL_INTERVAL.
+    """
+    def __init__(self, Handle, Mask, PollInterval=DEFAULT_POLL_INTERVAL):
+        self.Handle = Handle
+        self.Mask = Mask
+        self.PollInterval = PollInterval
+        self._event = None
+        self._woken = False
+        if _kernel32 is not None:
+            self._event = _kernel32.CreateEventW(None, 0, 0, None)
+            _ft.SetEventNotification(Handle, Mask, self._event)
+
+    @property
+    def Notified(self):
+        """True if the driver signals events, False if they are polled."""
+        return self._event is not None
+
+    def Wait(self, Timeout=None):
+        """Wait until one of the events occurs.
+
+        Args:
+            Timeout (float, optional): Maximum time to wait in seconds, None to wait forever. Defaults to None.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            bool: False if the timeout expired.
+        """
+        if self._event is not None:
+            milliseconds = _INFINITE if Timeout is None else max(0, int(Timeout * 1000 + 0.999))
+            return _kernel32.WaitForSingleObject(self._event, milliseconds) == _WAIT_OBJECT_0
+        deadline = None if Timeout is None else _time.monotonic() + Timeout
+        while not (_ft.GetStatus(self.Handle).EventStatus & self.Mask):
+            if self._woken:
+                self._woken = False
+                return True
+            if deadline is not None and _time.monotonic() >= deadline:
+                return False
+            _time.sleep(self.PollInterval)
+        return True
+
+    def WaitEvents(self, Timeout=None):
+        """Wait until one of the events occurs and return which ones occurred.
+
+        Args:
+            Timeout (float, optional): Maximum time to wait in seconds, None to wait forever. Defaults to None.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            int: The occurred events of the mask, 0 if the timeout expired or Wake was called.
+        """
+        if self._event is not None:
+            if not self.Wait(Timeout):
+                return 0
+            return _ft.GetStatus(self.Handle).EventStatus & self.Mask
+        deadline = None if Timeout is None else _time.monotonic() + Timeout
+        while True:
+            events = _ft.GetStatus(self.Handle).EventStatus & self.Mask
+            if events:
+                return events
+            if self._woken:
+                self._woken = False
+                return 0
+            if deadline is not None and _time.monotonic() >= deadline:
+                return 0
+            _time.sleep(self.PollInterval)
+
+    def Wake(self):
+        """Make a pending or the next Wait return, e.g. to stop a waiting thread."""
+        if self._event is not None:
+            _kernel32.SetEvent(self._event)
+        else:
+            self._woken = True
+        return None
+
+    def Close(self):
+        """Stop the event notification."""
+        if self._event is not None:
+            try:
+                _ft.SetEventNotification(self.Handle, 0, None)
+            finally:
+                _kernel32.CloseHandle(self._event)
+                self._event = None
+        return None
@@ -1,23 +1,39 @@
+import os as _os
 import sys as _sys
 import ctypes as _ctypes
+from . import _backend
 
 
 # Select library
-if _sys.platform == 'win32':
-    try:
-        _library = _ctypes.CDLL('ftd2xx64.dll')
-    except FileNotFoundError:
-        print('Unable to find D2XX64 DLL. Fallback to D2XX32.')
+def _load_native():
+    if _sys.platform == 'win32':
         try:
-            _library = _ctypes.CDLL('ftd2xx.dll')
+            return _ctypes.CDLL('ftd2xx64.dll')
         except FileNotFoundError:
-            raise FileNotFoundError('Unable to find D2XX DLL. Please make sure ftd2xx.dll or ftd2xx64.dll is in the path.')
-elif _sys.platform.startswith('linux'):
-    """Not implemented"""
-    raise NotImplementedError()
-elif _sys.platform == 'darwin':
-    """Not implemented"""
-    raise NotImplementedError()
+            print('Unable to find D2XX64 DLL. Fallback to D2XX32.')
+            try:
+                return _ctypes.CDLL('ftd2xx.dll')
+            except FileNotFoundError:
+                raise FileNotFoundError('Unable to find D2XX DLL. Please make sure ftd2xx.dll or ftd2xx64.dll is in the path.')
+    name = 'libftd2xx.dylib' if _sys.platform == 'darwin' else 'libftd2xx.so'
+    try:
+        return _ctypes.CDLL(name)
+    except OSError:
+        raise OSError('Unable to load the D2XX library %s on %s. Please install it from FTDI, or choose a '
+                'Python backend with PYFTD2XX_BACKEND=sim, sim:<count> or replay:<path>.' % (name, _sys.platform))
+
+def _load(Backend):
+    if Backend in (None, ''):
+        # Importing works without the library, so a Python backend can still be chosen with UseBackend
+        try:
+            return _load_native()
+        except OSError as error:
+            return _backend.Unavailable(str(error))
+    if Backend == 'native':
+        return _load_native()
+    return _backend.Load(Backend)
+
+_library = _load(_os.environ.get('PYFTD2XX_BACKEND'))
 
 
 # Typedefs
@@ -1144,3 +1160,49 @@ FT_VendorCmdSetEx.argtypes = [FT_HANDLE, USHORT, _ctypes.POINTER(_ctypes.c_ubyte
 FT_VendorCmdSetEx.__doc__ = \
     """FT_STATUS FT_VendorCmdSetEx(FT_HANDLE ftHandle, USHORT wValue, LP_ctypes_ubyte Buf, USHORT Len)
     .\ftd2xx.h:1465"""
+
+
+# Functions that do not take a FT_HANDLE as first argument
+NO_HANDLE = frozenset([
+    'FT_Open',
+    'FT_OpenEx',
+    'FT_ListDevices',
+    'FT_CreateDeviceInfoList',
+    'FT_GetDeviceInfoList',
+    'FT_GetDeviceInfoDetail',
+    'FT_GetLibraryVersion',
+    'FT_Rescan',
+    'FT_Reload',
+    'FT_W32_CreateFile',
+])
+
+
+# Status checking
+# Every function returning a FT_STATUS raises the matching StatusError itself.
+# The FT_W32_ functions return Win32 style results and are left unchecked.
+from ._errors import _errcheck, _errcheck_no_handle
+
+for _name, _function in list(globals().items()):
+    if _name.startswith('FT_') and not _name.startswith('FT_W32_') \
+            and not isinstance(_function, type) and getattr(_function, 'restype', None) is FT_STATUS:
+        _function.errcheck = _errcheck_no_handle if _name in NO_HANDLE else _errcheck
+
+# Prototypes of all functions, used to bind them to another library
+_PROTOTYPES = dict((_name, (_function.restype, _function.argtypes, getattr(_function, 'errcheck', None), _function.__doc__))
+        for _name, _function in globals().items()
+        if _name.startswith('FT_') and not isinstance(_function, type) and hasattr(_function, 'argtypes'))
+del _name, _function
+
+
+def _bind(library):
+    """Bind all FT_* functions to another library, e.g. one created by _load."""
+    global _library
+    for name, (restype, argtypes, errcheck, doc) in _PROTOTYPES.items():
+        function = getattr(library, name)
+        function.restype = restype
+        function.argtypes = argtypes
+        if errcheck is not None:
+            function.errcheck = errcheck
+        function.__doc__ = doc
+        globals()[name] = function
+    _library = library
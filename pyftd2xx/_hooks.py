@@ -0,0 +1,62 @@
+"""
+Interposition layer for the bound FT_* functions. A hook is a factory that
+wraps a foreign function; the wrapped functions are stored back into the
+_ftd2xx module, so the wrappers in pyftd2xx pick them up on their next call.
+With no hook installed the original foreign functions are restored and the
+wrappers run without any additional cost.
+"""
+
+from . import _ftd2xx as _lib
+
+
+_originals = {}
+_factories = {}
+
+
+def _functions():
+    """Return the names of all bound FT_* functions."""
+    return list(name for name, value in vars(_lib).items()
+            if name.startswith('FT_') and not isinstance(value, type) and hasattr(value, 'argtypes'))
+
+def Install(Key, Factory):
+    """Install a hook around every bound FT_* function.
+
+    Args:
+        Key (str): Name of the hook, used to remove it again.
+        Factory (callable): Called as Factory(Name, Function) and returns the wrapped function.
+
+    Returns:
+        None
+    """
+    if not _originals:
+        for name in _functions():
+            _originals[name] = getattr(_lib, name)
+    _factories[Key] = Factory
+    _rebuild()
+    return None
+
+def Remove(Key):
+    """Remove a previously installed hook. Unknown keys are ignored."""
+    if _factories.pop(Key, None) is not None:
+        _rebuild()
+    return None
+
+def Installed(Key):
+    """Return True if a hook with the given key is installed."""
+    return Key in _factories
+
+def _rebuild():
+    for name, function in _originals.items():
+        for factory in _factories.values():
+            function = factory(name, function)
+        setattr(_lib, name, function)
+
+def Rebind():
+    """Capture the bound FT_* functions again after _ftd2xx was bound to
+    another library and reapply the installed hooks around them."""
+    _originals.clear()
+    if _factories:
+        for name in _functions():
+            _originals[name] = getattr(_lib, name)
+        _rebuild()
+    return None
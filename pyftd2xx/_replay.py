@@ -0,0 +1,225 @@
+"""
+Recording file format and the replay library. A recording starts with MAGIC
+and holds two kinds of records. A name record assigns an id to a FT_* name
+the first time it is used. A call record holds the function id, the status
+returned, the start time relative to the start of the recording, the
+duration and every argument of the call:
+
+    name record:  <BHB  tag 1, id, name length, name
+    call record:  <BHQddB  tag 2, id, status, start, duration, number of args, args
+    argument:     <B kind, followed by
+        ARG_NONE         nothing
+        ARG_INT          <Q value passed in
+        ARG_OUT_INT      <Q value stored through the pointer by the call
+        ARG_BYTES        <I length, bytes passed in (the FT_Write payload, the FT_OpenEx name)
+        ARG_OUT_STRINGS  <H count, per string <H length, string
+        ARG_OUT_BYTES    <I length, bytes stored into the buffer by the call
+
+ReplayLibrary serves a recording to the wrappers in place of the D2XX
+library. The calls of each function and handle are answered in recorded
+order, independent of how calls of different handles interleave.
+"""
+
+import ctypes as _c
+import struct as _struct
+import threading as _threading
+import time as _time
+from collections import deque as _deque
+from . import _defines as _FT
+from . import _backend
+from . import _ftd2xx as _lib
+
+
+MAGIC = b'PYFTREC\x01'
+
+TAG_NAME = 1
+TAG_CALL = 2
+
+ARG_NONE = 0
+ARG_INT = 1
+ARG_OUT_INT = 2
+ARG_BYTES = 3
+ARG_OUT_STRINGS = 4
+ARG_OUT_BYTES = 5
+
+NAME = _struct.Struct('<BHB')
+CALL = _struct.Struct('<BHQddB')
+KIND = _struct.Struct('<B')
+INT = _struct.Struct('<Q')
+LENGTH = _struct.Struct('<I')
+COUNT = _struct.Struct('<H')
+
+_MASK = (1 << 64) - 1
+
+
+def _addresses(array):
+    """Return the addresses held by an array of pointers."""
+    return (_c.c_void_p * len(array)).from_buffer(array)
+
+def EncodeArgs(name, args):
+    """Encode the arguments of a finished call."""
+    out = []
+    for index, arg in enumerate(args):
+        if arg is None:
+            out.append(KIND.pack(ARG_NONE))
+        elif isinstance(arg, int):
+            out.append(KIND.pack(ARG_INT) + INT.pack(arg & _MASK))
+        elif isinstance(arg, bytes):
+            out.append(KIND.pack(ARG_BYTES) + LENGTH.pack(len(arg)) + arg)
+        elif name == 'FT_Write' and index == 1:
+            # The payload, passed as c_char_p or as array
+            data = _backend.ReadBuffer(arg, _backend.Value(args[2]))
+            out.append(KIND.pack(ARG_BYTES) + LENGTH.pack(len(data)) + data)
+        elif isinstance(arg, _c.c_char_p):
+            # Only dereferenced where the signature tells what it points to
+            if name == 'FT_OpenEx' and index == 0 and not _backend.Value(args[1]) & _FT.OPEN_BY_LOCATION:
+                data = _c.string_at(_backend.Address(arg)) if _backend.Address(arg) else b''
+            else:
+                # A location passed as pointer, or a pointer of unknown meaning
+                out.append(KIND.pack(ARG_INT) + INT.pack((_backend.Address(arg) or 0) & _MASK))
+                continue
+            out.append(KIND.pack(ARG_BYTES) + LENGTH.pack(len(data)) + data)
+        elif isinstance(arg, _c._SimpleCData):
+            out.append(KIND.pack(ARG_INT) + INT.pack(_backend.Value(arg) & _MASK))
+        else:
+            target = _backend.Target(arg)
+            if isinstance(target, _c._SimpleCData):
+                out.append(KIND.pack(ARG_OUT_INT) + INT.pack(_backend.Value(target) & _MASK))
+            elif isinstance(target, _c.Array) and target._type_ is _c.c_char_p:
+                strings = list(_c.string_at(address) for address in _addresses(target) if address)
+                out.append(KIND.pack(ARG_OUT_STRINGS) + COUNT.pack(len(strings))
+                        + b''.join(COUNT.pack(len(string)) + string for string in strings))
+            else:
+                if name == 'FT_Read' and index == 1:
+                    size = _backend.Value(_backend.Target(args[3]))
+                else:
+                    size = _c.sizeof(target)
+                data = _backend.ReadBuffer(arg, size)
+                out.append(KIND.pack(ARG_OUT_BYTES) + LENGTH.pack(len(data)) + data)
+    return b''.join(out)
+
+def _decode_args(data, count):
+    args = []
+    pos = 0
+    for _ in range(count):
+        kind, = KIND.unpack_from(data, pos)
+        pos += KIND.size
+        if kind in (ARG_INT, ARG_OUT_INT):
+            value, = INT.unpack_from(data, pos)
+            pos += INT.size
+        elif kind in (ARG_BYTES, ARG_OUT_BYTES):
+            length, = LENGTH.unpack_from(data, pos)
+            pos += LENGTH.size
+            value = bytes(data[pos:pos + length])
+            pos += length
+        elif kind == ARG_OUT_STRINGS:
+            number, = COUNT.unpack_from(data, pos)
+            pos += COUNT.size
+            value = []
+            for _ in range(number):
+                length, = COUNT.unpack_from(data, pos)
+                pos += COUNT.size
+                value.append(bytes(data[pos:pos + length]))
+                pos += length
+        else:
+            value = None
+        args.append((kind, value))
+    return args, pos
+
+def ReadRecording(Path):
+    """Yield (name, status, start, duration, args) for every call in a recording.
+    Each element of args is a tuple of the argument kind and its value."""
+    with open(Path, 'rb') as file:
+        data = file.read()
+    if not data.startswith(MAGIC):
+        raise ValueError('%s is not a pyftd2xx recording' % Path)
+    names = {}
+    view = memoryview(data)
+    pos = len(MAGIC)
+    while pos < len(data):
+        tag = data[pos]
+        if tag == TAG_NAME:
+            _, id, length = NAME.unpack_from(data, pos)
+            pos += NAME.size
+            names[id] = data[pos:pos + length].decode('ascii')
+            pos += length
+        elif tag == TAG_CALL:
+            _, id, status, start, duration, count = CALL.unpack_from(data, pos)
+            pos += CALL.size
+            args, size = _decode_args(view[pos:], count)
+            pos += size
+            yield names[id], status, start, duration, args
+        else:
+            raise ValueError('Corrupt recording %s at offset %d' % (Path, pos))
+
+
+class ReplayLibrary(_backend.Library):
+    """Python implemented D2XX library answering the calls from a recording.
+
+    Args:
+        Path (str): The file written by Recorder.
+        Speed (float, optional): Replay calls taking their recorded duration divided by Speed,
+            None to answer immediately. Defaults to 1, the original timing.
+
+    Attributes:
+        Remaining (int): Number of recorded calls not replayed yet.
+    """
+    def __init__(self, Path, Speed=1.0):
+        _backend.Library.__init__(self)
+        self.Speed = Speed
+        self._lock = _threading.Lock()
+        self._queues = {}
+        self._handles = []
+        self.Remaining = 0
+        for name, status, start, duration, args in ReadRecording(Path):
+            handle = None
+            if name not in _lib.NO_HANDLE and args and args[0][0] == ARG_INT:
+                handle = args[0][1]
+                if handle not in self._handles:
+                    self._handles.append(handle)
+            self._queues.setdefault((name, handle), _deque()).append((status, duration, args))
+            self.Remaining += 1
+
+    def __getattr__(self, name):
+        if not name.startswith('FT_'):
+            raise AttributeError(name)
+        def replay(*args):
+            return self._replay(name, args)
+        function = _backend.Function(name, replay)
+        setattr(self, name, function)
+        return function
+
+    def _next(self, name, args):
+        handle = None if name in _lib.NO_HANDLE or not args else _backend.Value(args[0])
+        with self._lock:
+            queue = self._queues.get((name, handle))
+            if not queue:
+                return None
+            self.Remaining -= 1
+            return queue.popleft()
+
+    def _replay(self, name, args):
+        call = self._next(name, args)
+        if call is None:
+            if name in ('FT_Open', 'FT_OpenEx') and self._handles:
+                # The recording was made for a single handle, hand out the recorded handles in order
+                _backend.Store(args[-1], self._handles.pop(0))
+                return _FT.OK
+            return 0 if name.startswith('FT_W32_') else _FT.DEVICE_NOT_FOUND
+        status, duration, recorded = call
+        if self.Speed:
+            _time.sleep(duration / self.Speed)
+        for arg, (kind, value) in zip(args, recorded):
+            if kind == ARG_OUT_INT:
+                _backend.Store(arg, value)
+            elif kind == ARG_OUT_BYTES:
+                _backend.WriteBuffer(arg, value[:_c.sizeof(_backend.Target(arg))])
+            elif kind == ARG_OUT_STRINGS:
+                for address, string in zip(_addresses(_backend.Target(arg)), value):
+                    if address:
+                        _c.memmove(address, string + b'\0', len(string) + 1)
+        if name in ('FT_Open', 'FT_OpenEx'):
+            handle = _backend.Value(_backend.Target(args[-1]))
+            if handle in self._handles:
+                self._handles.remove(handle)
+        return status
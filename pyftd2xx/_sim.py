@@ -0,0 +1,350 @@
+"""
+Simulated D2XX library with virtual devices, used for benchmarks and for
+exercising the wrappers without hardware. Every device is a loopback: the
+bytes written to it are received back. A streaming device instead returns
+every requested byte at once and discards writes, which measures the cost
+of the Python side of a bulk transfer.
+"""
+
+import ctypes as _c
+import threading as _threading
+from . import _defines as _FT
+from . import _backend
+
+
+_HANDLE_BASE = 0x1000
+_FLAGS_OPENED = 1
+_FLAGS_HISPEED = 2
+
+
+class SimulatedDevice(object):
+    """State of one virtual device.
+
+    Attributes:
+        SerialNumber (bytes): The serial number.
+        Description (bytes): The description.
+        LocId (int): The location id.
+        Type (int): One of FT.FT_DEVICE_.
+        ID (int): Vendor id in the high and product id in the low word.
+        Streaming (bool): Return every requested byte on read and discard writes instead of looping back.
+        ModemStatus (int): Modem status in the low byte and line status in the second byte.
+        UserArea (bytearray): Content of the EEPROM user area.
+    """
+    def __init__(self, Index, Streaming=False):
+        self.Index = Index
+        self.SerialNumber = ('SIM%05d' % Index).encode('ascii')
+        self.Description = b'Simulated FT232H'
+        self.LocId = 0x1000 + Index
+        self.Type = _FT.FT_DEVICE_232H
+        self.ID = 0x04036014
+        self.Streaming = Streaming
+        self.ModemStatus = 0x30
+        self.UserArea = bytearray(256)
+        self.LatencyTimer = 16
+        self.BitMode = 0
+        self.EventMask = 0
+        self.EventStatus = 0
+        self.Opened = False
+        self.Rx = bytearray()
+        self.Lock = _threading.Lock()
+
+    def Feed(self, Data):
+        """Add bytes to the receive queue, as if they arrived from the device."""
+        with self.Lock:
+            self.Rx += Data
+            self.EventStatus |= _FT.EVENT_RXCHAR
+        return None
+
+
+class SimulatedLibrary(_backend.Library):
+    """Python implemented D2XX library serving virtual loopback devices.
+
+    Args:
+        Devices (int, optional): Number of virtual devices. Defaults to 1.
+        Streaming (bool, optional): Create streaming instead of loopback devices. Defaults to False.
+
+    Attributes:
+        Devices (list(SimulatedDevice)): The virtual devices, indexed like the device info list.
+    """
+    def __init__(self, Devices=1, Streaming=False):
+        _backend.Library.__init__(self)
+        self.Devices = list(SimulatedDevice(i, Streaming) for i in range(Devices))
+        self._stream = bytes(65536)
+
+    def _device(self, handle):
+        index = _backend.Value(handle) - _HANDLE_BASE
+        if 0 <= index < len(self.Devices) and self.Devices[index].Opened:
+            return self.Devices[index]
+        return None
+
+    def _open(self, device, handle):
+        if device is None:
+            return _FT.DEVICE_NOT_FOUND
+        if device.Opened:
+            return _FT.DEVICE_NOT_OPENED
+        device.Opened = True
+        _backend.Store(handle, _HANDLE_BASE + device.Index)
+        return _FT.OK
+
+    # Enumeration
+
+    def FT_CreateDeviceInfoList(self, lpdwNumDevs):
+        _backend.Store(lpdwNumDevs, len(self.Devices))
+        return _FT.OK
+
+    def FT_GetDeviceInfoList(self, pDest, lpdwNumDevs):
+        nodes = _backend.Target(pDest)
+        for node, device in zip(nodes, self.Devices):
+            node.Flags = _FLAGS_HISPEED | (_FLAGS_OPENED if device.Opened else 0)
+            node.Type = device.Type
+            node.ID = device.ID
+            node.LocId = device.LocId
+            node.SerialNumber = device.SerialNumber
+            node.Description = device.Description
+            node.ftHandle = _HANDLE_BASE + device.Index if device.Opened else None
+        _backend.Store(lpdwNumDevs, len(self.Devices))
+        return _FT.OK
+
+    def FT_GetDeviceInfoDetail(self, dwIndex, lpdwFlags, lpdwType, lpdwID, lpdwLocId, lpSerialNumber, lpDescription, pftHandle):
+        index = _backend.Value(dwIndex)
+        if index >= len(self.Devices):
+            return _FT.DEVICE_NOT_FOUND
+        device = self.Devices[index]
+        _backend.Store(lpdwFlags, _FLAGS_HISPEED | (_FLAGS_OPENED if device.Opened else 0))
+        _backend.Store(lpdwType, device.Type)
+        _backend.Store(lpdwID, device.ID)
+        _backend.Store(lpdwLocId, device.LocId)
+        _backend.WriteBuffer(lpSerialNumber, device.SerialNumber + b'\0')
+        _backend.WriteBuffer(lpDescription, device.Description + b'\0')
+        _backend.Store(pftHandle, _HANDLE_BASE + index if device.Opened else None)
+        return _FT.OK
+
+    def FT_ListDevices(self, pvArg1, pvArg2, dwFlags):
+        flags = _backend.Value(dwFlags)
+        if flags & _FT.LIST_NUMBER_ONLY:
+            _backend.Store(pvArg1, len(self.Devices))
+            return _FT.OK
+        def field(device):
+            if flags & _FT.OPEN_BY_LOCATION:
+                return device.LocId
+            if flags & _FT.OPEN_BY_DESCRIPTION:
+                return device.Description
+            return device.SerialNumber
+        if flags & _FT.LIST_BY_INDEX:
+            index = _backend.Value(pvArg1)
+            if index >= len(self.Devices):
+                return _FT.DEVICE_NOT_FOUND
+            value = field(self.Devices[index])
+            if isinstance(value, int):
+                _backend.WriteBuffer(pvArg2, value.to_bytes(4, 'little'))
+            else:
+                _backend.WriteBuffer(pvArg2, value + b'\0')
+            return _FT.OK
+        if flags & _FT.LIST_ALL:
+            array = _backend.Target(pvArg1)
+            if flags & _FT.OPEN_BY_LOCATION:
+                for i, device in enumerate(self.Devices[:len(array)]):
+                    array[i] = device.LocId
+            else:
+                addresses = (_c.c_void_p * len(array)).from_buffer(array)
+                for address, device in zip(addresses, self.Devices):
+                    if not address:
+                        break
+                    value = field(device)
+                    _c.memmove(address, value + b'\0', len(value) + 1)
+            _backend.Store(pvArg2, len(self.Devices))
+            return _FT.OK
+        return _FT.INVALID_PARAMETER
+
+    def FT_GetLibraryVersion(self, lpdwVersion):
+        _backend.Store(lpdwVersion, 0x00030215)
+        return _FT.OK
+
+    def FT_Rescan(self):
+        return _FT.OK
+
+    def FT_Reload(self, wVid, wPid):
+        return _FT.OK
+
+    # Opening and closing
+
+    def FT_Open(self, deviceNumber, pHandle):
+        index = _backend.Value(deviceNumber)
+        return self._open(self.Devices[index] if 0 <= index < len(self.Devices) else None, pHandle)
+
+    def FT_OpenEx(self, pArg1, Flags, pHandle):
+        flags = _backend.Value(Flags)
+        if flags & _FT.OPEN_BY_LOCATION:
+            location = _backend.Address(pArg1)
+            match = lambda device: device.LocId == location
+        else:
+            name = pArg1.value if isinstance(pArg1, _c.c_char_p) else _c.string_at(_backend.Address(pArg1))
+            attribute = 'Description' if flags & _FT.OPEN_BY_DESCRIPTION else 'SerialNumber'
+            match = lambda device: getattr(device, attribute) == name
+        return self._open(next((device for device in self.Devices if match(device)), None), pHandle)
+
+    def FT_Close(self, ftHandle):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        device.Opened = False
+        with device.Lock:
+            del device.Rx[:]
+        return _FT.OK
+
+    # Data transfer
+
+    def FT_Read(self, ftHandle, lpBuffer, dwBytesToRead, lpBytesReturned):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        count = _backend.Value(dwBytesToRead)
+        if device.Streaming:
+            if len(self._stream) < count:
+                self._stream = bytes(count)
+            _c.memmove(_backend.Address(lpBuffer), self._stream, count)
+        else:
+            with device.Lock:
+                count = min(count, len(device.Rx))
+                if count:
+                    _backend.WriteBuffer(lpBuffer, bytes(device.Rx[:count]))
+                    del device.Rx[:count]
+        _backend.Store(lpBytesReturned, count)
+        return _FT.OK
+
+    def FT_Write(self, ftHandle, lpBuffer, dwBytesToWrite, lpBytesWritten):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        count = _backend.Value(dwBytesToWrite)
+        if not device.Streaming and count:
+            device.Feed(_backend.ReadBuffer(lpBuffer, count))
+        _backend.Store(lpBytesWritten, count)
+        return _FT.OK
+
+    def FT_GetQueueStatus(self, ftHandle, dwRxBytes):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(dwRxBytes, len(self._stream) if device.Streaming else len(device.Rx))
+        return _FT.OK
+
+    FT_GetQueueStatusEx = FT_GetQueueStatus
+
+    def FT_GetStatus(self, ftHandle, dwRxBytes, dwTxBytes, dwEventDWord):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        with device.Lock:
+            _backend.Store(dwRxBytes, len(self._stream) if device.Streaming else len(device.Rx))
+            _backend.Store(dwTxBytes, 0)
+            _backend.Store(dwEventDWord, device.EventStatus)
+            device.EventStatus = 0
+        return _FT.OK
+
+    def FT_Purge(self, ftHandle, Mask):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        if _backend.Value(Mask) & _FT.PURGE_RX:
+            with device.Lock:
+                del device.Rx[:]
+        return _FT.OK
+
+    # Status and configuration
+
+    def FT_GetModemStatus(self, ftHandle, pModemStatus):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(pModemStatus, device.ModemStatus)
+        return _FT.OK
+
+    def FT_GetDeviceInfo(self, ftHandle, lpftDevice, lpdwID, SerialNumber, Description, Dummy):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(lpftDevice, device.Type)
+        _backend.Store(lpdwID, device.ID)
+        _backend.WriteBuffer(SerialNumber, device.SerialNumber + b'\0')
+        _backend.WriteBuffer(Description, device.Description + b'\0')
+        return _FT.OK
+
+    def FT_GetDriverVersion(self, ftHandle, lpdwVersion):
+        if self._device(ftHandle) is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(lpdwVersion, 0x00021216)
+        return _FT.OK
+
+    def FT_SetEventNotification(self, ftHandle, Mask, Param):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        device.EventMask = _backend.Value(Mask)
+        return _FT.OK
+
+    def FT_SetLatencyTimer(self, ftHandle, ucLatency):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        device.LatencyTimer = _backend.Value(ucLatency)
+        return _FT.OK
+
+    def FT_GetLatencyTimer(self, ftHandle, pucLatency):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(pucLatency, device.LatencyTimer)
+        return _FT.OK
+
+    def FT_SetBitMode(self, ftHandle, ucMask, ucEnable):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        device.BitMode = _backend.Value(ucEnable)
+        return _FT.OK
+
+    def FT_GetBitMode(self, ftHandle, pucMode):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(pucMode, device.BitMode)
+        return _FT.OK
+
+    def FT_EE_UASize(self, ftHandle, lpdwSize):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        _backend.Store(lpdwSize, len(device.UserArea))
+        return _FT.OK
+
+    def FT_EE_UARead(self, ftHandle, pucData, dwDataLen, lpdwBytesRead):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        count = _backend.Value(dwDataLen)
+        if count > len(device.UserArea):
+            return _FT.INVALID_PARAMETER
+        _backend.WriteBuffer(pucData, bytes(device.UserArea[:count]))
+        _backend.Store(lpdwBytesRead, count)
+        return _FT.OK
+
+    def FT_EE_UAWrite(self, ftHandle, pucData, dwDataLen):
+        device = self._device(ftHandle)
+        if device is None:
+            return _FT.INVALID_HANDLE
+        count = _backend.Value(dwDataLen)
+        if count > len(device.UserArea):
+            return _FT.INVALID_PARAMETER
+        device.UserArea[:count] = _backend.ReadBuffer(pucData, count)
+        return _FT.OK
+
+    def _accept(self, ftHandle, *args):
+        return _FT.OK if self._device(ftHandle) is not None else _FT.INVALID_HANDLE
+
+    # Settings without an observable effect on a loopback
+    FT_SetBaudRate = FT_SetDivisor = FT_SetDataCharacteristics = FT_SetFlowControl = _accept
+    FT_SetTimeouts = FT_SetChars = FT_SetDtr = FT_ClrDtr = FT_SetRts = FT_ClrRts = _accept
+    FT_SetBreakOn = FT_SetBreakOff = FT_ResetDevice = FT_ResetPort = FT_CyclePort = _accept
+    FT_SetUSBParameters = FT_SetDeadmanTimeout = FT_SetResetPipeRetryCount = _accept
+    FT_StopInTask = FT_RestartInTask = _accept
@@ -0,0 +1,127 @@
+"""
+Recycled transfer buffers. Read, ReadAvailable, ReadAtLeast and EE_UARead
+need a ctypes buffer for every call; allocating a fresh one each time churns
+the allocator and the garbage collector during long captures. A BufferPool
+keeps released buffers by size class and hands them out again.
+
+Size classes are powers of two from the USB 2.0 high speed bulk packet size
+of 512 bytes up, so every buffer holds a whole number of packets. A lease
+is served from the smallest class that fits. Buffers larger than MaxSize
+are allocated and dropped as usual.
+
+Code that reads into a leased buffer with ReadAvailable or ReadAtLeast and
+releases it when done allocates nothing once the pool is warm:
+
+    with DefaultPool.Leased(65536) as buffer:
+        count = ReadAvailable(Handle, Buffer=buffer)
+"""
+
+import contextlib as _contextlib
+import ctypes as _c
+from munch import Munch as _ret
+
+
+PACKET_SIZE = 512
+
+
+def SizeClass(Size):
+    """Return the buffer size serving a lease of Size bytes."""
+    if Size <= PACKET_SIZE:
+        return PACKET_SIZE
+    return 1 << (Size - 1).bit_length()
+
+
+class BufferPool(object):
+    """Pool of ctypes c_char arrays by size class.
+
+    Args:
+        MaxPerClass (int, optional): Largest number of free buffers kept per size class. Defaults to 4.
+        MaxSize (int, optional): Largest buffer size kept in the pool. Defaults to 4 MiB.
+    """
+    def __init__(self, MaxPerClass=4, MaxSize=1 << 22):
+        self.MaxPerClass = MaxPerClass
+        self.MaxSize = MaxSize
+        # One free list per size class; list.pop and list.append are atomic, so the
+        # hot path takes no lock. The counters may miss an update under contention.
+        self._free = dict((PACKET_SIZE << shift, []) for shift in range(max(1, MaxSize // PACKET_SIZE).bit_length()))
+        self._leases = self._hits = self._releases = self._allocated = 0
+
+    def Lease(self, Size):
+        """Take a buffer of at least Size bytes. Give it back with Release when done.
+
+        Args:
+            Size (int): The number of bytes needed.
+
+        Returns:
+            ctypes.Array: A c_char array of the size class of Size, with undefined content.
+        """
+        size = SizeClass(Size)
+        self._leases += 1
+        free = self._free.get(size)
+        if free:
+            try:
+                buffer = free.pop()
+                self._hits += 1
+                return buffer
+            except IndexError:
+                # Emptied by another thread meanwhile
+                pass
+        self._allocated += size
+        return (_c.c_char * size)()
+
+    def Release(self, Buffer):
+        """Return a leased buffer. It must not be used afterwards.
+
+        Args:
+            Buffer (ctypes.Array): A buffer returned by Lease.
+
+        Returns:
+            None
+        """
+        self._releases += 1
+        free = self._free.get(_c.sizeof(Buffer))
+        if free is not None and len(free) < self.MaxPerClass:
+            free.append(Buffer)
+        return None
+
+    @_contextlib.contextmanager
+    def Leased(self, Size):
+        """Context manager leasing a buffer of at least Size bytes and releasing it on exit."""
+        buffer = self.Lease(Size)
+        try:
+            yield buffer
+        finally:
+            self.Release(buffer)
+
+    def Clear(self):
+        """Drop all free buffers.
+
+        Returns:
+            None
+        """
+        for free in self._free.values():
+            del free[:]
+        return None
+
+    def GetStatistics(self):
+        """Return the pool counters.
+
+        Returns:
+            dict: A dict also accecible as a munch.
+                Leases (int): Number of leases.
+                Hits (int): Leases served from the pool.
+                Misses (int): Leases that allocated a buffer.
+                HitRate (float): Hits per lease, None before the first lease.
+                Outstanding (int): Buffers leased and not yet released.
+                Allocated (int): Total bytes allocated for leases.
+                Pooled (int): Bytes in free buffers held by the pool.
+        """
+        pooled = sum(size * len(free) for size, free in list(self._free.items()))
+        leases, hits = self._leases, self._hits
+        return _ret(Leases=leases, Hits=hits, Misses=leases - hits,
+                HitRate=hits / leases if leases else None, Outstanding=leases - self._releases,
+                Allocated=self._allocated, Pooled=pooled)
+
+
+# Pool used by the read functions of pyftd2xx
+DefaultPool = BufferPool()
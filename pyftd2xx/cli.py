@@ -0,0 +1,270 @@
+"""
+Command line tool, run as pyftd2xx or python -m pyftd2xx.
+
+    pyftd2xx list [--json] [--max-age SECONDS]
+    pyftd2xx bench [-d DEVICE] [--sizes 64,4096] [--latency 1,16] [--duration SECONDS]
+    pyftd2xx capture [-d DEVICE] [--duration SECONDS] [--bytes COUNT] OUTPUT
+    pyftd2xx stats [-d DEVICE]
+
+DEVICE is a serial number or an index. --backend selects another D2XX
+library, e.g. --backend sim:2 for simulated loopback devices or
+--backend sim:1:stream for a simulated device streaming data, so every
+command can be tried without hardware.
+
+bench needs a loopback, TX connected to RX: it writes each chunk, reads it
+back and reports throughput and round trip latency for every combination of
+chunk size and latency timer.
+"""
+
+import argparse as _argparse
+import json as _json
+import os as _os
+import re as _re
+import sys as _sys
+import time as _time
+from . import pyftd2xx as _ft
+from . import _defines as _FT
+from .modem import DecodeModemStatus as _decode_modem
+
+
+def _version(Value):
+    """Format a D2XX version number, 0x00030215 is 3.02.15."""
+    return '%x.%02x.%02x' % ((Value >> 16) & 0xff, (Value >> 8) & 0xff, Value & 0xff)
+
+def _names(Type, Value):
+    return list(member.name for member in Type if member & Value)
+
+def _device_dict(Info):
+    return dict(Index=Info.Index, SerialNumber=Info.SerialNumber, Description=Info.Description,
+            Type=Info.Type, ID=Info.ID, LocId=Info.LocId, Flags=Info.Flags)
+
+def _print_json(Value):
+    _json.dump(Value, _sys.stdout, indent=2)
+    _sys.stdout.write('\n')
+
+def _int_list(Text):
+    return list(int(value, 0) for value in Text.split(','))
+
+def _open(Device):
+    """Open by index if Device is a number, else by serial number."""
+    if Device is None or _re.match(r'^\d+$', Device):
+        return _ft.Open(int(Device or 0))
+    return _ft.OpenEx(Device, _FT.OPEN_BY_SERIAL_NUMBER)
+
+def _configure(Handle, Args):
+    if Args.bitmode is not None:
+        _ft.SetBitMode(Handle, Args.mask, Args.bitmode)
+    if getattr(Args, 'latency_timer', None) is not None:
+        _ft.SetLatencyTimer(Handle, Args.latency_timer)
+
+
+def _cache_path(Backend):
+    base = _os.environ.get('XDG_CACHE_HOME') or _os.path.join(_os.path.expanduser('~'), '.cache')
+    return _os.path.join(base, 'pyftd2xx', 'devices-%s.json' % _re.sub(r'\W', '_', Backend or 'native'))
+
+def _list_devices(Args):
+    """Enumerate the devices, reusing an enumeration younger than --max-age."""
+    path = _cache_path(Args.backend)
+    if Args.max_age > 0:
+        try:
+            if _time.time() - _os.path.getmtime(path) < Args.max_age:
+                with open(path) as file:
+                    return _json.load(file)
+        except (OSError, ValueError):
+            pass
+    devices = list(_device_dict(info) for info in _ft.GetDeviceInfoList())
+    if Args.max_age > 0:
+        try:
+            _os.makedirs(_os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                _json.dump(devices, file)
+        except OSError:
+            # A read-only home only costs the next enumeration
+            pass
+    return devices
+
+def _list(Args):
+    devices = _list_devices(Args)
+    if Args.json:
+        _print_json(devices)
+        return 0
+    for device in devices:
+        print('%(Index)3d  %(SerialNumber)-16s %(Type)-16s 0x%(LocId)04x  %(Description)s' % device)
+    if not devices:
+        print('No devices found')
+    return 0
+
+
+def _percentile(Sorted, Fraction):
+    return Sorted[min(len(Sorted) - 1, int(Fraction * len(Sorted)))]
+
+def _bench_one(Handle, Size, Duration, Timeout):
+    data = _os.urandom(Size)
+    buffer = bytearray(Size)
+    _ft.Purge(Handle, _FT.PURGE_RX_TX)
+    times = []
+    total = timeouts = errors = 0
+    clock = _time.perf_counter
+    start = clock()
+    end = start + Duration
+    while True:
+        sent = clock()
+        _ft.Write(Handle, data)
+        count = _ft.ReadAtLeast(Handle, Size, Size, Timeout, buffer)
+        now = clock()
+        times.append(now - sent)
+        total += count
+        if count < Size:
+            timeouts += 1
+            _ft.Purge(Handle, _FT.PURGE_RX_TX)
+        elif buffer != data:
+            errors += 1
+        if now >= end:
+            break
+    elapsed = clock() - start
+    times.sort()
+    return dict(Size=Size, Transfers=len(times), Bytes=total, MBps=total / elapsed / 1e6,
+            MinLatencyUs=times[0] * 1e6, MedianLatencyUs=_percentile(times, 0.5) * 1e6,
+            P99LatencyUs=_percentile(times, 0.99) * 1e6, Timeouts=timeouts, Errors=errors)
+
+def _bench(Args):
+    handle = _open(Args.device)
+    try:
+        _configure(handle, Args)
+        results = []
+        for latency in Args.latency:
+            _ft.SetLatencyTimer(handle, latency)
+            for size in Args.sizes:
+                result = _bench_one(handle, size, Args.duration, Args.timeout)
+                result['LatencyTimer'] = latency
+                results.append(result)
+    finally:
+        _ft.Close(handle)
+    _print_json(dict(Device=Args.device or '0', Results=results))
+    return 0
+
+
+def _capture(Args):
+    handle = _open(Args.device)
+    buffer = bytearray(Args.chunk)
+    view = memoryview(buffer)
+    total = 0
+    clock = _time.perf_counter
+    try:
+        _configure(handle, Args)
+        _ft.Purge(handle, _FT.PURGE_RX)
+        if Args.output == '-':
+            output = _os.fdopen(_os.dup(_sys.stdout.fileno()), 'wb', buffering=1 << 20)
+        else:
+            output = open(Args.output, 'wb', buffering=1 << 20)
+        start = clock()
+        end = None if Args.duration is None else start + Args.duration
+        with output:
+            try:
+                while Args.bytes is None or total < Args.bytes:
+                    wanted = Args.chunk if Args.bytes is None else min(Args.chunk, Args.bytes - total)
+                    count = _ft.ReadAtLeast(handle, 1, wanted, 0.1, buffer)
+                    if count:
+                        output.write(view[:count])
+                        total += count
+                    if end is not None and clock() >= end:
+                        break
+            except KeyboardInterrupt:
+                pass
+        elapsed = clock() - start
+    finally:
+        view.release()
+        _ft.Close(handle)
+    _json.dump(dict(Bytes=total, Seconds=elapsed, MBps=total / elapsed / 1e6 if elapsed else None), _sys.stderr)
+    _sys.stderr.write('\n')
+    return 0
+
+
+def _device_stats(Handle):
+    status = _ft.GetStatus(Handle)
+    modem, line = _decode_modem(_ft.GetModemStatus(Handle))
+    info = _ft.GetDeviceInfo(Handle)
+    return dict(SerialNumber=info.SerialNumber, Description=info.Description,
+            Type=info.Type, DriverVersion=_version(_ft.GetDriverVersion(Handle)),
+            LatencyTimer=_ft.GetLatencyTimer(Handle), BitMode=_ft.GetBitMode(Handle),
+            RxQueue=status.AmountInRxQueue, TxQueue=status.AmountInTxQueue,
+            ModemStatus=_names(_FT.ModemStatus, modem), LineStatus=_names(_FT.LineStatus, line))
+
+def _stats(Args):
+    if Args.device is None:
+        devices = list(str(info.Index) for info in _ft.GetDeviceInfoList())
+    else:
+        devices = [Args.device]
+    results = []
+    for device in devices:
+        try:
+            handle = _open(device)
+        except _ft.StatusError as error:
+            # Typically open in another process
+            results.append(dict(Device=device, Error=str(error)))
+            continue
+        try:
+            results.append(dict(Device=device, **_device_stats(handle)))
+        finally:
+            _ft.Close(handle)
+    _print_json(dict(LibraryVersion=_version(_ft.GetLibraryVersion()), Devices=results))
+    return 0
+
+
+def _parser():
+    parser = _argparse.ArgumentParser(prog='pyftd2xx', description='List, benchmark and capture FTDI devices through D2XX.')
+    parser.add_argument('--backend', help="D2XX library to use, e.g. 'sim:2', 'sim:1:stream' or 'replay:<path>'. "
+            'Defaults to PYFTD2XX_BACKEND or the native library.')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    def device_options(command):
+        command.add_argument('-d', '--device', help='Serial number or index of the device. Defaults to 0.')
+        command.add_argument('--bitmode', type=lambda value: int(value, 0), help='Bit mode set after opening, e.g. 0x40.')
+        command.add_argument('--mask', type=lambda value: int(value, 0), default=0xff, help='Bit mode direction mask. Defaults to 0xff.')
+
+    command = commands.add_parser('list', help='List the connected devices.')
+    command.add_argument('--json', action='store_true', help='Print JSON instead of a table.')
+    command.add_argument('--max-age', type=float, default=2.0,
+            help='Reuse an enumeration younger than this many seconds, 0 to always enumerate. Defaults to 2.')
+    command.set_defaults(function=_list)
+
+    command = commands.add_parser('bench', help='Loopback throughput and latency over chunk sizes and latency timers.')
+    device_options(command)
+    command.add_argument('--sizes', type=_int_list, default=[64, 512, 4096, 65536], help='Comma separated chunk sizes.')
+    command.add_argument('--latency', type=_int_list, default=[1, 2, 16], help='Comma separated latency timer values in ms.')
+    command.add_argument('--duration', type=float, default=1.0, help='Seconds per combination. Defaults to 1.')
+    command.add_argument('--timeout', type=float, default=1.0, help='Seconds to wait for each chunk. Defaults to 1.')
+    command.set_defaults(function=_bench)
+
+    command = commands.add_parser('capture', help='Stream received data to a file.')
+    device_options(command)
+    command.add_argument('output', help="Output file, '-' for stdout.")
+    command.add_argument('--duration', type=float, help='Seconds to capture. Defaults to until interrupted.')
+    command.add_argument('--bytes', type=int, help='Number of bytes to capture.')
+    command.add_argument('--chunk', type=int, default=1 << 16, help='Largest read in bytes. Defaults to 65536.')
+    command.add_argument('--latency-timer', type=int, help='Latency timer in ms set after opening.')
+    command.set_defaults(function=_capture)
+
+    command = commands.add_parser('stats', help='Queue, modem and configuration state of the devices.')
+    command.add_argument('-d', '--device', help='Serial number or index of the device. Defaults to all devices.')
+    command.set_defaults(function=_stats)
+    return parser
+
+def main(argv=None):
+    """Run the command line tool.
+
+    Args:
+        argv (list(str), optional): The arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    args = _parser().parse_args(argv)
+    try:
+        if args.backend:
+            _ft.UseBackend(args.backend)
+        return args.function(args)
+    except (_ft.StatusError, ValueError, OSError) as error:
+        _sys.stderr.write('pyftd2xx: %s\n' % error)
+        return 1
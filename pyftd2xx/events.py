@@ -0,0 +1,215 @@
+"""
+Callbacks for device events. An EventDispatcher waits for the events of a
+device through event notification (polling where it is not available) and
+calls the registered Python callbacks from its own thread, so applications
+react to received data and modem changes without polling themselves.
+
+Events arriving in a burst are coalesced: after the first event the
+dispatcher gathers further events for a short window and then calls each
+callback once for the whole batch. The dispatch latency, from the first
+event of a batch to the start of its callbacks, is measured.
+
+Handler is a PFT_EVENT_HANDLER compatible function pointer for code that
+signals events from a native thread. ctypes acquires the GIL for it; it
+only records the event and wakes the dispatcher, so the native thread is
+never blocked by a callback.
+"""
+
+import sys as _sys
+import threading as _threading
+import time as _time
+from munch import Munch as _ret
+from . import _ftd2xx as _lib
+from . import _defines as _FT
+from ._event import EventWaiter as _EventWaiter
+
+
+# The function type PFT_EVENT_HANDLER points to
+EVENT_HANDLER = _lib.PFT_EVENT_HANDLER._type_
+
+# Handlers of all dispatchers that are not closed, a native caller must never see a freed one
+_handlers = {}
+
+
+class EventDispatcher(object):
+    """Call Python callbacks for the events of a device.
+
+    Callbacks are called as Callback(Batch) from the dispatcher thread. Batch is a dict
+    also accecible as a munch with Handle (ctypes.c_void_p), Events (FT.Event, all events
+    of the batch), Count (int, number of notifications coalesced), Time (float,
+    time.perf_counter() of the first notification) and Latency (float, seconds from the
+    first notification to the dispatch).
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Mask (int, optional): Combination of FT.EVENT_ flags to wait for. Defaults to FT.EVENT_ALL.
+        Coalesce (float, optional): Time in seconds to gather further events after the first one. Defaults to 0.001.
+        PollInterval (float, optional): Polling interval in seconds where notification is not available. Defaults to 0.001.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+    """
+    def __init__(self, Handle, Mask=_FT.EVENT_ALL, Coalesce=0.001, PollInterval=0.001):
+        self.Handle = Handle
+        self.Mask = Mask
+        self.Coalesce = Coalesce
+        self._waiter = _EventWaiter(Handle, Mask, PollInterval)
+        self._lock = _threading.Lock()
+        self._callbacks = []
+        self._pending = 0
+        self._count = 0
+        self._first = None
+        self._thread = None
+        self._stop = False
+        self._stats = [0, 0, 0.0, 0.0]
+        self._handler = EVENT_HANDLER(self._native)
+        _handlers[id(self)] = self._handler
+
+    @property
+    def Handler(self):
+        """PFT_EVENT_HANDLER compatible function pointer, called as Handler(Events, Param)."""
+        return self._handler
+
+    def Register(self, Callback, Mask=None):
+        """Register a callback. It is referenced by the dispatcher until unregistered.
+
+        Args:
+            Callback (callable): Called as Callback(Batch).
+            Mask (int, optional): Only call it for batches containing one of these events. Defaults to all events.
+
+        Returns:
+            callable: The callback, to unregister it again.
+        """
+        with self._lock:
+            self._callbacks.append((Callback, Mask))
+        return Callback
+
+    def Unregister(self, Callback):
+        """Remove a callback. Unknown callbacks are ignored.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._callbacks = list(entry for entry in self._callbacks if entry[0] is not Callback)
+        return None
+
+    def Notify(self, Events):
+        """Post events, e.g. from another source than the driver.
+
+        Args:
+            Events (int): Combination of FT.EVENT_ flags.
+
+        Returns:
+            None
+        """
+        self._post(Events, _time.perf_counter())
+        self._waiter.Wake()
+        return None
+
+    def _native(self, Events, Param):
+        self._post(Events or self.Mask, _time.perf_counter())
+        self._waiter.Wake()
+
+    def _post(self, events, now):
+        with self._lock:
+            if not self._pending:
+                self._first = now
+            self._pending |= events
+            self._count += 1
+
+    def _take(self):
+        with self._lock:
+            events, count, first = self._pending, self._count, self._first
+            self._pending = self._count = 0
+            self._first = None
+            return events, count, first, list(self._callbacks)
+
+    def _wait(self, timeout):
+        events = self._waiter.WaitEvents(timeout)
+        if events:
+            self._post(events, _time.perf_counter())
+
+    def _run(self):
+        clock = _time.perf_counter
+        while not self._stop:
+            try:
+                self._wait(None)
+                if self._stop or not self._pending:
+                    continue
+                deadline = self._first + self.Coalesce
+                remaining = deadline - clock()
+                while remaining > 0 and not self._stop:
+                    self._wait(remaining)
+                    remaining = deadline - clock()
+            except Exception:
+                # A failing device must not end the dispatcher, report it and carry on
+                _sys.excepthook(*_sys.exc_info())
+                _time.sleep(self.Coalesce)
+            events, count, first, callbacks = self._take()
+            if not events:
+                continue
+            latency = clock() - first
+            stats = self._stats
+            stats[0] += count
+            stats[1] += 1
+            stats[2] += latency
+            stats[3] = max(stats[3], latency)
+            batch = _ret(Handle=self.Handle, Events=_FT.DECODE(_FT.Event, int(events)), Count=count, Time=first, Latency=latency)
+            for callback, mask in callbacks:
+                if mask is None or events & mask:
+                    try:
+                        callback(batch)
+                    except Exception:
+                        _sys.excepthook(*_sys.exc_info())
+
+    def GetStatistics(self):
+        """Return the dispatch statistics.
+
+        Returns:
+            dict: A dict also accecible as a munch.
+                Events (int): Number of notifications received.
+                Batches (int): Number of batches dispatched.
+                MeanLatency (float): Mean dispatch latency in seconds, None before the first batch.
+                MaxLatency (float): Largest dispatch latency in seconds.
+        """
+        events, batches, total, maximum = self._stats
+        return _ret(Events=events, Batches=batches, MeanLatency=total / batches if batches else None, MaxLatency=maximum)
+
+    def Start(self):
+        """Start the dispatcher thread."""
+        if self._thread is None:
+            self._stop = False
+            self._thread = _threading.Thread(target=self._run, name='pyftd2xx-events', daemon=True)
+            self._thread.start()
+        return None
+
+    def Stop(self):
+        """Stop the dispatcher thread. Events arriving until Start are kept for the next batch."""
+        if self._thread is not None:
+            self._stop = True
+            self._waiter.Wake()
+            self._thread.join()
+            self._thread = None
+        return None
+
+    def Close(self):
+        """Stop the dispatcher and the event notification. The Handler must not be called afterwards.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            None
+        """
+        self.Stop()
+        self._waiter.Close()
+        _handlers.pop(id(self), None)
+        return None
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
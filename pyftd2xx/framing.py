@@ -0,0 +1,255 @@
+"""
+Frame extraction on top of Read. A FrameReader reads whatever is queued
+straight into one growable buffer and lets a decoder cut frames out of it in
+place. Frames are returned as memoryviews into that buffer, so neither the
+received data nor the frames are copied or concatenated. A frame is only
+valid until the next read of its FrameReader; copy it with bytes() to keep it.
+
+A decoder implements Decode(Buffer, Start, End), which looks at Buffer[Start:End]
+and returns None if it does not hold a complete frame yet, or a tuple
+(FrameStart, FrameEnd, Next) where Next is the position after the frame.
+FrameStart is None for data that was consumed without yielding a frame.
+Decoders may rewrite the buffer in place between Start and Next.
+"""
+
+import ctypes as _c
+import struct as _struct
+from . import pyftd2xx as _ft
+from . import _ftd2xx as _lib
+
+
+class DelimiterDecoder(object):
+    """Frames terminated by a delimiter, e.g. lines.
+
+    Args:
+        Delimiter (bytes, optional): The terminating byte sequence. Defaults to b'\\n'.
+        KeepDelimiter (bool, optional): Include the delimiter in the frame. Defaults to False.
+    """
+    def __init__(self, Delimiter=b'\n', KeepDelimiter=False):
+        self.Delimiter = bytes(Delimiter)
+        self.KeepDelimiter = KeepDelimiter
+
+    def Decode(self, Buffer, Start, End):
+        pos = Buffer.find(self.Delimiter, Start, End)
+        if pos < 0:
+            return None
+        next = pos + len(self.Delimiter)
+        return (Start, next if self.KeepDelimiter else pos, next)
+
+
+class LengthPrefixDecoder(object):
+    """Frames starting with a length field.
+
+    Args:
+        HeaderSize (int, optional): Size of the length field in bytes, one of 1, 2 or 4. Defaults to 2.
+        ByteOrder (str, optional): 'little' or 'big'. Defaults to 'little'.
+        Adjust (int, optional): Added to the length field to get the payload length, e.g. if the
+            length includes itself. Defaults to 0.
+        IncludeHeader (bool, optional): Include the length field in the frame. Defaults to False.
+        MaxLength (int, optional): Payload lengths above this are treated as corrupt and the first byte
+            is skipped to resynchronize. Defaults to None.
+
+    Attributes:
+        Errors (int): Number of bytes skipped because of corrupt length fields.
+    """
+    def __init__(self, HeaderSize=2, ByteOrder='little', Adjust=0, IncludeHeader=False, MaxLength=None):
+        self.HeaderSize = HeaderSize
+        self.Adjust = Adjust
+        self.IncludeHeader = IncludeHeader
+        self.MaxLength = MaxLength
+        self.Errors = 0
+        self._unpack = _struct.Struct(('<' if ByteOrder == 'little' else '>') + {1: 'B', 2: 'H', 4: 'I'}[HeaderSize]).unpack_from
+
+    def Decode(self, Buffer, Start, End):
+        header = Start + self.HeaderSize
+        if header > End:
+            return None
+        length = self._unpack(Buffer, Start)[0] + self.Adjust
+        if length < 0 or (self.MaxLength is not None and length > self.MaxLength):
+            self.Errors += 1
+            return (None, None, Start + 1)
+        next = header + length
+        if next > End:
+            return None
+        return (Start if self.IncludeHeader else header, next, next)
+
+
+class SlipDecoder(object):
+    """SLIP (RFC 1055) frames, unescaped in place. Empty frames are skipped.
+
+    Attributes:
+        Errors (int): Number of invalid escape sequences, which are passed through unchanged.
+    """
+    END = 0xC0
+    ESC = 0xDB
+    ESC_END = 0xDC
+    ESC_ESC = 0xDD
+
+    def __init__(self):
+        self.Errors = 0
+
+    def Decode(self, Buffer, Start, End):
+        pos = Buffer.find(b'\xc0', Start, End)
+        if pos < 0:
+            return None
+        if pos == Start:
+            return (None, None, pos + 1)
+        src = dst = Start
+        while True:
+            esc = Buffer.find(b'\xdb', src, pos)
+            if esc < 0:
+                if dst != src:
+                    Buffer[dst:dst + pos - src] = Buffer[src:pos]
+                dst += pos - src
+                break
+            if dst != src:
+                Buffer[dst:dst + esc - src] = Buffer[src:esc]
+            dst += esc - src
+            code = Buffer[esc + 1] if esc + 1 < pos else None
+            if code == self.ESC_END:
+                Buffer[dst] = self.END
+            elif code == self.ESC_ESC:
+                Buffer[dst] = self.ESC
+            else:
+                self.Errors += 1
+                Buffer[dst] = self.ESC
+                code = None
+            dst += 1
+            src = esc + 1 if code is None else esc + 2
+        return (Start, dst, pos + 1)
+
+
+class CobsDecoder(object):
+    """COBS frames delimited by zero bytes, decoded in place. Empty frames are skipped.
+
+    Attributes:
+        Errors (int): Number of frames dropped because of invalid encoding.
+    """
+    def __init__(self):
+        self.Errors = 0
+
+    def Decode(self, Buffer, Start, End):
+        pos = Buffer.find(b'\x00', Start, End)
+        if pos < 0:
+            return None
+        if pos == Start:
+            return (None, None, pos + 1)
+        src = dst = Start
+        while src < pos:
+            code = Buffer[src]
+            if src + code > pos:
+                self.Errors += 1
+                return (None, None, pos + 1)
+            Buffer[dst:dst + code - 1] = Buffer[src + 1:src + code]
+            dst += code - 1
+            src += code
+            if code != 0xFF and src < pos:
+                Buffer[dst] = 0
+                dst += 1
+        return (Start, dst, pos + 1)
+
+
+class FrameReader(object):
+    """Read frames from a device.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Decoder: One of the decoders of this module or any object with a compatible Decode method.
+        BufferSize (int, optional): Initial size of the receive buffer. It grows when a frame does not fit. Defaults to 65536.
+        MinRead (int, optional): Bytes to wait for when the receive queue is empty. The wait is bounded by the
+            read timeout of the device. Defaults to 1.
+    """
+    def __init__(self, Handle, Decoder, BufferSize=65536, MinRead=1):
+        self.Handle = Handle
+        self.Decoder = Decoder
+        self.MinRead = MinRead
+        self._start = 0
+        self._end = 0
+        self._returned = _lib.DWORD()
+        self._allocate(BufferSize)
+
+    def _allocate(self, size):
+        buffer = bytearray(size)
+        length = self._end - self._start
+        if length:
+            buffer[0:length] = self._buffer[self._start:self._end]
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._cbuffer = (_c.c_char * size).from_buffer(buffer)
+        self._start = 0
+        self._end = length
+
+    def _reserve(self, count):
+        """Make room for count bytes behind the buffered data."""
+        if len(self._buffer) - self._end >= count:
+            return
+        length = self._end - self._start
+        if length + count <= len(self._buffer) and self._start:
+            self._buffer[0:length] = self._buffer[self._start:self._end]
+            self._start = 0
+            self._end = length
+        else:
+            self._allocate(max(2 * len(self._buffer), length + count))
+
+    def Feed(self, Data):
+        """Append data received by other means than Read.
+
+        Args:
+            Data (bytes): The received data.
+
+        Returns:
+            None
+        """
+        self._reserve(len(Data))
+        self._buffer[self._end:self._end + len(Data)] = Data
+        self._end += len(Data)
+        return None
+
+    def Fill(self):
+        """Read everything queued, or wait for MinRead bytes if nothing is queued.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            int: The number of bytes read.
+        """
+        count = _ft.GetQueueStatus(self.Handle) or self.MinRead
+        self._reserve(count)
+        _lib.FT_Read(self.Handle, _c.byref(self._cbuffer, self._end), _lib.DWORD(count), _c.byref(self._returned))
+        self._end += self._returned.value
+        return self._returned.value
+
+    def Extract(self):
+        """Yield the complete frames in the buffer without reading.
+
+        Yields:
+            memoryview: The frame, valid until the next Fill or Feed.
+        """
+        decode = self.Decoder.Decode
+        while self._start < self._end:
+            frame = decode(self._buffer, self._start, self._end)
+            if frame is None:
+                break
+            self._start = frame[2]
+            if frame[0] is not None:
+                yield self._view[frame[0]:frame[1]]
+        if self._start == self._end:
+            self._start = self._end = 0
+
+    def Frames(self):
+        """Yield frames, reading from the device whenever the buffer holds no complete frame.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Yields:
+            memoryview: The frame, valid until the next frame is requested.
+        """
+        while True:
+            for frame in self.Extract():
+                yield frame
+            self.Fill()
+
+    def __iter__(self):
+        return self.Frames()
@@ -0,0 +1,187 @@
+"""
+Hot-plug detection without rebuilding the device information list. A
+background thread polls the number of connected devices, which is cheap,
+and only lists serial numbers and locations when the number changed or a
+full scan is due. Lists are compared as sets, so the cost of a scan grows
+linearly with the number of attached devices and open devices are not
+touched at all.
+"""
+
+import threading as _threading
+import time as _time
+from munch import Munch as _ret
+from . import pyftd2xx as _ft
+from . import _defines as _FT
+
+
+ARRIVAL = 'Arrival'
+REMOVAL = 'Removal'
+
+
+def _scan():
+    """Return the set of (SerialNumber, Location) of all connected devices."""
+    if _ft.ListDevices(_FT.LIST_NUMBER_ONLY) == 0:
+        return set()
+    serials = _ft.ListDevices(_FT.LIST_ALL_BY_SERIAL_NUMBER)
+    try:
+        locations = _ft.ListDevices(_FT.LIST_ALL_BY_LOCATION)
+    except _ft.StatusError:
+        # Location IDs are not supported on every platform
+        locations = []
+    if len(locations) != len(serials):
+        locations = [0] * len(serials)
+    return set(zip(serials, locations))
+
+
+class _AsyncEvents(object):
+    def __init__(self, monitor, loop, queue):
+        self._monitor = monitor
+        self._loop = loop
+        self._queue = queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    async def aclose(self):
+        self._monitor._detach(self)
+
+
+class HotplugMonitor(object):
+    """Watch for devices being attached or removed.
+
+    Events are dicts also accecible as a munch with Event (ARRIVAL or REMOVAL),
+    SerialNumber (str), Location (int) and Time (float, time.time()). They are passed
+    to every registered callback, put into the given queue and yielded by
+    'async for event in monitor'. Callbacks run on the monitor thread.
+
+    Args:
+        Callback (callable, optional): Called with each event. Defaults to None.
+        Queue (queue.Queue, optional): Queue each event is put into. Defaults to None.
+        Interval (float, optional): Time between two polls of the device count in seconds. Defaults to 0.5.
+        FullScanInterval (float, optional): Time after which serial numbers and locations are compared even if
+            the device count did not change, to detect a device being swapped for another. Defaults to 10.
+    """
+    def __init__(self, Callback=None, Queue=None, Interval=0.5, FullScanInterval=10.0):
+        self.Interval = Interval
+        self.FullScanInterval = FullScanInterval
+        self.Queue = Queue
+        self._callbacks = [] if Callback is None else [Callback]
+        self._async = []
+        self._lock = _threading.Lock()
+        self._stop = _threading.Event()
+        self._thread = None
+        self._devices = None
+        self._count = None
+        self._scanned = 0.0
+
+    def AddCallback(self, Callback):
+        """Register a callback called with each event."""
+        with self._lock:
+            self._callbacks.append(Callback)
+        return None
+
+    def RemoveCallback(self, Callback):
+        """Unregister a callback."""
+        with self._lock:
+            self._callbacks.remove(Callback)
+        return None
+
+    def GetDevices(self):
+        """Return the set of (SerialNumber, Location) seen by the last scan."""
+        if self._devices is None:
+            self.Poll()
+        return set(self._devices)
+
+    def Poll(self):
+        """Check for changes once and deliver the resulting events.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            list(dict): The events found by this poll.
+        """
+        now = _time.monotonic()
+        count = _ft.ListDevices(_FT.LIST_NUMBER_ONLY)
+        if count == self._count and self._devices is not None and now - self._scanned < self.FullScanInterval:
+            return []
+        devices = _scan()
+        self._scanned = now
+        self._count = count
+        if self._devices is None:
+            self._devices = devices
+            return []
+        timestamp = _time.time()
+        events = [_ret(Event=REMOVAL, SerialNumber=serial, Location=location, Time=timestamp)
+                for serial, location in sorted(self._devices - devices)]
+        events.extend(_ret(Event=ARRIVAL, SerialNumber=serial, Location=location, Time=timestamp)
+                for serial, location in sorted(devices - self._devices))
+        self._devices = devices
+        for event in events:
+            self._deliver(event)
+        return events
+
+    def _deliver(self, event):
+        with self._lock:
+            callbacks = list(self._callbacks)
+            waiters = list(self._async)
+        for callback in callbacks:
+            callback(event)
+        if self.Queue is not None:
+            self.Queue.put(event)
+        for waiter in waiters:
+            waiter._loop.call_soon_threadsafe(waiter._queue.put_nowait, event)
+
+    def _detach(self, waiter):
+        with self._lock:
+            if waiter in self._async:
+                self._async.remove(waiter)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.Poll()
+            except _ft.StatusError:
+                # The device list may be rebuilt by the driver, try again next time
+                pass
+            self._stop.wait(self.Interval)
+
+    def Start(self):
+        """Start the monitor thread. The first poll only records the current devices."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = _threading.Thread(target=self._run, name='pyftd2xx-hotplug', daemon=True)
+            self._thread.start()
+        return None
+
+    def Stop(self):
+        """Stop the monitor thread and end all async iterations."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            waiters, self._async = self._async, []
+        for waiter in waiters:
+            waiter._loop.call_soon_threadsafe(waiter._queue.put_nowait, None)
+        return None
+
+    def __aiter__(self):
+        import asyncio
+        waiter = _AsyncEvents(self, asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._async.append(waiter)
+        return waiter
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Stop()
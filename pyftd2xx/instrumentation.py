@@ -0,0 +1,173 @@
+"""
+Opt-in instrumentation of the D2XX calls. While enabled every bound FT_*
+function records its call count, latency histogram and error count per
+handle, FT_Read and FT_Write additionally record the bytes moved. While
+disabled the original foreign functions are used and nothing is recorded.
+"""
+
+import threading as _threading
+import time as _time
+from bisect import bisect_left as _bisect
+from munch import munchify as _munchify
+from . import _ftd2xx as _lib
+from . import _hooks
+
+
+# Upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+        1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_HOOK = 'instrumentation'
+_lock = _threading.Lock()
+_stats = {}
+_bytes = {}
+
+
+class _Stat(object):
+    __slots__ = ('Calls', 'Errors', 'Seconds', 'Histogram')
+
+    def __init__(self):
+        self.Calls = 0
+        self.Errors = 0
+        self.Seconds = 0.0
+        self.Histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+def _handle(arg):
+    return getattr(arg, 'value', arg)
+
+def _out_value(arg):
+    """Return the value behind a byref() or pointer argument."""
+    obj = getattr(arg, '_obj', None)
+    if obj is None:
+        obj = arg.contents
+    return obj.value
+
+def _record(name, handle, seconds, error):
+    with _lock:
+        stat = _stats.get((name, handle))
+        if stat is None:
+            stat = _stats[(name, handle)] = _Stat()
+        stat.Calls += 1
+        stat.Errors += error
+        stat.Seconds += seconds
+        stat.Histogram[_bisect(LATENCY_BUCKETS, seconds)] += 1
+
+def _count_bytes(handle, index, count):
+    with _lock:
+        counters = _bytes.get(handle)
+        if counters is None:
+            counters = _bytes[handle] = [0, 0]
+        counters[index] += count
+
+def _factory(name, function):
+    has_handle = name not in _lib.NO_HANDLE
+    has_status = not name.startswith('FT_W32_')
+    direction = {'FT_Read': 0, 'FT_Write': 1}.get(name)
+    clock = _time.perf_counter
+
+    def wrapper(*args):
+        handle = _handle(args[0]) if has_handle else None
+        start = clock()
+        try:
+            status = function(*args)
+        except Exception:
+            _record(name, handle, clock() - start, True)
+            raise
+        _record(name, handle, clock() - start, has_status and status != 0)
+        if direction is not None:
+            _count_bytes(handle, direction, _out_value(args[3]))
+        return status
+    wrapper.__name__ = name
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+def EnableInstrumentation():
+    """Start recording statistics for every FT_* call.
+
+    Returns:
+        None
+    """
+    _hooks.Install(_HOOK, _factory)
+    return None
+
+def DisableInstrumentation():
+    """Stop recording and restore the uninstrumented functions. Recorded data is kept.
+
+    Returns:
+        None
+    """
+    _hooks.Remove(_HOOK)
+    return None
+
+def ResetInstrumentation():
+    """Discard all recorded data.
+
+    Returns:
+        None
+    """
+    with _lock:
+        _stats.clear()
+        _bytes.clear()
+    return None
+
+def GetInstrumentation():
+    """Return the recorded data.
+
+    Returns:
+        dict: A dict also accecible as a munch.
+            Enabled (bool): True if instrumentation is currently enabled.
+            Buckets (tuple): Upper bounds of the histogram buckets in seconds.
+            Handles (dict): Per handle (None for functions without a handle) a dict with
+                BytesRead (int), BytesWritten (int) and Functions (dict). Functions maps the
+                FT_* name to Calls (int), Errors (int), Seconds (float) and Histogram (list),
+                which holds one count per bucket plus one for slower calls.
+    """
+    handles = {}
+    with _lock:
+        for (name, handle), stat in _stats.items():
+            entry = handles.setdefault(handle, dict(BytesRead=0, BytesWritten=0, Functions={}))
+            entry['Functions'][name] = dict(Calls=stat.Calls, Errors=stat.Errors,
+                    Seconds=stat.Seconds, Histogram=list(stat.Histogram))
+        for handle, (read, written) in _bytes.items():
+            entry = handles.setdefault(handle, dict(BytesRead=0, BytesWritten=0, Functions={}))
+            entry['BytesRead'] = read
+            entry['BytesWritten'] = written
+    return _munchify(dict(Enabled=_hooks.Installed(_HOOK), Buckets=LATENCY_BUCKETS, Handles=handles))
+
+def GetInstrumentationPrometheus():
+    """Return the recorded data in the Prometheus text exposition format.
+
+    Returns:
+        str: The metrics pyftd2xx_calls_total, pyftd2xx_errors_total, pyftd2xx_call_duration_seconds,
+            pyftd2xx_read_bytes_total and pyftd2xx_written_bytes_total.
+    """
+    data = GetInstrumentation()
+    calls, errors, durations, read, written = [], [], [], [], []
+    for handle, entry in data.Handles.items():
+        label = '' if handle is None else '0x%x' % handle
+        for name, stat in entry.Functions.items():
+            labels = 'function="%s",handle="%s"' % (name, label)
+            calls.append('pyftd2xx_calls_total{%s} %d' % (labels, stat.Calls))
+            errors.append('pyftd2xx_errors_total{%s} %d' % (labels, stat.Errors))
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stat.Histogram):
+                cumulative += count
+                durations.append('pyftd2xx_call_duration_seconds_bucket{%s,le="%r"} %d' % (labels, bound, cumulative))
+            durations.append('pyftd2xx_call_duration_seconds_bucket{%s,le="+Inf"} %d' % (labels, stat.Calls))
+            durations.append('pyftd2xx_call_duration_seconds_sum{%s} %r' % (labels, stat.Seconds))
+            durations.append('pyftd2xx_call_duration_seconds_count{%s} %d' % (labels, stat.Calls))
+        if handle is not None:
+            read.append('pyftd2xx_read_bytes_total{handle="%s"} %d' % (label, entry.BytesRead))
+            written.append('pyftd2xx_written_bytes_total{handle="%s"} %d' % (label, entry.BytesWritten))
+    lines = []
+    for metric, kind, text, samples in (
+            ('pyftd2xx_calls_total', 'counter', 'Number of D2XX function calls.', calls),
+            ('pyftd2xx_errors_total', 'counter', 'Number of D2XX function calls that failed.', errors),
+            ('pyftd2xx_call_duration_seconds', 'histogram', 'Duration of D2XX function calls.', durations),
+            ('pyftd2xx_read_bytes_total', 'counter', 'Bytes read with FT_Read.', read),
+            ('pyftd2xx_written_bytes_total', 'counter', 'Bytes written with FT_Write.', written)):
+        lines.append('# HELP %s %s' % (metric, text))
+        lines.append('# TYPE %s %s' % (metric, kind))
+        lines.extend(samples)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,226 @@
+"""
+Modem status and line state watching. The value of FT_GetModemStatus is
+decoded into FT.ModemStatus (CTS, DSR, RI, DCD) and FT.LineStatus (overrun,
+parity, framing and break errors). A ModemMonitor turns it into timestamped
+edge events.
+
+Where event notification is available the monitor sleeps until the driver
+signals EVENT_MODEM_STATUS and reads the status right away. Otherwise it
+polls with an adaptive interval: fast right after a change, when further
+transitions are likely, and backing off to a slow interval while the lines
+are idle. This keeps the CPU load low without missing bursts of edges.
+"""
+
+import threading as _threading
+import time as _time
+from munch import Munch as _ret
+from . import pyftd2xx as _ft
+from . import _defines as _FT
+from ._event import EventWaiter as _EventWaiter
+
+
+RISING = 'Rising'
+FALLING = 'Falling'
+ERROR = 'Error'
+
+_MODEM_SIGNALS = tuple(_FT.ModemStatus)
+_LINE_ERRORS = tuple(_FT.LineStatus)
+_MODEM_MASK = int(_FT.ModemStatus.CTS | _FT.ModemStatus.DSR | _FT.ModemStatus.RI | _FT.ModemStatus.DCD)
+_LINE_MASK = int(_FT.LineStatus.OVERRUN_ERROR | _FT.LineStatus.PARITY_ERROR | _FT.LineStatus.FRAMING_ERROR | _FT.LineStatus.BREAK_INTERRUPT)
+
+
+def DecodeModemStatus(Value):
+    """Split a FT_GetModemStatus value into its modem signals and line errors.
+
+    Args:
+        Value (int): The value returned by GetModemStatus.
+
+    Returns:
+        tuple(FT.ModemStatus, FT.LineStatus): The modem signals and the line errors.
+    """
+    return (_FT.DECODE(_FT.ModemStatus, Value & _MODEM_MASK),
+            _FT.DECODE(_FT.LineStatus, (Value >> 8) & _LINE_MASK))
+
+def GetModemState(Handle):
+    """Return the decoded modem status of a device.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+
+    Returns:
+        dict: A dict also accecible as a munch.
+            ModemStatus (FT.ModemStatus): The active modem signals.
+            LineStatus (FT.LineStatus): The line errors reported since the last call.
+    """
+    modem, line = DecodeModemStatus(_ft.GetModemStatus(Handle))
+    return _ret(ModemStatus=modem, LineStatus=line)
+
+
+class ModemMonitor(object):
+    """Watch the modem signals and line errors of a device.
+
+    Events are dicts also accecible as a munch with Signal (FT.ModemStatus or FT.LineStatus
+    member), Edge (RISING or FALLING for modem signals, ERROR when a line error is first
+    reported), Time (float, time.perf_counter() when the change was read), ModemStatus
+    (FT.ModemStatus) and LineStatus (FT.LineStatus). They are passed to every registered
+    callback and put into the given queue.
+
+    Notification replaces an event notification set up by other code for the same handle,
+    e.g. an EventDispatcher, so use one of them per device.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Callback (callable, optional): Called with each event from the monitor thread. Defaults to None.
+        Queue (queue.Queue, optional): Queue receiving each event. Defaults to None.
+        MinInterval (float, optional): Polling interval in seconds right after a change. Defaults to 0.0005.
+        MaxInterval (float, optional): Largest polling interval in seconds while idle, also the longest
+            wait for a notification. Defaults to 0.05.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+    """
+    def __init__(self, Handle, Callback=None, Queue=None, MinInterval=0.0005, MaxInterval=0.05):
+        self.Handle = Handle
+        self.Queue = Queue
+        self.MinInterval = MinInterval
+        self.MaxInterval = MaxInterval
+        self._callbacks = [] if Callback is None else [Callback]
+        self._lock = _threading.Lock()
+        self._modem = None
+        self._line = _FT.LineStatus(0)
+        self._stop = _threading.Event()
+        self._thread = None
+        self._waiter = None
+
+    @property
+    def Notified(self):
+        """True while the monitor waits for notifications, False while it polls."""
+        return self._waiter is not None
+
+    def AddCallback(self, Callback):
+        """Register a callback called with each event."""
+        with self._lock:
+            self._callbacks.append(Callback)
+        return None
+
+    def RemoveCallback(self, Callback):
+        """Remove a registered callback. Unknown callbacks are ignored."""
+        with self._lock:
+            if Callback in self._callbacks:
+                self._callbacks.remove(Callback)
+        return None
+
+    def GetState(self):
+        """Return the modem signals and line errors seen by the last poll.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            dict: A dict also accecible as a munch with ModemStatus (FT.ModemStatus) and LineStatus (FT.LineStatus).
+        """
+        if self._modem is None:
+            self.Poll()
+        return _ret(ModemStatus=self._modem, LineStatus=self._line)
+
+    def Poll(self):
+        """Read the modem status once and deliver the resulting events.
+        The first poll only records the current state.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            list(dict): The events found by this poll.
+        """
+        modem, line = DecodeModemStatus(_ft.GetModemStatus(self.Handle))
+        now = _time.perf_counter()
+        previous, previous_line = self._modem, self._line
+        self._modem = modem
+        self._line = line
+        if previous is None:
+            return []
+        events = []
+        changed = modem ^ previous
+        if changed:
+            for signal in _MODEM_SIGNALS:
+                if changed & signal:
+                    events.append(_ret(Signal=signal, Edge=RISING if modem & signal else FALLING,
+                            Time=now, ModemStatus=modem, LineStatus=line))
+        # An error condition lasting over several polls is reported once
+        raised = line & ~previous_line
+        if raised:
+            for signal in _LINE_ERRORS:
+                if raised & signal:
+                    events.append(_ret(Signal=signal, Edge=ERROR, Time=now, ModemStatus=modem, LineStatus=line))
+        if events:
+            with self._lock:
+                callbacks = list(self._callbacks)
+            for event in events:
+                for callback in callbacks:
+                    callback(event)
+                if self.Queue is not None:
+                    self.Queue.put(event)
+        return events
+
+    def _run(self):
+        interval = self.MinInterval
+        while not self._stop.is_set():
+            try:
+                if self._waiter is not None:
+                    self._waiter.Wait(self.MaxInterval)
+                    if self._stop.is_set():
+                        break
+                    self.Poll()
+                    continue
+                if self.Poll():
+                    interval = self.MinInterval
+                else:
+                    interval = min(interval * 2, self.MaxInterval)
+            except _ft.StatusError:
+                # The device may be reset or reopened, try again after the idle interval
+                interval = self.MaxInterval
+            self._stop.wait(interval)
+
+    def Start(self):
+        """Start the monitor thread.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            waiter = _EventWaiter(self.Handle, _FT.EVENT_MODEM_STATUS)
+            self._waiter = waiter if waiter.Notified else None
+            if self._modem is None:
+                self.Poll()
+            self._thread = _threading.Thread(target=self._run, name='pyftd2xx-modem', daemon=True)
+            self._thread.start()
+        return None
+
+    def Stop(self):
+        """Stop the monitor thread and the event notification.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            if self._waiter is not None:
+                self._waiter.Wake()
+            self._thread.join()
+            self._thread = None
+        if self._waiter is not None:
+            self._waiter.Close()
+            self._waiter = None
+        return None
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Stop()
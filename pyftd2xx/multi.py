@@ -0,0 +1,95 @@
+"""
+Scatter-gather I/O over several devices. Each device is served by a worker
+thread of a shared pool. ctypes releases the GIL for the duration of every
+FT_Read and FT_Write, so the transfers run concurrently and the total time
+is close to that of the slowest device instead of the sum over all of them.
+A failing device does not abort the others, its error is returned instead.
+"""
+
+import threading as _threading
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from munch import Munch as _ret
+from . import pyftd2xx as _ft
+
+
+_MAX_WORKERS = 32
+
+_executor = None
+_executor_lock = _threading.Lock()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = _ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix='pyftd2xx-multi')
+        return _executor
+
+def _gather(function, items):
+    futures = list((handle, _pool().submit(function, handle, arg)) for handle, arg in items)
+    return dict((handle, future.result()) for handle, future in futures)
+
+def _write(Handle, Buffer):
+    try:
+        return _ret(BytesWritten=_ft.Write(Handle, Buffer), Error=None)
+    except _ft.StatusError as error:
+        return _ret(BytesWritten=0, Error=error)
+
+def _read(Handle, BytesToRead):
+    try:
+        return _ret(Data=_ft.Read(Handle, BytesToRead), Error=None)
+    except _ft.StatusError as error:
+        return _ret(Data=b'', Error=error)
+
+def _write_read(Handle, Arg):
+    Buffer, BytesToRead = Arg
+    result = _write(Handle, Buffer)
+    if result.Error is None:
+        result.update(_read(Handle, BytesToRead))
+    else:
+        result.Data = b''
+    return result
+
+def WriteMany(Buffers):
+    """Write to several devices concurrently.
+
+    Args:
+        Buffers (dict): Maps each handle (ctypes.c_void_p) to the bytes or string to write to it.
+            Use dict.fromkeys(Handles, Data) to write the same data to every device.
+
+    Returns:
+        dict: Maps each handle to a dict also accecible as a munch.
+            BytesWritten (int): The number of bytes written to the device.
+            Error (StatusError): The error raised for this device, None on success.
+    """
+    return _gather(_write, Buffers.items())
+
+def ReadMany(Requests):
+    """Read from several devices concurrently.
+
+    Args:
+        Requests (dict): Maps each handle (ctypes.c_void_p) to the number of bytes to read from it.
+
+    Returns:
+        dict: Maps each handle to a dict also accecible as a munch.
+            Data (bytes): The bytes read from the device, may be less than requested because of timeouts.
+            Error (StatusError): The error raised for this device, None on success.
+    """
+    return _gather(_read, Requests.items())
+
+def WriteReadMany(Buffers, BytesToRead):
+    """Write to several devices and read their replies, all devices concurrently.
+
+    Args:
+        Buffers (dict): Maps each handle (ctypes.c_void_p) to the bytes or string to write to it.
+        BytesToRead (int, dict): The number of bytes to read from every device, or a dict mapping each handle to it.
+
+    Returns:
+        dict: Maps each handle to a dict also accecible as a munch.
+            BytesWritten (int): The number of bytes written to the device.
+            Data (bytes): The bytes read from the device, may be less than requested because of timeouts.
+            Error (StatusError): The error raised for this device, None on success.
+    """
+    if not isinstance(BytesToRead, dict):
+        BytesToRead = dict.fromkeys(Buffers, BytesToRead)
+    return _gather(_write_read, ((handle, (buffer, BytesToRead[handle])) for handle, buffer in Buffers.items()))
@@ -0,0 +1,285 @@
+"""
+Multi-channel devices. An FT2232H or FT4232H shows up as one D2XX device
+per channel, with the serial number of the chip followed by the channel
+letter and the description followed by ' A', ' B' and so on.
+GroupChannels finds the channels belonging together and a
+MultiChannelDevice handles them as one: it opens all channels in parallel,
+applies one configuration to all of them and starts their streams together.
+
+Every channel has its own reader thread. The chunks they read are merged
+into a single output ordered by the host time at which each chunk arrived.
+A chunk is only handed out once every channel has read past its time, so a
+channel whose reader is a little late cannot slip an earlier chunk in
+behind it.
+"""
+
+import heapq as _heapq
+import itertools as _itertools
+import threading as _threading
+import time as _time
+from munch import Munch as _ret
+from . import pyftd2xx as _ft
+from . import _defines as _FT
+from .multi import _pool
+
+
+_CHANNELS = 'ABCD'
+
+
+def _split(Info):
+    """Return (parent serial, channel letter), or None for a single channel device."""
+    serial, description = Info.SerialNumber, Info.Description
+    letter = serial[-1:]
+    if len(serial) > 1 and letter in _CHANNELS and description.endswith(' ' + letter):
+        return serial[:-1], letter
+    return None
+
+def GroupChannels(Devices=None):
+    """Group the channels of multi-channel devices by the serial number of their chip.
+
+    Args:
+        Devices (list(DeviceInfo), optional): The devices to group. Defaults to GetDeviceInfoList().
+
+    Raises:
+        StatusError: Gives a FT device error message.
+
+    Returns:
+        dict: Maps each parent serial number (str) to its channels, a dict mapping the channel
+            letter (str) to the DeviceInfo of the channel.
+    """
+    if Devices is None:
+        Devices = _ft.GetDeviceInfoList()
+    groups = {}
+    for info in Devices:
+        split = _split(info)
+        if split is not None:
+            groups.setdefault(split[0], {})[split[1]] = info
+    return dict((serial, dict(sorted(channels.items()))) for serial, channels in groups.items())
+
+
+class MultiChannelDevice(object):
+    """All channels of a multi-channel device, opened, configured and streamed together.
+
+    Args:
+        SerialNumber (str): Serial number of the chip, without the channel letter.
+        Channels (str, optional): Letters of the channels to use, e.g. 'AB'. Defaults to all
+            channels found by GroupChannels.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+        ValueError: No channels of the device were found.
+    """
+    def __init__(self, SerialNumber, Channels=None):
+        self.SerialNumber = SerialNumber
+        if Channels is None:
+            Channels = ''.join(GroupChannels().get(SerialNumber, {}))
+        if not Channels:
+            raise ValueError('No channels found for serial number %r' % SerialNumber)
+        self.Channels = tuple(Channels)
+        self.Handles = {}
+        self._cond = _threading.Condition()
+        self._threads = []
+        self._stop = False
+        self._heap = []
+        self._marks = {}
+        self._offsets = {}
+        self._error = None
+        self._sequence = _itertools.count()
+        self.StartTime = None
+
+    def _each(self, function, channels=None):
+        """Call function(channel) for every channel in parallel and return the results by channel."""
+        futures = list((channel, _pool().submit(function, channel)) for channel in channels or self.Channels)
+        results = {}
+        error = None
+        for channel, future in futures:
+            try:
+                results[channel] = future.result()
+            except Exception as exception:
+                error = error or exception
+        if error is not None:
+            raise error
+        return results
+
+    def Open(self):
+        """Open all channels in parallel. If one fails, the others are closed again.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        if self.Handles:
+            return None
+        futures = list((channel, _pool().submit(_ft.OpenEx, self.SerialNumber + channel, _FT.OPEN_BY_SERIAL_NUMBER))
+                for channel in self.Channels)
+        handles = {}
+        error = None
+        for channel, future in futures:
+            try:
+                handles[channel] = future.result()
+            except _ft.StatusError as exception:
+                error = error or exception
+        if error is not None:
+            for handle in handles.values():
+                _ft.Close(handle)
+            raise error
+        self.Handles = handles
+        return None
+
+    def Configure(self, **Settings):
+        """Apply the same settings to every channel, in parallel. Each keyword names a Set
+        function of pyftd2xx without the prefix, its value is the argument or a tuple of
+        arguments following the handle, e.g.
+
+            device.Configure(LatencyTimer=2, USBParameters=65536, BitMode=(0xff, FT.BITMODE_SYNC_FIFO))
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            AttributeError: A setting has no Set function.
+        """
+        calls = list((getattr(_ft, 'Set' + name), value if isinstance(value, tuple) else (value,))
+                for name, value in Settings.items())
+        def configure(channel):
+            for function, args in calls:
+                function(self.Handles[channel], *args)
+        self._each(configure)
+        return None
+
+    def _read(self, channel, barrier, chunk_size, timeout):
+        handle = self.Handles[channel]
+        clock = _time.perf_counter
+        try:
+            barrier.wait()
+            while not self._stop:
+                data = _ft.ReadAtLeast(handle, 1, chunk_size, timeout)
+                now = clock()
+                with self._cond:
+                    # Nothing this thread reads later can arrive before now
+                    self._marks[channel] = now
+                    if data:
+                        offset = self._offsets[channel]
+                        self._offsets[channel] = offset + len(data)
+                        _heapq.heappush(self._heap, (now, next(self._sequence), channel, offset, data))
+                    self._cond.notify_all()
+        except _threading.BrokenBarrierError:
+            # Start failed before the streams began
+            pass
+        except Exception as exception:
+            with self._cond:
+                self._error = self._error or exception
+                self._marks[channel] = float('inf')
+                self._cond.notify_all()
+
+    def Start(self, ChunkSize=65536, Timeout=0.01):
+        """Purge the receive queues and start reading all channels at the same moment.
+
+        Args:
+            ChunkSize (int, optional): Largest number of bytes per read. Defaults to 65536.
+            Timeout (float, optional): Longest wait in seconds of a reader before it reports that its
+                channel is idle. It bounds the delay an idle channel adds to the merged output. Defaults to 0.01.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        if self._threads:
+            return None
+        self.Open()
+        barrier = _threading.Barrier(len(self.Channels) + 1)
+        self._stop = False
+        self._heap = []
+        self._error = None
+        self._offsets = dict.fromkeys(self.Channels, 0)
+        self._threads = list(_threading.Thread(target=self._read, args=(channel, barrier, ChunkSize, Timeout),
+                name='pyftd2xx-channel-%s' % channel, daemon=True) for channel in self.Channels)
+        for thread in self._threads:
+            thread.start()
+        try:
+            self._each(lambda channel: _ft.Purge(self.Handles[channel], _FT.PURGE_RX))
+        except BaseException:
+            barrier.abort()
+            self._stop = True
+            self.Stop()
+            raise
+        self.StartTime = _time.perf_counter()
+        self._marks = dict.fromkeys(self.Channels, self.StartTime)
+        barrier.wait()
+        return None
+
+    def Read(self, Timeout=None):
+        """Return the next chunk of the merged output.
+
+        Args:
+            Timeout (float, optional): Time in seconds to wait for a chunk, None to wait forever. Defaults to None.
+
+        Raises:
+            StatusError: Gives a FT device error message of a reader.
+
+        Returns:
+            dict: A dict also accecible as a munch, None after a timeout or once stopped and drained.
+                Channel (str): The channel letter.
+                Data (bytes): The bytes read.
+                HostTime (float): time.perf_counter() when the read returned.
+                Offset (int): Offset of the first byte of Data in the stream of the channel.
+        """
+        deadline = None if Timeout is None else _time.perf_counter() + Timeout
+        with self._cond:
+            while True:
+                if self._error is not None:
+                    error, self._error = self._error, None
+                    raise error
+                heap = self._heap
+                if heap and (self._stop or heap[0][0] <= min(self._marks.values())):
+                    now, _, channel, offset, data = _heapq.heappop(heap)
+                    return _ret(Channel=channel, Data=data, HostTime=now, Offset=offset)
+                if self._stop:
+                    return None
+                if deadline is None:
+                    self._cond.wait()
+                else:
+                    remaining = deadline - _time.perf_counter()
+                    if remaining <= 0:
+                        return None
+                    self._cond.wait(remaining)
+
+    def Chunks(self):
+        """Yield the chunks of the merged output until stopped, see Read.
+
+        Raises:
+            StatusError: Gives a FT device error message of a reader.
+        """
+        while True:
+            chunk = self.Read()
+            if chunk is None:
+                return
+            yield chunk
+
+    def __iter__(self):
+        return self.Chunks()
+
+    def Stop(self):
+        """Stop the readers. Chunks already read stay available to Read."""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        return None
+
+    def Close(self):
+        """Stop the readers and close all channels.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        self.Stop()
+        handles, self.Handles = self.Handles, {}
+        if handles:
+            self._each(lambda channel: _ft.Close(handles[channel]), list(handles))
+        return None
+
+    def __enter__(self):
+        self.Open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
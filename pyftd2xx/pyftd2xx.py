@@ -6,23 +6,86 @@ except this uses ctypes instead of an extension approach.
 """
 
 import ctypes as _c
+import time as _time
 from . import _ftd2xx as _lib
 from . import _defines as _FT
+from . import _hooks
+from . import _backend
+from ._errors import *
+from ._errors import STATUS_ERRORS as _STATUS_ERRORS
+from ._devinfo import DeviceInfo
+from ._devinfo import DecodeNodes as _decode_nodes
+from .bufferpool import DefaultPool as _pool
 from munch import Munch as _ret
 
 
-class _StatusError(Exception):
-    """Exception class for status messages"""
-    def __init__(self, error):
-        self.message = _FT.STATUS[error]
+_StatusError = StatusError
+
+# Binding of the hot path functions selected by UseBinding, None for ctypes
+_fast = None
+
+# Read and write timeouts set with SetTimeouts by handle value, restored after
+# ReadAtLeast changed the read timeout
+_timeouts = {}
 
-    def __str__(self):
-        return self.message
- 
 def _check_status(status):
-    """Call an FTDI function and check the status. Raise exception on error"""
-    if not _FT.SUCCESS(status):    
-        raise _StatusError(status)
+    """Raise the matching StatusError for a status returned by a FT_* function.
+    The bound FT_* functions already check their status, this is kept for callers
+    passing in a status code themselves."""
+    if status:
+        raise _STATUS_ERRORS.get(status, StatusError)(status)
+
+
+def UseBackend(Backend):
+    """Bind all functions to another D2XX library. The backend can also be
+    chosen at import with the environment variable PYFTD2XX_BACKEND.
+    Open handles of the previous backend are not valid with the new one.
+
+    Args:
+        Backend (str, object): 'native' for the FTDI library, 'sim:<count>' for simulated loopback
+            devices, 'replay:<path>' to replay a recording made with Recorder, or a library object
+            such as a ReplayLibrary.
+
+    Raises:
+        ValueError: Unknown backend name.
+        OSError: 'native' was chosen and the D2XX library could not be loaded.
+
+    Returns:
+        None
+    """
+    global _fast
+    library = _lib._load(Backend) if Backend is None or isinstance(Backend, str) else Backend
+    _lib._bind(library)
+    _fast = None
+    _hooks.Rebind()
+    return None
+
+def UseBinding(Binding='ctypes'):
+    """Choose how Read, Write and GetQueueStatus call the D2XX library. 'cffi' calls it
+    through cffi in ABI mode, which converts the arguments with less overhead than ctypes.
+    It needs the native library and the cffi package, and its calls bypass the hooks of
+    instrumentation, retries and recording. All other functions always use ctypes.
+    UseBackend switches back to ctypes.
+
+    Args:
+        Binding (str, optional): 'ctypes' or 'cffi'. Defaults to 'ctypes'.
+
+    Raises:
+        ImportError: cffi is not installed.
+        ValueError: Unknown binding, or the current backend is not the native library.
+
+    Returns:
+        None
+    """
+    global _fast
+    if Binding == 'ctypes':
+        _fast = None
+    elif Binding == 'cffi':
+        from ._cffi import Binding as _Binding
+        _fast = _Binding(_lib._library)
+    else:
+        raise ValueError('Unknown binding %r' % (Binding,))
+    return None
 
 def SetVIDPID(VID, PID):
     """A command to include a custom VID and PID combination within the internal device list table. This will
@@ -48,7 +111,7 @@ allow the driver to load for the specified VID and PID combination.
         In order to use the driver with other VID and PID combinations the SetVIDPID function must be used
         prior to calling ListDevices, Open, OpenEx or CreateDeviceInfoList.
     """
-    _check_status(_lib.FT_SetVIDPID(_lib.DWORD(VID), _lib.DWORD(PID)))
+    _lib.FT_SetVIDPID(_lib.DWORD(VID), _lib.DWORD(PID))
     return None
 
 def GetVIDPID():
@@ -71,7 +134,7 @@ def GetVIDPID():
     """
     VID = _lib.DWORD()
     PID = _lib.DWORD()
-    _check_status(_lib.FT_GetVIDPID(_c.byref(VID), _c.byref(PID)))
+    _lib.FT_GetVIDPID(_c.byref(VID), _c.byref(PID))
     return _ret(VID = VID.value, PID = PID.value)
 
 def CreateDeviceInfoList():
@@ -98,7 +161,7 @@ system. The list contains information about both unopen and open devices.
         CreateDeviceInfoList is called again.
     """
     NumDevs = _lib.DWORD()
-    _check_status(_lib.FT_CreateDeviceInfoList(_c.byref(NumDevs)))
+    _lib.FT_CreateDeviceInfoList(_c.byref(NumDevs))
     return NumDevs.value
 
 def GetDeviceInfoList():
@@ -108,13 +171,15 @@ def GetDeviceInfoList():
         StatusError: Gives a FT device error message.
     
     Returns:
-        list(dict): A list with dicts also accecible as a munch.
+        list(DeviceInfo): A list of records also accecible like a dict, the fields are decoded on access.
+                    Index (int): Index of the device in the list.
                     Flags (list): Lists the properties given by the Flags.
                     Type (str): The device type.
                     ID (int): The device ID.
                     LocId (int): The device location ID.
                     SerialNumber (str): The device serial number.
                     Description (str): The device description.
+                    Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
     
     Supported Operating System:
         (Linux)
@@ -147,19 +212,11 @@ def GetDeviceInfoList():
         Please note that Linux, Mac OS X and Windows CE do not support location IDs. As such, the Location ID
         parameter in the structure will be empty under these operating systems.
     """
-    NumDevs = ListDevices([_FT.LIST_NUMBER_ONLY])
+    NumDevs = ListDevices(_FT.LIST_NUMBER_ONLY)
     Dest = (_lib.FT_DEVICE_LIST_INFO_NODE * NumDevs)()
-    _check_status(_lib.FT_GetDeviceInfoList(Dest, _lib.DWORD(NumDevs)))
-    def getdict(struct):
-        ret = _ret()
-        ret.Flags = list(_FT.DEVICE_INFO_FLAGS[flag] for flag in _FT.DEVICE_INFO_FLAGS if (struct.Flags & flag) != 0)
-        ret.Type = _FT.DEVICES[struct.Type]
-        ret.ID = struct.ID
-        ret.LocId = struct.LocId
-        ret.SerialNumber = struct.SerialNumber.decode('utf-8')
-        ret.Description = struct.Description.decode('utf-8')
-        return ret
-    return list(getdict(i) for i in Dest)
+    Count = _lib.DWORD(NumDevs)
+    _lib.FT_GetDeviceInfoList(Dest, _c.byref(Count))
+    return _decode_nodes(Dest, Count.value)
 
 def GetDeviceInfoDetail(Index=0):
     """This function returns an entry from the device information list.
@@ -171,14 +228,15 @@ def GetDeviceInfoDetail(Index=0):
         StatusError: Gives a FT device error message.
     
     Returns:
-        dict: A dict also accecible as a munch.
+        DeviceInfo: A record also accecible like a dict, the fields are decoded on access.
+            Index (int): Index of the device in the list.
             Flags (list): Lists the properties given by the Flags.
             Type (str): The device type.
             ID (int): The device ID.
-            LocId (int): The device location ID.
+            LocId (int): The device location ID, also accecible as Location.
             SerialNumber (str): The device serial number.
             Description (str): The device description.
-            ftHandle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+            Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
     
     Supported Operating System:
         (Linux)
@@ -209,14 +267,11 @@ def GetDeviceInfoDetail(Index=0):
     Handle = _lib.FT_HANDLE()
     SerialNumber = _c.create_string_buffer(16)
     Description = _c.create_string_buffer(64)
-    _check_status(_lib.FT_GetDeviceInfoDetail(_lib.DWORD(Index), _c.byref(Flags),
+    _lib.FT_GetDeviceInfoDetail(_lib.DWORD(Index), _c.byref(Flags),
             _c.byref(Type), _c.byref(ID), _c.byref(LocId), SerialNumber,
-            Description, _c.byref(Handle)))
-    Flags = list(_FT.DEVICE_INFO_FLAGS[flag] for flag in _FT.DEVICE_INFO_FLAGS if (Flags.value & flag) != 0)
-    return _ret(Index = Index, Flags = Flags, Type = _FT.DEVICES[Type.value],
-            ID = ID.value, Location = LocId.value,
-            SerialNumber = SerialNumber.value.decode('utf-8'), Description = Description.value.decode('utf-8'),
-            Handle = Handle)
+            Description, _c.byref(Handle))
+    return DeviceInfo(Flags.value, Type.value, ID.value, LocId.value, SerialNumber.raw,
+            Description.raw, Handle.value, Index)
 
 def ListDevices(Flags, Arg1=0):
     """Gets information concerning the devices currently connected. This function can return information such
@@ -224,7 +279,8 @@ as the number of devices connected, the device serial number and device descript
 location IDs of connected devices.
     
     Args:
-        Flags (list): Determines format of returned information. One of FT.LIST_ flags and one of FT.OPEN_BY_ flags.
+        Flags (list, int): Determines format of returned information. One of FT.LIST_ flags and one of FT.OPEN_BY_ flags,
+            as a list or combined, e.g. FT.LIST_ALL | FT.OPEN_BY_SERIAL_NUMBER or FT.LIST_ALL_BY_SERIAL_NUMBER.
         Arg1 (int, optional): Only used if Flags contains FT.LIST_BY_INDEX, then it defines the index of the device to get informations from. Defaults to 0.
     
     Raises:
@@ -280,25 +336,28 @@ location IDs of connected devices.
     if (Flags & _FT.LIST_NUMBER_ONLY) != 0:
         Arg1 = _lib.PVOID()
         Arg2 = _lib.PVOID(None)
-        _check_status(_lib.FT_ListDevices(_c.byref(Arg1), _c.byref(Arg2), _lib.DWORD(Flags)))
+        _lib.FT_ListDevices(_c.byref(Arg1), _c.byref(Arg2), _lib.DWORD(Flags))
         return Arg1.value
     elif (Flags & _FT.LIST_BY_INDEX) != 0:
         Arg2 = _c.create_string_buffer(64)
-        _check_status(_lib.FT_ListDevices(_lib.PVOID(Arg1), _c.byref(Arg2), _lib.DWORD(Flags)))
+        _lib.FT_ListDevices(_lib.PVOID(Arg1), _c.byref(Arg2), _lib.DWORD(Flags))
         return int.from_bytes(Arg2.value, 'little') if (Flags & _FT.OPEN_BY_LOCATION) != 0 else Arg2.value.decode('utf-8')
     elif (Flags & _FT.LIST_ALL) != 0:
+        # One spare entry, the list of string buffers has to be NULL terminated
+        NumDevs = ListDevices(_FT.LIST_NUMBER_ONLY) + 1
         if (Flags & _FT.OPEN_BY_LOCATION) != 0:
-            Arg1 = (_lib.DWORD * ListDevices([_FT.LIST_NUMBER_ONLY]))()
+            Arg1 = (_lib.DWORD * NumDevs)()
             Arg2 = _lib.PVOID()
-            _check_status(_lib.FT_ListDevices(_c.byref(Arg1), _c.byref(Arg2), _lib.DWORD(Flags)))
-            ret = list(i for i in Arg1)
+            _lib.FT_ListDevices(_c.byref(Arg1), _c.byref(Arg2), _lib.DWORD(Flags))
+            ret = list(i for i in Arg1[:min(Arg2.value or 0, NumDevs - 1)])
         else:
-            Arg1 = (_lib.PCHAR * ListDevices([_FT.LIST_NUMBER_ONLY]))()
-            for i, _ in enumerate(Arg1):
-                Arg1[i] = _c.cast(_c.create_string_buffer(64), _lib.PCHAR)
+            Buffers = list(_c.create_string_buffer(64) for _ in range(NumDevs - 1))
+            Arg1 = (_lib.PCHAR * NumDevs)()
+            for i, Buffer in enumerate(Buffers):
+                Arg1[i] = _c.cast(Buffer, _lib.PCHAR)
             Arg2 = _lib.PVOID()
-            _check_status(_lib.FT_ListDevices(_c.byref(Arg1), _c.byref(Arg2), _lib.DWORD(Flags)))
-            ret = list(i.decode('utf-8') for i in Arg1)
+            _lib.FT_ListDevices(_c.byref(Arg1), _c.byref(Arg2), _lib.DWORD(Flags))
+            ret = list(i.value.decode('utf-8') for i in Buffers[:min(Arg2.value or 0, NumDevs - 1)])
         return ret
 
 def Open(Device=0):
@@ -324,7 +383,7 @@ def Open(Device=0):
         ability to open a specific device. To open named devices, use the function FT_OpenEx.
     """
     Handle = _lib.FT_HANDLE()
-    _check_status(_lib.FT_Open(Device, _c.byref(Handle)))
+    _lib.FT_Open(Device, _c.byref(Handle))
     return Handle
 
 def OpenEx(Arg1, Flags):
@@ -364,7 +423,7 @@ def OpenEx(Arg1, Flags):
     if isinstance(Arg1, str):
         Arg1 = Arg1.encode('utf-8')
     Handle = _lib.FT_HANDLE()
-    _check_status(_lib.FT_OpenEx(_lib.PCHAR(Arg1), _lib.DWORD(Flags), _c.byref(Handle)))
+    _lib.FT_OpenEx(_lib.PCHAR(Arg1), _lib.DWORD(Flags), _c.byref(Handle))
     return Handle
 
 def Close(Handle):
@@ -385,7 +444,8 @@ def Close(Handle):
         Windows (2000 and later)
         Windows CE (4.2 and later)
     """
-    _check_status(_lib.FT_Close(Handle))
+    _lib.FT_Close(Handle)
+    _timeouts.pop(getattr(Handle, 'value', Handle), None)
     return None
 
 def Read(Handle, BytesToRead):
@@ -407,17 +467,147 @@ def Read(Handle, BytesToRead):
         Windows (2000 and later)
         Windows CE (4.2 and later)
     """
-    Buffer = _c.create_string_buffer(BytesToRead)
+    if _fast is not None:
+        return _fast.Read(Handle, BytesToRead)
+    Buffer = _pool.Lease(BytesToRead)
+    try:
+        BytesReturned = _lib.DWORD()
+        _lib.FT_Read(Handle, Buffer, _lib.DWORD(BytesToRead), _c.byref(BytesReturned))
+        return memoryview(Buffer)[:BytesReturned.value].tobytes()
+    finally:
+        _pool.Release(Buffer)
+
+def _char_buffer(Buffer, Size):
+    """Return a c_char array sharing the memory of a writable buffer."""
+    if isinstance(Buffer, _c.Array) and _c.sizeof(Buffer) >= Size:
+        return Buffer
+    return (_c.c_char * Size).from_buffer(Buffer)
+
+def _read_into(Read, MaxBytes, Buffer, *Args):
+    """Call Read(Array, MaxBytes, *Args) on Buffer, or on a leased buffer whose bytes are returned."""
+    if Buffer is not None:
+        if MaxBytes is None:
+            MaxBytes = memoryview(Buffer).nbytes
+        return Read(_char_buffer(Buffer, MaxBytes), MaxBytes, *Args)
+    if MaxBytes is None:
+        MaxBytes = 65536
+    Array = _pool.Lease(MaxBytes)
+    try:
+        return memoryview(Array)[:Read(Array, MaxBytes, *Args)].tobytes()
+    finally:
+        _pool.Release(Array)
+
+def _read_queued(Handle, Array, Offset, MaxBytes, Queued, BytesReturned):
+    """Read the queued bytes, up to MaxBytes, into Array at Offset."""
+    _lib.FT_GetQueueStatusEx(Handle, _c.byref(Queued))
+    Count = min(Queued.value, MaxBytes)
+    if not Count:
+        return 0
+    _lib.FT_Read(Handle, _c.byref(Array, Offset), _lib.DWORD(Count), _c.byref(BytesReturned))
+    return BytesReturned.value
+
+def ReadAvailable(Handle, MaxBytes=None, Buffer=None):
+    """Read the bytes already queued, up to MaxBytes, without waiting.
+    One queue status and one read call, replacing GetQueueStatus followed by Read.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        MaxBytes (int, optional): The largest number of bytes to read. Defaults to the size of Buffer, or 65536.
+        Buffer (bytearray, memoryview, ctypes.Array, optional): Reusable writable buffer of at least
+            MaxBytes bytes to read into, instead of returning new bytes. Defaults to None.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+
+    Returns:
+        bytes, int: The bytes read, or the number of bytes read into Buffer.
+    """
+    return _read_into(lambda Array, MaxBytes: _read_queued(Handle, Array, 0, MaxBytes, _c.c_uint32(), _lib.DWORD()),
+            MaxBytes, Buffer)
+
+def ReadAtLeast(Handle, MinBytes, MaxBytes=None, Timeout=None, Buffer=None, PollInterval=0.0005):
+    """Read at least MinBytes and at most MaxBytes, taking whatever is queued in each call.
+
+    The missing bytes are waited for in FT_Read itself. Without a timeout the wait is subject
+    to the read timeout of the device. With a timeout the bytes read so far are returned
+    instead of raising. If the timeouts of the handle were set with SetTimeouts, the read
+    timeout is set to the time left for the blocking read and restored afterwards. Otherwise,
+    and on Python backends which do not block in FT_Read, the queue is polled instead.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        MinBytes (int): The number of bytes to wait for.
+        MaxBytes (int, optional): The largest number of bytes to read. Defaults to the size of Buffer, or 65536.
+        Timeout (float, optional): Time in seconds until the deadline, None to wait in FT_Read. Defaults to None.
+        Buffer (bytearray, memoryview, ctypes.Array, optional): Reusable writable buffer of at least
+            MaxBytes bytes to read into, instead of returning new bytes. Defaults to None.
+        PollInterval (float, optional): Time in seconds between queue readings when the queue is
+            polled. Defaults to 0.0005.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+
+    Returns:
+        bytes, int: The bytes read, or the number of bytes read into Buffer. Less than MinBytes
+            after a timeout.
+
+    Remarks:
+        The timeouts to restore are those last given to SetTimeouts for the handle. Timeouts
+        set by other means are unknown to this module, so they are never changed.
+    """
+    return _read_into(_read_at_least, MaxBytes, Buffer, Handle, MinBytes, Timeout, PollInterval)
+
+def _read_at_least(Array, MaxBytes, Handle, MinBytes, Timeout, PollInterval):
+    MinBytes = min(MinBytes, MaxBytes)
+    Queued = _c.c_uint32()
     BytesReturned = _lib.DWORD()
-    _check_status(_lib.FT_Read(Handle, _c.byref(Buffer), _lib.DWORD(BytesToRead), _c.byref(BytesReturned)))
-    return bytes(Buffer.value)
+    Deadline = None if Timeout is None else _time.monotonic() + Timeout
+    Count = _read_queued(Handle, Array, 0, MaxBytes, Queued, BytesReturned)
+    if Count >= MinBytes:
+        return Count
+    Timeouts = _timeouts.get(getattr(Handle, 'value', Handle))
+    if Deadline is None:
+        Count += _read_blocking(Handle, Array, Count, MinBytes - Count, BytesReturned)
+    elif Timeouts is None or isinstance(_lib._library, _backend.Library):
+        Count = _poll_at_least(Array, MaxBytes, Handle, MinBytes, Deadline, PollInterval, Count, Queued, BytesReturned)
+    elif Timeout > 0:
+        ReadTimeout, WriteTimeout = Timeouts
+        # Whole milliseconds, at least one, as 0 would wait forever
+        _lib.FT_SetTimeouts(Handle, _lib.DWORD(max(1, int(_time_left(Deadline) * 1000 + 0.999))), _lib.DWORD(WriteTimeout))
+        try:
+            Count += _read_blocking(Handle, Array, Count, MinBytes - Count, BytesReturned)
+        finally:
+            _lib.FT_SetTimeouts(Handle, _lib.DWORD(ReadTimeout), _lib.DWORD(WriteTimeout))
+    if Count >= MinBytes:
+        # Take what arrived meanwhile along
+        Count += _read_queued(Handle, Array, Count, MaxBytes - Count, Queued, BytesReturned)
+    return Count
+
+def _time_left(Deadline):
+    return max(0.0, Deadline - _time.monotonic())
+
+def _read_blocking(Handle, Array, Offset, Count, BytesReturned):
+    """Read Count bytes into Array at Offset in one FT_Read, fewer after the read timeout."""
+    _lib.FT_Read(Handle, _c.byref(Array, Offset), _lib.DWORD(Count), _c.byref(BytesReturned))
+    return BytesReturned.value
+
+def _poll_at_least(Array, MaxBytes, Handle, MinBytes, Deadline, PollInterval, Count, Queued, BytesReturned):
+    """Poll the queue until MinBytes were read or the deadline passed."""
+    while Count < MinBytes:
+        Remaining = _time_left(Deadline)
+        if Remaining <= 0:
+            break
+        _time.sleep(min(PollInterval, Remaining))
+        Count += _read_queued(Handle, Array, Count, MaxBytes - Count, Queued, BytesReturned)
+    return Count
 
 def Write(Handle, Buffer):
     """Write data to the device
     
     Args:
         Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
-        Buffer (bytes, str): The bytes or string to write to the device.
+        Buffer (bytes, str, bytearray, memoryview, ctypes.Array, list): The bytes or string to write to the device.
+            bytes and writable contiguous buffers are passed to the library without a copy.
     
     Raises:
         StatusError: Gives a FT device error message.
@@ -431,12 +621,26 @@ def Write(Handle, Buffer):
         Windows (2000 and later)
         Windows CE (4.2 and later)
     """
+    if _fast is not None:
+        return _fast.Write(Handle, Buffer)
     if isinstance(Buffer, str):
         Buffer = Buffer.encode('utf-8')
-    Buffer = bytes(Buffer)
-    BytesToWrite = len(Buffer)
+    try:
+        View = None if isinstance(Buffer, bytes) else memoryview(Buffer)
+    except TypeError:
+        # Other sequences of byte values, e.g. a list of ints
+        Buffer, View = bytes(Buffer), None
+    if View is None:
+        BytesToWrite = len(Buffer)
+        Data = _lib.PCHAR(Buffer)
+    else:
+        BytesToWrite = View.nbytes
+        if View.readonly or not View.c_contiguous:
+            Data = _lib.PCHAR(View.tobytes())
+        else:
+            Data = _char_buffer(Buffer, BytesToWrite)
     BytesWritten = _lib.DWORD()
-    _check_status(_lib.FT_Write(Handle, _lib.PCHAR(Buffer), _lib.DWORD(BytesToWrite), _c.byref(BytesWritten)))
+    _lib.FT_Write(Handle, Data, _lib.DWORD(BytesToWrite), _c.byref(BytesWritten))
     return BytesWritten.value
 
 def SetBaudRate(Handle, BaudRate):
@@ -458,7 +662,7 @@ def SetBaudRate(Handle, BaudRate):
         Windows (2000 and later)
         Windows CE (4.2 and later)
     """
-    _check_status(_lib.FT_SetBaudRate(Handle, _lib.DWORD(BaudRate)))
+    _lib.FT_SetBaudRate(Handle, _lib.DWORD(BaudRate))
     return None
 
 def SetDivisor(Handle, Divisor):
@@ -491,13 +695,13 @@ def SetDivisor(Handle, Divisor):
         a non-standard baud rate.
         See https://www.ftdichip.com/Support/Knowledgebase/index.html?whatbaudratesareachieveabl.htm
     """
-    _check_status(_lib.FT_SetDivisor(Handle, _lib.USHORT(Divisor)))
+    _lib.FT_SetDivisor(Handle, _lib.USHORT(Divisor))
     return None
 
 def SetDataCharacteristics(Handle, WordLength, StopBits, Parity):
     """Set the data characteristics for UART"""
-    _check_status(_lib.FT_SetDataCharacteristics(Handle,
-            _lib.UCHAR(WordLength), _lib.UCHAR(StopBits), _lib.UCHAR(Parity)))
+    _lib.FT_SetDataCharacteristics(Handle,
+            _lib.UCHAR(WordLength), _lib.UCHAR(StopBits), _lib.UCHAR(Parity))
     return None
 
 def SetTimeouts(Handle, ReadTimeout, WriteTimeout):
@@ -519,40 +723,43 @@ def SetTimeouts(Handle, ReadTimeout, WriteTimeout):
         Windows (2000 and later)
         Windows CE (4.2 and later)
     """
-    _check_status(_lib.FT_SetTimeouts(Handle, _lib.DWORD(ReadTimeout),
-            _lib.DWORD(WriteTimeout)))
+    _lib.FT_SetTimeouts(Handle, _lib.DWORD(ReadTimeout),
+            _lib.DWORD(WriteTimeout))
+    _timeouts[getattr(Handle, 'value', Handle)] = (ReadTimeout, WriteTimeout)
     return None
 
 def SetFlowControl(Handle, FlowControl, Xon, Xoff):
-    _check_status(_lib.FT_SetFlowControl(Handle,
-            _lib.USHORT(FlowControl), _lib.UCHAR(Xon), _lib.UCHAR(Xoff)))
+    _lib.FT_SetFlowControl(Handle,
+            _lib.USHORT(FlowControl), _lib.UCHAR(Xon), _lib.UCHAR(Xoff))
     return None
 
 def SetDtr(Handle):
-    _check_status(_lib.FT_SetDtr(Handle))
+    _lib.FT_SetDtr(Handle)
     return None
 
 def ClrDtr(Handle):
-    _check_status(_lib.FT_ClrDtr(Handle))
+    _lib.FT_ClrDtr(Handle)
     return None
 
 def SetRts(Handle):
-    _check_status(_lib.FT_SetRts(Handle))
+    _lib.FT_SetRts(Handle)
     return None
 
 def ClrRts(Handle):
-    _check_status(_lib.FT_ClrRts(Handle))
+    _lib.FT_ClrRts(Handle)
     return None
 
 def GetModemStatus(Handle):
     ModemStatus = _lib.DWORD()
-    _check_status(_lib.FT_GetModemStatus(Handle, _c.byref(ModemStatus)))
+    _lib.FT_GetModemStatus(Handle, _c.byref(ModemStatus))
     return ModemStatus.value
 
 def GetQueueStatus(Handle):
     """Get number of bytes in receive queue."""
+    if _fast is not None:
+        return _fast.GetQueueStatus(Handle)
     AmountInRxQueue = _lib.DWORD()
-    _check_status(_lib.FT_GetQueueStatus(Handle, _c.byref(AmountInRxQueue)))
+    _lib.FT_GetQueueStatus(Handle, _c.byref(AmountInRxQueue))
     return AmountInRxQueue.value
 
 def GetDeviceInfo(Handle):
@@ -588,25 +795,25 @@ def GetDeviceInfo(Handle):
     Description = _c.create_string_buffer(64)
     SerialNumber = _c.create_string_buffer(16)
     Dummy = _lib.PVOID()
-    _check_status(_lib.FT_GetDeviceInfo(Handle, _c.byref(Type), _c.byref(ID), SerialNumber, Description, Dummy))
-    return _ret(Type = _FT.DEVICES[Type.value], ID = ID.value,
+    _lib.FT_GetDeviceInfo(Handle, _c.byref(Type), _c.byref(ID), SerialNumber, Description, Dummy)
+    return _ret(Type = _FT.DEVICES.get(Type.value, 'FT_DEVICE_UNKNOWN'), ID = ID.value,
              SerialNumber = SerialNumber.value.decode('utf-8'), Description = Description.value.decode('utf-8'))
     
 def GetDriverVersion(Handle):
     DriverVersion = _lib.DWORD()
-    _check_status(_lib.FT_GetDriverVersion(Handle, _c.byref(DriverVersion)))
+    _lib.FT_GetDriverVersion(Handle, _c.byref(DriverVersion))
     return DriverVersion.value
 
 def GetLibraryVersion():
     """Return a long representing library version"""
     DLLVersion = _lib.DWORD()
-    _check_status(_lib.FT_GetLibraryVersion(_c.byref(DLLVersion)))
+    _lib.FT_GetLibraryVersion(_c.byref(DLLVersion))
     return DLLVersion.value
 
 def GetComPortNumber(Handle):
     """Return a long representing the COM port number"""
     ComPortNumber = _lib.LONG()
-    _check_status(_lib.FT_GetComPortNumber(Handle, _c.byref(ComPortNumber)))
+    _lib.FT_GetComPortNumber(Handle, _c.byref(ComPortNumber))
     return ComPortNumber.value
 
 def GetStatus(Handle):
@@ -615,67 +822,68 @@ def GetStatus(Handle):
     AmountInRxQueue = _lib.DWORD()
     AmountInTxQueue = _lib.DWORD()
     EventStatus = _lib.DWORD()
-    _check_status(_lib.FT_GetStatus(Handle, _c.byref(AmountInRxQueue),
-            _c.byref(AmountInTxQueue), _c.byref(EventStatus)))
-    return _ret(AmountInRxQueue = AmountInRxQueue.value, AmountInTxQueue = AmountInTxQueue.value, EventStatus = EventStatus.value)
+    _lib.FT_GetStatus(Handle, _c.byref(AmountInRxQueue),
+            _c.byref(AmountInTxQueue), _c.byref(EventStatus))
+    return _ret(AmountInRxQueue = AmountInRxQueue.value, AmountInTxQueue = AmountInTxQueue.value,
+            EventStatus = _FT.DECODE(_FT.Event, EventStatus.value))
 
 def SetEventNotification(Handle, EventMask, Arg):
-    _check_status(_lib.FT_SetEventNotification(Handle,
-            _lib.DWORD(EventMask), _lib.PVOID(Arg)))
+    _lib.FT_SetEventNotification(Handle,
+            _lib.DWORD(EventMask), _lib.PVOID(Arg))
     return None
 
 def SetChars(Handle, EventCh, EventChEn, ErrorCh, ErrorChEn):
-    _check_status(_lib.FT_SetChars(Handle, _lib.UCHAR(EventCh),
-            _lib.UCHAR(EventChEn), _lib.UCHAR(ErrorCh), _lib.UCHAR(ErrorChEn)))
+    _lib.FT_SetChars(Handle, _lib.UCHAR(EventCh),
+            _lib.UCHAR(EventChEn), _lib.UCHAR(ErrorCh), _lib.UCHAR(ErrorChEn))
     return None
 
 def SetBreakOn(Handle):
-    _check_status(_lib.FT_SetBreakOn(Handle))
+    _lib.FT_SetBreakOn(Handle)
     return None
 
 def SetBreakOff(Handle):
-    _check_status(_lib.FT_SetBreakOff(Handle))
+    _lib.FT_SetBreakOff(Handle)
     return None
 
 def Purge(Handle, Mask):
-    _check_status(_lib.FT_Purge(Handle, _lib.DWORD(Mask)))
+    _lib.FT_Purge(Handle, _lib.DWORD(Mask))
     return None
     
 def ResetDevice(Handle):
     """Reset the device"""
-    _check_status(_lib.FT_ResetDevice(Handle))
+    _lib.FT_ResetDevice(Handle)
     return None
 
 def ResetPort(Handle):
-    _check_status(_lib.FT_ResetPort(Handle))
+    _lib.FT_ResetPort(Handle)
     return None
 
 def CyclePort(Handle):
-    _check_status(_lib.FT_CyclePort(Handle))
+    _lib.FT_CyclePort(Handle)
     return None
 
 def Rescan():
-    _check_status(_lib.FT_Rescan())
+    _lib.FT_Rescan()
     return None
 
 def Reload(VID, PID):
-    _check_status(_lib.FT_Reload(_lib.WORD(VID), _lib.WORD(PID)))
+    _lib.FT_Reload(_lib.WORD(VID), _lib.WORD(PID))
     return None
 
 def SetResetPipeRetryCount(Handle, Count):
-    _check_status(_lib.FT_SetResetPipeRetryCount(Handle, _lib.DWORD(Count)))
+    _lib.FT_SetResetPipeRetryCount(Handle, _lib.DWORD(Count))
     return None
 
 def StopInTask(Handle):
-    _check_status(_lib.FT_StopInTask(Handle))
+    _lib.FT_StopInTask(Handle)
     return None
 
 def RestartInTask(Handle):
-    _check_status(_lib.FT_RestartInTask(Handle))
+    _lib.FT_RestartInTask(Handle)
     return None
 
 def SetDeadmanTimeout(Handle, DeadmanTimeout):
-    _check_status(_lib.FT_SetDeadmanTimeout(Handle, _lib.DWORD(DeadmanTimeout)))
+    _lib.FT_SetDeadmanTimeout(Handle, _lib.DWORD(DeadmanTimeout))
     return None
 
 def IoCtl(Handle):
@@ -721,21 +929,67 @@ def EE_ProgramEx():
 def EE_UASize(Handle):
     """Get the EEPROM user area size"""
     Size = _lib.DWORD()
-    _check_status(_lib.FT_EE_UASize(Handle, _c.byref(Size)))
+    _lib.FT_EE_UASize(Handle, _c.byref(Size))
     return Size.value
 
-def EE_UARead(Handle, DataLen):
-    """Read b_to_read bytes from the EEPROM user area"""
-    Data = _c.create_string_buffer(DataLen)
+def _ubyte_buffer(Buffer, Size):
+    """Return a c_ubyte array sharing the memory of a writable buffer."""
+    if isinstance(Buffer, _c.Array) and Buffer._type_ is _c.c_ubyte:
+        return Buffer
+    return (_c.c_ubyte * Size).from_buffer(Buffer)
+
+def EE_UARead(Handle, DataLen, Buffer=None):
+    """Read DataLen bytes from the start of the EEPROM user area.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        DataLen (int): The number of bytes to read.
+        Buffer (bytearray, memoryview, ctypes.Array, optional): Writable buffer of at least DataLen
+            bytes to read into, instead of returning new bytes. Defaults to None.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+
+    Returns:
+        bytes, int: The bytes read, or the number of bytes read into Buffer.
+    """
     BytesRead = _lib.DWORD()
-    _check_status(_lib.FT_EE_UARead(Handle, Data,
-            _lib.DWORD(DataLen), _c.byref(BytesRead)))
-    return Data.raw[0:BytesRead.value]
-
-def EE_UAWrite(Handle, Data, DataLen):
-    """Write data to the EEPROM user area. data must be a string with
-    appropriate byte values"""
-    _check_status(_lib.FT_EE_UAWrite(Handle, _c.create_string_buffer(Data), _lib.DWORD(DataLen)))
+    if Buffer is not None:
+        _lib.FT_EE_UARead(Handle, _ubyte_buffer(Buffer, DataLen),
+                _lib.DWORD(DataLen), _c.byref(BytesRead))
+        return BytesRead.value
+    Data = _pool.Lease(DataLen)
+    try:
+        _lib.FT_EE_UARead(Handle, _c.cast(Data, _lib.PUCHAR),
+                _lib.DWORD(DataLen), _c.byref(BytesRead))
+        return memoryview(Data)[:BytesRead.value].tobytes()
+    finally:
+        _pool.Release(Data)
+
+def EE_UAWrite(Handle, Data, DataLen=None):
+    """Write data to the start of the EEPROM user area. The data is passed to
+    the library without a copy.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Data (bytes, bytearray, memoryview, ctypes.Array): The bytes to write.
+        DataLen (int, optional): The number of bytes of Data to write. Defaults to all of Data.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+
+    Returns:
+        None
+    """
+    if DataLen is None:
+        DataLen = len(Data) if not isinstance(Data, memoryview) else Data.nbytes
+    if isinstance(Data, bytes):
+        Data = _c.cast(Data, _lib.PUCHAR)
+    elif isinstance(Data, memoryview) and Data.readonly:
+        Data = (_c.c_ubyte * DataLen).from_buffer_copy(Data)
+    else:
+        Data = _ubyte_buffer(Data, DataLen)
+    _lib.FT_EE_UAWrite(Handle, Data, _lib.DWORD(DataLen))
     return None
 
 def EEPROM_Read():
@@ -747,12 +1001,12 @@ def EEPROM_Program():
     raise NotImplementedError()
 
 def SetLatencyTimer(Handle, Timer):
-    _check_status(_lib.FT_SetLatencyTimer(Handle, _lib.UCHAR(Timer)))
+    _lib.FT_SetLatencyTimer(Handle, _lib.UCHAR(Timer))
     return None
 
 def GetLatencyTimer(Handle):
     Timer = _lib.UCHAR()
-    _check_status(_lib.FT_GetLatencyTimer(Handle, _c.byref(Timer)))
+    _lib.FT_GetLatencyTimer(Handle, _c.byref(Timer))
     return Timer.value
 
 def SetBitMode(Handle, Mask, Mode):
@@ -787,17 +1041,17 @@ def SetBitMode(Handle, Mask, Mode):
         EEPROM.
         Note that to use Single Channel Synchronous 245 FIF
     """
-    _check_status(_lib.FT_SetBitMode(Handle, _lib.UCHAR(Mask),
-            _lib.UCHAR(Mode)))
+    _lib.FT_SetBitMode(Handle, _lib.UCHAR(Mask),
+            _lib.UCHAR(Mode))
     return None
 
 def GetBitMode(Handle):
     Mode = _lib.UCHAR()
-    _check_status(_lib.FT_GetBitMode(Handle, _c.byref(Mode)))
+    _lib.FT_GetBitMode(Handle, _c.byref(Mode))
     return Mode.value
 
 def SetUSBParameters(Handle, InTransferSize, OutTransferSize=0):
-    _check_status(_lib.FT_SetUSBParameters(Handle, _lib.DWORD(InTransferSize),
-            _lib.DWORD(OutTransferSize)))
+    _lib.FT_SetUSBParameters(Handle, _lib.DWORD(InTransferSize),
+            _lib.DWORD(OutTransferSize))
     return None
 
@@ -0,0 +1,111 @@
+"""
+Recording of device traffic. A Recorder logs every FT_* call with its
+arguments, status, timing and payload bytes to a compact binary file. The
+recording can be served back with ReplayLibrary, with the original or an
+accelerated timing, which allows benchmarking and debugging the processing
+of real device traffic without the hardware:
+
+    with Recorder('capture.ftrec'):
+        ...
+    UseBackend(ReplayLibrary('capture.ftrec', Speed=None))
+
+The backend can also be chosen with PYFTD2XX_BACKEND=replay:capture.ftrec.
+"""
+
+import threading as _threading
+import time as _time
+from . import _ftd2xx as _lib
+from . import _hooks
+from ._errors import StatusError as _StatusError
+from ._replay import ReplayLibrary
+from ._replay import MAGIC as _MAGIC, TAG_NAME as _TAG_NAME, TAG_CALL as _TAG_CALL
+from ._replay import NAME as _NAME, CALL as _CALL, EncodeArgs as _encode_args
+
+
+class Recorder(object):
+    """Record the FT_* calls to a file.
+
+    Args:
+        Path (str): The file to write, an existing file is overwritten.
+        Handle (ctypes.c_void_p, optional): Only record calls on this handle. Defaults to None, recording all calls.
+
+    Attributes:
+        Calls (int): Number of calls recorded.
+    """
+    def __init__(self, Path, Handle=None):
+        self.Path = Path
+        self.Handle = None if Handle is None else getattr(Handle, 'value', Handle)
+        self.Calls = 0
+        self._key = 'record-%d' % id(self)
+        self._lock = _threading.Lock()
+        self._file = None
+        self._names = {}
+        self._origin = None
+
+    def Start(self):
+        """Open the file and start recording.
+
+        Returns:
+            None
+        """
+        if self._file is None:
+            self._file = open(self.Path, 'wb')
+            self._file.write(_MAGIC)
+            self._names = {}
+            self._origin = _time.perf_counter()
+            _hooks.Install(self._key, self._factory)
+        return None
+
+    def Stop(self):
+        """Stop recording and close the file.
+
+        Returns:
+            None
+        """
+        if self._file is not None:
+            _hooks.Remove(self._key)
+            with self._lock:
+                self._file.close()
+                self._file = None
+        return None
+
+    def _write(self, name, status, start, duration, args):
+        data = _encode_args(name, args)
+        with self._lock:
+            if self._file is None:
+                return
+            id = self._names.get(name)
+            if id is None:
+                id = self._names[name] = len(self._names)
+                encoded = name.encode('ascii')
+                self._file.write(_NAME.pack(_TAG_NAME, id, len(encoded)) + encoded)
+            self._file.write(_CALL.pack(_TAG_CALL, id, status & 0xFFFFFFFFFFFFFFFF,
+                    start - self._origin, duration, len(args)) + data)
+            self.Calls += 1
+
+    def _factory(self, name, function):
+        has_handle = name not in _lib.NO_HANDLE
+        clock = _time.perf_counter
+        record = self._write
+
+        def wrapper(*args):
+            if self.Handle is not None and not (has_handle and getattr(args[0], 'value', args[0]) == self.Handle):
+                return function(*args)
+            start = clock()
+            try:
+                status = function(*args)
+            except _StatusError as error:
+                record(name, error.Status, start, clock() - start, args)
+                raise
+            record(name, status or 0, start, clock() - start, args)
+            return status
+        wrapper.__name__ = name
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Stop()
@@ -0,0 +1,112 @@
+"""
+Request/response exchange for protocols with a terminating byte. The
+terminator is set as event character, so the device sends its buffer as soon
+as the terminator arrives instead of waiting for the latency timer, and the
+driver signals the reader through event notification. A response then costs
+one wake-up and one read after the USB frame carrying it.
+
+Event notification is only waited on directly on Windows. Elsewhere the
+reader polls the event status every PollInterval, which adds up to one
+interval to each response.
+"""
+
+import time as _time
+from . import pyftd2xx as _ft
+from . import _defines as _FT
+from ._event import EventWaiter as _EventWaiter, DEFAULT_POLL_INTERVAL as _DEFAULT_POLL_INTERVAL
+
+
+class RequestChannel(object):
+    """Send requests and read responses ending with a terminator byte.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Terminator (bytes, int, optional): The single byte ending each response. Defaults to b'\\n'.
+        Timeout (float, optional): Default time in seconds to wait for a response. Defaults to 1.
+        KeepTerminator (bool, optional): Include the terminator in the returned response. Defaults to False.
+        PollInterval (float, optional): Time in seconds between event status readings on platforms
+            other than Windows. Defaults to 0.001.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+    """
+    def __init__(self, Handle, Terminator=b'\n', Timeout=1.0, KeepTerminator=False, PollInterval=_DEFAULT_POLL_INTERVAL):
+        if isinstance(Terminator, int):
+            Terminator = bytes([Terminator])
+        if len(Terminator) != 1:
+            raise ValueError('The terminator has to be a single byte')
+        self.Handle = Handle
+        self.Terminator = Terminator
+        self.Timeout = Timeout
+        self.KeepTerminator = KeepTerminator
+        self._pending = bytearray()
+        _ft.SetChars(Handle, Terminator[0], 1, 0, 0)
+        self._waiter = _EventWaiter(Handle, _FT.EVENT_RXCHAR, PollInterval)
+
+    def Request(self, Command, Timeout=None):
+        """Write a command and wait for its response.
+
+        Args:
+            Command (bytes, str): The command to write, including its own terminator if the device expects one.
+            Timeout (float, optional): Time in seconds to wait for the response. Defaults to the channel timeout.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: No complete response arrived in time.
+
+        Returns:
+            bytes: The response.
+        """
+        _ft.Write(self.Handle, Command)
+        return self.ReadResponse(Timeout)
+
+    def ReadResponse(self, Timeout=None):
+        """Wait for the next response.
+
+        Args:
+            Timeout (float, optional): Time in seconds to wait for the response. Defaults to the channel timeout.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: No complete response arrived in time. Received data is kept for the next call.
+
+        Returns:
+            bytes: The response.
+        """
+        deadline = _time.monotonic() + (self.Timeout if Timeout is None else Timeout)
+        pending = self._pending
+        searched = 0
+        while True:
+            pos = pending.find(self.Terminator, searched)
+            if pos >= 0:
+                response = bytes(pending[:pos + 1 if self.KeepTerminator else pos])
+                del pending[:pos + 1]
+                return response
+            searched = len(pending)
+            queued = _ft.GetQueueStatus(self.Handle)
+            if queued:
+                pending += _ft.Read(self.Handle, queued)
+                continue
+            remaining = deadline - _time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError('No response within the timeout')
+            self._waiter.Wait(remaining)
+
+    def Close(self):
+        """Disable the event character and the event notification. The device stays open.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            None
+        """
+        self._waiter.Close()
+        _ft.SetChars(self.Handle, 0, 0, 0, 0)
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
@@ -0,0 +1,278 @@
+"""
+Retry and reconnect handling for transient USB errors. A ResilientDevice
+owns a handle opened with OpenEx and calls the wrappers of pyftd2xx with it.
+Calls failing with one of the configured status codes are retried with
+backoff, escalating through Purge, ResetDevice, ResetPort, CyclePort and
+Rescan. Whenever the device had to be reset or reopened the last
+configuration is applied again. Write is not retried unless the policy allows
+it, as data of a failed write may still have been sent.
+"""
+
+import threading as _threading
+import time as _time
+from collections import OrderedDict as _OrderedDict
+from munch import Munch as _ret
+from . import pyftd2xx as _ft
+from . import _defines as _FT
+
+
+# Configuration wrappers which are replayed after a reset or reopen. Wrappers
+# sharing a key overwrite each other, e.g. SetDtr and ClrDtr.
+_CONFIGURATION = {
+    'SetBaudRate': 'BaudRate',
+    'SetDivisor': 'BaudRate',
+    'SetDataCharacteristics': 'DataCharacteristics',
+    'SetFlowControl': 'FlowControl',
+    'SetTimeouts': 'Timeouts',
+    'SetChars': 'Chars',
+    'SetLatencyTimer': 'LatencyTimer',
+    'SetBitMode': 'BitMode',
+    'SetUSBParameters': 'USBParameters',
+    'SetDeadmanTimeout': 'DeadmanTimeout',
+    'SetResetPipeRetryCount': 'ResetPipeRetryCount',
+    'SetEventNotification': 'EventNotification',
+    'SetDtr': 'Dtr',
+    'ClrDtr': 'Dtr',
+    'SetRts': 'Rts',
+    'ClrRts': 'Rts',
+    'SetBreakOn': 'Break',
+    'SetBreakOff': 'Break',
+}
+
+# Escalation steps in the order of increasing disruption
+_STEPS = ('Purge', 'ResetDevice', 'ResetPort', 'CyclePort', 'Rescan')
+
+# Escalation steps after which the device is reopened
+_REOPEN = ('CyclePort', 'Rescan')
+
+# Wrappers which may have sent data before they failed, only retried with RetryPolicy.RetryWrites
+_WRITES = ('Write',)
+
+
+class RetryPolicy(object):
+    """Describes when and how often a failing call is retried.
+
+    Args:
+        MaxAttempts (int, optional): Maximum number of attempts including the first call. Defaults to 6.
+        Backoff (float, optional): Delay before the first retry in seconds. Defaults to 0.01.
+        BackoffFactor (float, optional): Factor the delay grows by with each retry. Defaults to 2.
+        MaxBackoff (float, optional): Upper limit of the delay in seconds. Defaults to 1.
+        Status (iterable, optional): FT_STATUS codes that are retried. Defaults to FT.IO_ERROR and FT.DEVICE_NOT_FOUND.
+        Escalation (iterable, optional): Recovery step performed before each retry, one of 'Purge', 'ResetDevice',
+            'ResetPort', 'CyclePort', 'Rescan' or None for a plain retry. Retries beyond the last step
+            repeat it. Defaults to ('Purge', 'ResetDevice', 'ResetPort', 'CyclePort', 'Rescan').
+        ReopenDelay (float, optional): Time in seconds to wait for the device to enumerate again after
+            CyclePort before it is reopened. Defaults to 5.
+        RetryWrites (bool, optional): Also retry Write. A failed write may have sent part or all of its
+            data already, so retrying delivers it at least once instead of at most once. Defaults to False.
+    """
+    def __init__(self, MaxAttempts=6, Backoff=0.01, BackoffFactor=2.0, MaxBackoff=1.0,
+            Status=(_FT.IO_ERROR, _FT.DEVICE_NOT_FOUND),
+            Escalation=_STEPS, ReopenDelay=5.0, RetryWrites=False):
+        self.MaxAttempts = MaxAttempts
+        self.Backoff = Backoff
+        self.BackoffFactor = BackoffFactor
+        self.MaxBackoff = MaxBackoff
+        self.Status = frozenset(Status)
+        self.Escalation = tuple(Escalation)
+        self.ReopenDelay = ReopenDelay
+        self.RetryWrites = RetryWrites
+
+    def Delay(self, Retry):
+        """Return the delay in seconds before the given retry, counting from 0."""
+        return min(self.Backoff * self.BackoffFactor ** Retry, self.MaxBackoff)
+
+    def Step(self, Retry):
+        """Return the escalation step before the given retry, counting from 0."""
+        if not self.Escalation:
+            return None
+        return self.Escalation[min(Retry, len(self.Escalation) - 1)]
+
+
+class ResilientDevice(object):
+    """A device opened by OpenEx whose calls are retried according to a RetryPolicy.
+
+    Every wrapper of pyftd2xx taking a handle as first argument is available as method
+    without that argument, e.g. device.Read(64) or device.SetBaudRate(FT.BAUD_115200).
+    A failing Write raises without a retry, as the device may have received its data
+    before the error. With RetryPolicy(RetryWrites=True) it is retried like every other
+    call, so its data is sent at least once and possibly more than once.
+
+    Args:
+        Arg1 (str, int): The SerialNumber (str), Description (str) or Location (int) of the device, depends on the Flags given.
+        Flags (int): One of FT.OPEN_BY_SERIAL_NUMBER, FT.OPEN_BY_DESCRIPTION or FT.OPEN_BY_LOCATION.
+        Policy (RetryPolicy, optional): The retry policy. Defaults to RetryPolicy().
+
+    Raises:
+        StatusError: Gives a FT device error message.
+    """
+    def __init__(self, Arg1, Flags, Policy=None):
+        self.Arg1 = Arg1
+        self.Flags = Flags
+        self.Policy = RetryPolicy() if Policy is None else Policy
+        self.Handle = _ft.OpenEx(Arg1, Flags)
+        self._configuration = _OrderedDict()
+        self._lock = _threading.RLock()
+        self._generation = 0
+        self._metrics = _ret(Calls=0, Retries=0, Recoveries=0, Failures=0, Reopens=0,
+                RecoverySeconds=0.0, Escalations=_ret((step, 0) for step in _STEPS))
+
+    def __getattr__(self, name):
+        function = getattr(_ft, name, None)
+        if not callable(function) or name.startswith('_') or name in ('Open', 'OpenEx', 'Close'):
+            raise AttributeError(name)
+        def call(*Args):
+            return self.Call(name, *Args)
+        call.__name__ = name
+        call.__doc__ = function.__doc__
+        return call
+
+    def Call(self, Function, *Args):
+        """Call a wrapper with the device handle and retry it according to the policy.
+
+        Args:
+            Function (str): Name of the wrapper in pyftd2xx, e.g. 'Read'.
+            *Args: Arguments following the handle.
+
+        Raises:
+            StatusError: Gives a FT device error message if the call did not succeed within the policy.
+
+        Returns:
+            The result of the wrapper.
+        """
+        function = getattr(_ft, Function)
+        policy = self.Policy
+        retried = policy.Status if policy.RetryWrites or Function not in _WRITES else ()
+        retry = 0
+        failed_at = None
+        with self._lock:
+            self._metrics.Calls += 1
+        while True:
+            generation = self._generation
+            try:
+                if self.Handle is None:
+                    self._reopen()
+                result = function(self.Handle, *Args)
+            except _ft.StatusError as error:
+                if error.Status not in retried or retry + 1 >= policy.MaxAttempts:
+                    with self._lock:
+                        self._metrics.Failures += 1
+                    raise
+                if failed_at is None:
+                    failed_at = _time.perf_counter()
+                with self._lock:
+                    self._metrics.Retries += 1
+                _time.sleep(policy.Delay(retry))
+                self._escalate(policy.Step(retry), generation)
+                retry += 1
+                continue
+            if failed_at is not None:
+                with self._lock:
+                    self._metrics.Recoveries += 1
+                    self._metrics.RecoverySeconds += _time.perf_counter() - failed_at
+            key = _CONFIGURATION.get(Function)
+            if key is not None:
+                with self._lock:
+                    self._configuration.pop(key, None)
+                    self._configuration[key] = (function, Args)
+            return result
+
+    def _escalate(self, step, generation):
+        with self._lock:
+            if generation != self._generation or step is None:
+                # Another thread already recovered the device, just retry
+                return
+            self._metrics.Escalations[step] += 1
+            try:
+                if step == 'Purge':
+                    _ft.Purge(self.Handle, _FT.PURGE_RX | _FT.PURGE_TX)
+                elif step == 'ResetDevice':
+                    _ft.ResetDevice(self.Handle)
+                    self._restore()
+                elif step == 'ResetPort':
+                    _ft.ResetPort(self.Handle)
+                    self._restore()
+                elif step == 'CyclePort':
+                    _ft.CyclePort(self.Handle)
+                elif step == 'Rescan':
+                    _ft.Rescan()
+            except _ft.StatusError:
+                pass
+            if step in _REOPEN:
+                self._close()
+                if step == 'CyclePort':
+                    _time.sleep(self.Policy.ReopenDelay)
+            self._generation += 1
+
+    def _close(self):
+        if self.Handle is not None:
+            try:
+                _ft.Close(self.Handle)
+            except _ft.StatusError:
+                pass
+            self.Handle = None
+
+    def _reopen(self):
+        with self._lock:
+            if self.Handle is None:
+                self.Handle = _ft.OpenEx(self.Arg1, self.Flags)
+                self._metrics.Reopens += 1
+                self._restore()
+                self._generation += 1
+
+    def _restore(self):
+        for function, args in self._configuration.values():
+            function(self.Handle, *args)
+
+    def Reopen(self):
+        """Close and reopen the device and restore its last configuration.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._close()
+            self._reopen()
+        return None
+
+    def Close(self):
+        """Close the device.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self.Handle is not None:
+                handle, self.Handle = self.Handle, None
+                _ft.Close(handle)
+        return None
+
+    def GetMetrics(self):
+        """Return the recovery metrics.
+
+        Returns:
+            dict: A dict also accecible as a munch.
+                Calls (int): Number of calls made through the device.
+                Retries (int): Number of retried attempts.
+                Recoveries (int): Number of calls that succeeded after at least one retry.
+                Failures (int): Number of calls that raised.
+                Reopens (int): Number of times the device was reopened.
+                RecoverySeconds (float): Time spent between the first failure and success of recovered calls.
+                Escalations (dict): Number of times each escalation step was performed.
+        """
+        with self._lock:
+            metrics = _ret(self._metrics)
+            metrics.Escalations = _ret(self._metrics.Escalations)
+        return metrics
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
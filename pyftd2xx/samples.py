@@ -0,0 +1,272 @@
+"""
+Decoding of sample streams with NumPy. A stream of fixed size frames, e.g.
+interleaved ADC channels after a sync word, is described by a NumPy dtype
+or a list of fields. A SampleReader reads straight into its buffer and
+returns the complete frames as a structured array created with
+numpy.frombuffer, a view over the received bytes without any copy. Sync
+words are located with vectorized comparisons over the whole chunk instead
+of a Python loop over the bytes.
+
+The bytes of a partial frame at the end of a chunk are moved to the start
+of the buffer before the next read, so frames spanning chunk boundaries are
+decoded like any other. An array is only valid until the next read of its
+SampleReader; copy it with numpy.array to keep it.
+
+NumPy is only needed by this module and imported when a decoder is created.
+Fields of 24 bit samples are written as 'i3' or 'u3' (with '<' or '>' for
+the byte order). NumPy has no such type, they are kept as 3 bytes in the
+view and Field widens them to 32 bit integers.
+"""
+
+import ctypes as _c
+import re as _re
+from . import pyftd2xx as _ft
+from . import _ftd2xx as _lib
+
+
+_INT24 = _re.compile(r'^([<>]?)([iu])3$')
+
+_np = None
+
+def _numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('pyftd2xx.samples requires numpy, install it with pip install numpy')
+        _np = numpy
+    return _np
+
+
+class SampleDecoder(object):
+    """Cut frames of a fixed layout out of a buffer.
+
+    Args:
+        Layout (numpy.dtype, list): The dtype of a frame, or a list of (Name, Format) fields where
+            Format is a NumPy type string like '<i2', or '<i3'/'>u3' for 24 bit samples.
+        Sync (bytes, optional): Bytes every frame contains at SyncOffset. Frames are aligned to it and
+            data between frames without it is skipped. Defaults to None, frames follow each other.
+        SyncOffset (int, optional): Position of the sync bytes in a frame. Defaults to 0.
+
+    Attributes:
+        DType (numpy.dtype): The dtype of the decoded frames.
+        FrameSize (int): Size of a frame in bytes.
+        SkippedBytes (int): Number of bytes skipped to find the sync bytes.
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The sync bytes do not fit into a frame.
+    """
+    def __init__(self, Layout, Sync=None, SyncOffset=0):
+        np = _numpy()
+        self._int24 = {}
+        if isinstance(Layout, (list, tuple)):
+            fields = []
+            for name, format in Layout:
+                match = _INT24.match(format) if isinstance(format, str) else None
+                if match:
+                    self._int24[name] = (match.group(1) == '>', match.group(2) == 'i')
+                    fields.append((name, 'u1', (3,)))
+                else:
+                    fields.append((name, format))
+            Layout = fields
+        self.DType = np.dtype(Layout)
+        self.FrameSize = self.DType.itemsize
+        self.Sync = None if Sync is None else bytes(Sync)
+        self.SyncOffset = SyncOffset
+        if self.Sync is not None:
+            if not self.Sync or SyncOffset < 0 or SyncOffset + len(self.Sync) > self.FrameSize:
+                raise ValueError('Sync bytes do not fit into a frame of %d bytes' % self.FrameSize)
+            self._sync = np.frombuffer(self.Sync, np.uint8)
+        self.SkippedBytes = 0
+
+    def _find(self, data, start, end):
+        """Position of the first frame whose sync bytes lie in data[start:end], or None."""
+        sync = self._sync
+        first = start + self.SyncOffset
+        last = end - self.FrameSize + self.SyncOffset
+        if last < first:
+            return None
+        hits = _np.flatnonzero(data[first:last + 1] == sync[0])
+        for i in range(1, len(sync)):
+            if not len(hits):
+                break
+            hits = hits[data[first + i + hits] == sync[i]]
+        if not len(hits):
+            return None
+        return start + int(hits[0])
+
+    def Decode(self, Buffer, Start, End):
+        """Decode the first run of consecutive frames in Buffer[Start:End].
+
+        Args:
+            Buffer (bytearray, memoryview): The received data.
+            Start (int): Position of the first byte not yet decoded.
+            End (int): Position after the last received byte.
+
+        Returns:
+            tuple(numpy.ndarray, int): The frames as a view over Buffer, None if there is no
+                complete frame, and the position to continue decoding from.
+        """
+        np = _np
+        size = self.FrameSize
+        data = np.frombuffer(Buffer, np.uint8, End)
+        position = Start
+        if self.Sync is not None:
+            position = self._find(data, Start, End)
+            if position is None:
+                # Keep what could still be the start of a frame
+                keep = max(Start, End - size + 1)
+                self.SkippedBytes += keep - Start
+                return None, keep
+            self.SkippedBytes += position - Start
+        count = (End - position) // size
+        if not count:
+            return None, position
+        if self.Sync is not None:
+            frames = data[position:position + count * size].reshape(count, size)
+            offset = self.SyncOffset
+            bad = np.flatnonzero((frames[:, offset:offset + len(self.Sync)] != self._sync).any(axis=1))
+            if len(bad):
+                count = int(bad[0])
+        next = position + count * size
+        return np.frombuffer(Buffer, self.DType, count, position), next
+
+    def Field(self, Frames, Name):
+        """Return a field of decoded frames as numbers. 24 bit fields are widened to int32 or uint32,
+        which copies them; other fields are returned as a view.
+
+        Args:
+            Frames (numpy.ndarray): Frames returned by Decode.
+            Name (str): The field name.
+
+        Returns:
+            numpy.ndarray: The values of the field.
+        """
+        if Name not in self._int24:
+            return Frames[Name]
+        np = _np
+        big, signed = self._int24[Name]
+        raw = Frames[Name]
+        order = (2, 1, 0) if big else (0, 1, 2)
+        value = (raw[..., order[0]].astype(np.uint32) | (raw[..., order[1]].astype(np.uint32) << 8) |
+                (raw[..., order[2]].astype(np.uint32) << 16))
+        if signed:
+            return ((value ^ 0x800000).astype(np.int32) - 0x800000)
+        return value
+
+
+class SampleReader(object):
+    """Read a device stream and decode it into frames.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Decoder (SampleDecoder): The frame layout and sync.
+        BufferSize (int, optional): Size of the receive buffer, at least two frames. Defaults to 65536.
+        MinRead (int, optional): Bytes to wait for when the receive queue is empty. The wait is bounded by the
+            read timeout of the device. Defaults to one frame.
+
+    Attributes:
+        Frames (int): Number of frames decoded.
+    """
+    def __init__(self, Handle, Decoder, BufferSize=65536, MinRead=None):
+        self.Handle = Handle
+        self.Decoder = Decoder
+        self.MinRead = Decoder.FrameSize if MinRead is None else MinRead
+        size = max(BufferSize, 2 * Decoder.FrameSize)
+        self._buffer = bytearray(size)
+        self._cbuffer = (_c.c_char * size).from_buffer(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._returned = _lib.DWORD()
+        self.Frames = 0
+
+    def _compact(self):
+        """Move the undecoded bytes, less than a frame, to the start of the buffer."""
+        length = self._end - self._start
+        if self._start:
+            # Same size assignment, allowed while arrays export the buffer
+            self._buffer[0:length] = self._buffer[self._start:self._end]
+        self._start = 0
+        self._end = length
+
+    def Feed(self, Data):
+        """Append data received by other means than Read.
+
+        Args:
+            Data (bytes): The received data, at most the free space of the buffer.
+
+        Raises:
+            ValueError: Data does not fit into the buffer.
+
+        Returns:
+            None
+        """
+        self._compact()
+        if self._end + len(Data) > len(self._buffer):
+            raise ValueError('%d bytes do not fit into the buffer' % len(Data))
+        self._buffer[self._end:self._end + len(Data)] = Data
+        self._end += len(Data)
+        return None
+
+    def Fill(self):
+        """Read everything queued that fits into the buffer, or wait for MinRead bytes if nothing is queued.
+        Invalidates the arrays returned before.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            int: The number of bytes read.
+        """
+        self._compact()
+        free = len(self._buffer) - self._end
+        count = min(_ft.GetQueueStatus(self.Handle) or self.MinRead, free)
+        _lib.FT_Read(self.Handle, _c.byref(self._cbuffer, self._end), _lib.DWORD(count), _c.byref(self._returned))
+        self._end += self._returned.value
+        return self._returned.value
+
+    def Extract(self):
+        """Yield the decoded frames in the buffer without reading.
+
+        Yields:
+            numpy.ndarray: A run of consecutive frames, valid until the next Fill or Feed.
+        """
+        decode = self.Decoder.Decode
+        while True:
+            frames, self._start = decode(self._buffer, self._start, self._end)
+            if frames is None:
+                break
+            self.Frames += len(frames)
+            if len(frames):
+                yield frames
+
+    def Read(self):
+        """Read once and return the frames decoded from it.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            list(numpy.ndarray): Runs of consecutive frames, usually one, valid until the next read.
+        """
+        self.Fill()
+        return list(self.Extract())
+
+    def Arrays(self):
+        """Yield frames, reading from the device whenever the buffer holds no complete frame.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Yields:
+            numpy.ndarray: A run of consecutive frames, valid until the next is requested.
+        """
+        while True:
+            for frames in self.Extract():
+                yield frames
+            self.Fill()
+
+    def __iter__(self):
+        return self.Arrays()
@@ -0,0 +1,464 @@
+"""
+pyserial compatible serial port on D2XX. Code written for pyserial switches
+from the VCP driver to D2XX by replacing the import:
+
+    from pyftd2xx import serialport as serial
+    port = serial.Serial('FT4ABCDE', 115200, timeout=1)
+
+The port is the serial number of the device, or its index as int. Unlike the
+rest of this package the names follow pyserial, so they stay compatible. If
+pyserial is installed its exception classes are used, so existing except
+clauses keep working.
+
+Reads go through FT_Read with the pyserial timeout set as the D2XX read
+timeout, which has the same meaning: return when the requested bytes arrived
+or the timeout expired.
+"""
+
+import io as _io
+import time as _time
+import ctypes as _c
+from . import pyftd2xx as _ft
+from . import _ftd2xx as _lib
+from . import _defines as _FT
+from .stream import _release
+
+try:
+    from serial import SerialException, SerialTimeoutException
+except ImportError:
+    class SerialException(IOError):
+        """Base class for serial port related exceptions."""
+
+    class SerialTimeoutException(SerialException):
+        """Write timeouts give an exception."""
+
+__all__ = ['Serial', 'SerialException', 'SerialTimeoutException']
+
+
+PARITY_NONE, PARITY_EVEN, PARITY_ODD, PARITY_MARK, PARITY_SPACE = 'N', 'E', 'O', 'M', 'S'
+STOPBITS_ONE, STOPBITS_ONE_POINT_FIVE, STOPBITS_TWO = (1, 1.5, 2)
+FIVEBITS, SIXBITS, SEVENBITS, EIGHTBITS = (5, 6, 7, 8)
+
+PARITIES = (PARITY_NONE, PARITY_EVEN, PARITY_ODD, PARITY_MARK, PARITY_SPACE)
+STOPBITS = (STOPBITS_ONE, STOPBITS_TWO)
+BYTESIZES = (SEVENBITS, EIGHTBITS)
+
+XON = b'\x11'
+XOFF = b'\x13'
+
+_PARITY = {
+    PARITY_NONE: _FT.PARITY_NONE,
+    PARITY_EVEN: _FT.PARITY_EVEN,
+    PARITY_ODD: _FT.PARITY_ODD,
+    PARITY_MARK: _FT.PARITY_MARK,
+    PARITY_SPACE: _FT.PARITY_SPACE,
+}
+_STOPBITS = {STOPBITS_ONE: _FT.STOP_BITS_1, STOPBITS_TWO: _FT.STOP_BITS_2}
+_BYTESIZE = {SEVENBITS: _FT.BITS_7, EIGHTBITS: _FT.BITS_8}
+
+_SETTINGS = ('baudrate', 'bytesize', 'parity', 'stopbits', 'xonxoff', 'dsrdtr', 'rtscts',
+        'timeout', 'write_timeout', 'inter_byte_timeout')
+
+
+def _milliseconds(timeout):
+    """D2XX timeout for a pyserial timeout, 0 waits forever."""
+    return 0 if timeout is None else max(1, int(timeout * 1000 + 0.5))
+
+
+class Serial(_io.RawIOBase):
+    """Serial port on a D2XX device with the interface of pyserial's Serial.
+
+    Args:
+        port (str, int, optional): Serial number or index of the device. The port is opened
+            if given. Defaults to None.
+        baudrate (int, optional): Baud rate. Defaults to 9600.
+        bytesize (int, optional): SEVENBITS or EIGHTBITS. Defaults to EIGHTBITS.
+        parity (str, optional): One of PARITY_. Defaults to PARITY_NONE.
+        stopbits (int, optional): STOPBITS_ONE or STOPBITS_TWO. Defaults to STOPBITS_ONE.
+        timeout (float, optional): Read timeout in seconds, None to wait forever, 0 to not wait. Defaults to None.
+        xonxoff (bool, optional): Software flow control. Defaults to False.
+        rtscts (bool, optional): RTS/CTS flow control. Defaults to False.
+        write_timeout (float, optional): Write timeout in seconds, None to wait forever. Defaults to None.
+        dsrdtr (bool, optional): DSR/DTR flow control. Defaults to False.
+        inter_byte_timeout (float, optional): Accepted for compatibility, D2XX has no inter byte timeout. Defaults to None.
+        exclusive (bool, optional): Accepted for compatibility, D2XX devices are always opened exclusively. Defaults to None.
+
+    Raises:
+        SerialException: The device could not be opened or configured.
+        ValueError: A setting is not supported.
+    """
+    def __init__(self, port=None, baudrate=9600, bytesize=EIGHTBITS, parity=PARITY_NONE,
+            stopbits=STOPBITS_ONE, timeout=None, xonxoff=False, rtscts=False,
+            write_timeout=None, dsrdtr=False, inter_byte_timeout=None, exclusive=None):
+        _io.RawIOBase.__init__(self)
+        self.Handle = None
+        self.is_open = False
+        self._port = port
+        self._baudrate = baudrate
+        self._bytesize = bytesize
+        self._parity = parity
+        self._stopbits = stopbits
+        self._timeout = timeout
+        self._write_timeout = write_timeout
+        self._inter_byte_timeout = inter_byte_timeout
+        self._xonxoff = xonxoff
+        self._rtscts = rtscts
+        self._dsrdtr = dsrdtr
+        self._rts_state = True
+        self._dtr_state = True
+        self._break_state = False
+        # One output cell per direction, a reader and a writer thread may call concurrently
+        self._returned = _lib.DWORD()
+        self._written = _lib.DWORD()
+        self._check_settings()
+        if port is not None:
+            self.open()
+
+    # Opening and configuration
+
+    def _check_settings(self):
+        if self._bytesize not in _BYTESIZE:
+            raise ValueError('Not a valid byte size: %r' % (self._bytesize,))
+        if self._parity not in _PARITY:
+            raise ValueError('Not a valid parity: %r' % (self._parity,))
+        if self._stopbits not in _STOPBITS:
+            raise ValueError('Not a valid stop bit size: %r' % (self._stopbits,))
+        for timeout in (self._timeout, self._write_timeout):
+            if timeout is not None and timeout < 0:
+                raise ValueError('Not a valid timeout: %r' % (timeout,))
+
+    def open(self):
+        """Open the port with the current settings.
+
+        Raises:
+            SerialException: The device could not be opened or configured.
+        """
+        if self._port is None:
+            raise SerialException('Port must be configured before it can be used.')
+        if self.is_open:
+            raise SerialException('Port is already open.')
+        try:
+            if isinstance(self._port, int):
+                self.Handle = _ft.Open(self._port)
+            else:
+                self.Handle = _ft.OpenEx(self._port, _FT.OPEN_BY_SERIAL_NUMBER)
+        except _ft.StatusError as error:
+            raise SerialException('could not open port %r: %s' % (self._port, error))
+        self.is_open = True
+        try:
+            self._reconfigure_port()
+            self._update_rts_state()
+            self._update_dtr_state()
+            _ft.Purge(self.Handle, _FT.PURGE_RX_TX)
+        except BaseException:
+            self.close()
+            raise
+        return None
+
+    def _reconfigure_port(self):
+        if not self.is_open:
+            return
+        try:
+            _ft.SetBaudRate(self.Handle, self._baudrate)
+            _ft.SetDataCharacteristics(self.Handle, _BYTESIZE[self._bytesize],
+                    _STOPBITS[self._stopbits], _PARITY[self._parity])
+            if self._rtscts:
+                _ft.SetFlowControl(self.Handle, _FT.FLOW_RTS_CTS, 0, 0)
+            elif self._dsrdtr:
+                _ft.SetFlowControl(self.Handle, _FT.FLOW_DTR_DSR, 0, 0)
+            elif self._xonxoff:
+                _ft.SetFlowControl(self.Handle, _FT.FLOW_XON_XOFF, XON[0], XOFF[0])
+            else:
+                _ft.SetFlowControl(self.Handle, _FT.FLOW_NONE, 0, 0)
+            _ft.SetTimeouts(self.Handle, _milliseconds(self._timeout), _milliseconds(self._write_timeout))
+        except _ft.StatusError as error:
+            raise SerialException('could not configure port %r: %s' % (self._port, error))
+
+    def close(self):
+        """Close the port."""
+        if self.is_open:
+            self.is_open = False
+            handle, self.Handle = self.Handle, None
+            _ft.Close(handle)
+        return None
+
+    @property
+    def closed(self):
+        # Follows is_open instead of the one-way flag of io.RawIOBase, so the port can be reopened
+        return not getattr(self, 'is_open', False)
+
+    def __enter__(self):
+        if self._port is not None and not self.is_open:
+            self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _check_open(self):
+        if not self.is_open:
+            raise SerialException('Attempting to use a port that is not open')
+
+    def _setting(name):
+        def get(self):
+            return getattr(self, '_' + name)
+        def set(self, value):
+            previous = getattr(self, '_' + name)
+            setattr(self, '_' + name, value)
+            try:
+                self._check_settings()
+            except ValueError:
+                setattr(self, '_' + name, previous)
+                raise
+            self._reconfigure_port()
+        return property(get, set)
+
+    baudrate = _setting('baudrate')
+    bytesize = _setting('bytesize')
+    parity = _setting('parity')
+    stopbits = _setting('stopbits')
+    timeout = _setting('timeout')
+    write_timeout = _setting('write_timeout')
+    inter_byte_timeout = _setting('inter_byte_timeout')
+    xonxoff = _setting('xonxoff')
+    rtscts = _setting('rtscts')
+    dsrdtr = _setting('dsrdtr')
+    del _setting
+
+    @property
+    def port(self):
+        return self._port
+
+    @port.setter
+    def port(self, port):
+        was_open = self.is_open
+        if was_open:
+            self.close()
+        self._port = port
+        if was_open:
+            self.open()
+
+    @property
+    def name(self):
+        return None if self._port is None else str(self._port)
+
+    def get_settings(self):
+        """Return the current settings as a dict, see apply_settings."""
+        return dict((key, getattr(self, '_' + key)) for key in _SETTINGS)
+
+    def apply_settings(self, d):
+        """Apply the settings of a dict returned by get_settings."""
+        for key in _SETTINGS:
+            if key in d:
+                setattr(self, '_' + key, d[key])
+        self._check_settings()
+        self._reconfigure_port()
+
+    # Data transfer
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    @property
+    def in_waiting(self):
+        """Number of bytes in the receive queue."""
+        self._check_open()
+        return _ft.GetQueueStatus(self.Handle)
+
+    @property
+    def out_waiting(self):
+        """Number of bytes in the transmit queue."""
+        self._check_open()
+        return _ft.GetStatus(self.Handle).AmountInTxQueue
+
+    def readinto(self, b):
+        """Read up to len(b) bytes into b, returning earlier only when the timeout expires."""
+        self._check_open()
+        view = memoryview(b).cast('B')
+        size = len(view)
+        if self._timeout == 0:
+            size = min(size, _ft.GetQueueStatus(self.Handle))
+        if not size:
+            return 0
+        array = (_c.c_char * size).from_buffer(view)
+        try:
+            _lib.FT_Read(self.Handle, array, _lib.DWORD(size), _c.byref(self._returned))
+        finally:
+            del array
+            _release(view)
+        return self._returned.value
+
+    def read(self, size=1):
+        """Read size bytes, fewer if the timeout expires.
+
+        Returns:
+            bytes: The bytes read.
+        """
+        self._check_open()
+        if size is None or size < 0:
+            size = self.in_waiting
+        buffer = bytearray(size)
+        return bytes(buffer[:self.readinto(buffer)])
+
+    def read_until(self, expected=b'\n', size=None):
+        """Read until expected is found, size bytes were read or the timeout expires.
+
+        Returns:
+            bytes: The bytes read, including expected if it was found.
+        """
+        self._check_open()
+        line = bytearray()
+        deadline = None if self._timeout is None else _time.monotonic() + self._timeout
+        length = len(expected)
+        while size is None or len(line) < size:
+            data = self.read(1)
+            if data:
+                line += data
+                if line[-length:] == expected:
+                    break
+            elif deadline is not None and _time.monotonic() >= deadline:
+                break
+        return bytes(line)
+
+    def write(self, b):
+        """Write b, raising SerialTimeoutException if the write timeout expires.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        self._check_open()
+        if isinstance(b, str):
+            raise TypeError('unicode strings are not supported, please encode to bytes: %r' % (b,))
+        if isinstance(b, bytes):
+            written = _ft.Write(self.Handle, b) if b else 0
+            size = len(b)
+        else:
+            view = memoryview(b).cast('B')
+            size = len(view)
+            if not size:
+                return 0
+            array = (_c.c_char * size).from_buffer_copy(view) if view.readonly else (_c.c_char * size).from_buffer(view)
+            try:
+                _lib.FT_Write(self.Handle, array, _lib.DWORD(size), _c.byref(self._written))
+            finally:
+                del array
+                _release(view)
+            written = self._written.value
+        if written < size and self._write_timeout is not None:
+            raise SerialTimeoutException('Write timeout')
+        return written
+
+    def flush(self):
+        """Wait until all queued data was sent."""
+        if self.is_open:
+            while _ft.GetStatus(self.Handle).AmountInTxQueue:
+                _time.sleep(0.001)
+
+    def reset_input_buffer(self):
+        """Discard the receive queue."""
+        self._check_open()
+        _ft.Purge(self.Handle, _FT.PURGE_RX)
+
+    def reset_output_buffer(self):
+        """Discard the transmit queue."""
+        self._check_open()
+        _ft.Purge(self.Handle, _FT.PURGE_TX)
+
+    # Control lines
+
+    def send_break(self, duration=0.25):
+        """Send a break condition for duration seconds."""
+        self._check_open()
+        self.break_condition = True
+        _time.sleep(duration)
+        self.break_condition = False
+
+    @property
+    def break_condition(self):
+        return self._break_state
+
+    @break_condition.setter
+    def break_condition(self, value):
+        self._check_open()
+        self._break_state = bool(value)
+        if self._break_state:
+            _ft.SetBreakOn(self.Handle)
+        else:
+            _ft.SetBreakOff(self.Handle)
+
+    def _update_rts_state(self):
+        if self.is_open and not self._rtscts:
+            (_ft.SetRts if self._rts_state else _ft.ClrRts)(self.Handle)
+
+    def _update_dtr_state(self):
+        if self.is_open and not self._dsrdtr:
+            (_ft.SetDtr if self._dtr_state else _ft.ClrDtr)(self.Handle)
+
+    @property
+    def rts(self):
+        return self._rts_state
+
+    @rts.setter
+    def rts(self, value):
+        self._rts_state = bool(value)
+        self._update_rts_state()
+
+    @property
+    def dtr(self):
+        return self._dtr_state
+
+    @dtr.setter
+    def dtr(self, value):
+        self._dtr_state = bool(value)
+        self._update_dtr_state()
+
+    def _modem(self, signal):
+        self._check_open()
+        return bool(_ft.GetModemStatus(self.Handle) & signal)
+
+    @property
+    def cts(self):
+        return self._modem(_FT.ModemStatus.CTS)
+
+    @property
+    def dsr(self):
+        return self._modem(_FT.ModemStatus.DSR)
+
+    @property
+    def ri(self):
+        return self._modem(_FT.ModemStatus.RI)
+
+    @property
+    def cd(self):
+        return self._modem(_FT.ModemStatus.DCD)
+
+    # Names of pyserial 2
+
+    def inWaiting(self):
+        return self.in_waiting
+
+    def flushInput(self):
+        self.reset_input_buffer()
+
+    def flushOutput(self):
+        self.reset_output_buffer()
+
+    def setRTS(self, value=True):
+        self.rts = value
+
+    def setDTR(self, value=True):
+        self.dtr = value
+
+    def sendBreak(self, duration=0.25):
+        self.send_break(duration)
+
+    def __repr__(self):
+        return '%s<id=0x%x, open=%s>(port=%r, baudrate=%r, bytesize=%r, parity=%r, stopbits=%r, timeout=%r)' % (
+                self.__class__.__name__, id(self), self.is_open, self._port, self._baudrate,
+                self._bytesize, self._parity, self._stopbits, self._timeout)
@@ -0,0 +1,137 @@
+"""
+File-like access to an open device. DeviceIO is a io.RawIOBase, so the
+standard I/O layers work on top of it:
+
+    raw = DeviceIO(Handle)
+    reader = io.BufferedReader(raw, 65536)
+    shutil.copyfileobj(reader, file)
+
+readinto passes the caller's memory straight to FT_Read and write passes
+writable buffers and bytes straight to FT_Write, so the only copies are
+those of the buffering layer itself.
+
+A device stream has no end. readinto returns the bytes already queued, or
+waits for at least one byte, and never returns 0 while the stream is open;
+readall and read() without a size therefore do not return.
+"""
+
+import io as _io
+import time as _time
+import ctypes as _c
+from . import pyftd2xx as _ft
+from . import _ftd2xx as _lib
+
+
+def _release(view):
+    try:
+        view.release()
+    except BufferError:
+        # Still exported by the traceback of a failed call, it is released with it
+        pass
+
+
+class DeviceIO(_io.RawIOBase):
+    """Raw binary stream over an open device.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Timeout (float, optional): Time in seconds readinto waits for the first byte before
+            raising TimeoutError, None to wait forever. Defaults to None.
+        CloseHandle (bool, optional): Close the device when the stream is closed. Defaults to True.
+    """
+    def __init__(self, Handle, Timeout=None, CloseHandle=True):
+        _io.RawIOBase.__init__(self)
+        self.Handle = Handle
+        self.Timeout = Timeout
+        self.CloseHandle = CloseHandle
+        # One set of output cells per direction, a reader and a writer thread may call concurrently
+        self._queued = _lib.DWORD()
+        self._returned = _lib.DWORD()
+        self._written = _lib.DWORD()
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def _read(self, array, offset, count):
+        _lib.FT_Read(self.Handle, _c.byref(array, offset), _lib.DWORD(count), _c.byref(self._returned))
+        return self._returned.value
+
+    def readinto(self, b):
+        """Read the queued bytes into b, waiting for at least one byte if none are queued.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: No byte arrived within the timeout.
+
+        Returns:
+            int: The number of bytes read.
+        """
+        self._checkClosed()
+        view = memoryview(b).cast('B')
+        size = len(view)
+        if not size:
+            return 0
+        array = (_c.c_char * size).from_buffer(view)
+        try:
+            deadline = None if self.Timeout is None else _time.monotonic() + self.Timeout
+            while True:
+                _lib.FT_GetQueueStatus(self.Handle, _c.byref(self._queued))
+                queued = self._queued.value
+                if queued:
+                    return self._read(array, 0, min(queued, size))
+                # Nothing queued: block in FT_Read for the first byte, then take what followed it
+                if self._read(array, 0, 1):
+                    _lib.FT_GetQueueStatus(self.Handle, _c.byref(self._queued))
+                    queued = min(self._queued.value, size - 1)
+                    return 1 + (self._read(array, 1, queued) if queued else 0)
+                if deadline is not None and _time.monotonic() >= deadline:
+                    raise TimeoutError('No data within the timeout')
+        finally:
+            del array
+            _release(view)
+
+    def write(self, b):
+        """Write b to the device without copying it, except for read-only buffers other than bytes.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            int: The number of bytes written, less than len(b) after a write timeout.
+        """
+        self._checkClosed()
+        if isinstance(b, bytes):
+            return _ft.Write(self.Handle, b) if b else 0
+        view = memoryview(b).cast('B')
+        size = len(view)
+        if not size:
+            return 0
+        if view.readonly:
+            array = (_c.c_char * size).from_buffer_copy(view)
+        else:
+            array = (_c.c_char * size).from_buffer(view)
+        try:
+            _lib.FT_Write(self.Handle, array, _lib.DWORD(size), _c.byref(self._written))
+            return self._written.value
+        finally:
+            del array
+            _release(view)
+
+    def close(self):
+        """Close the stream and, if CloseHandle is set, the device.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        if not self.closed:
+            try:
+                if self.CloseHandle:
+                    _ft.Close(self.Handle)
+            finally:
+                _io.RawIOBase.close(self)
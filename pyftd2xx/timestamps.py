@@ -0,0 +1,140 @@
+"""
+Timestamped streaming. Every chunk returned by FT_Read gets the host time at
+which it arrived (time.perf_counter) and the offset of its first byte in the
+stream. A ClockEstimator fits host time against byte offset over the chunk
+cadence, which yields the offset and drift of the device clock relative to
+the host clock. From that fit every chunk carries the estimated time of its
+first sample and the sample interval, so the time of any sample is
+Start + Index * Interval without touching the samples in Python.
+"""
+
+import time as _time
+from munch import Munch as _ret
+from . import pyftd2xx as _ft
+
+
+class ClockEstimator(object):
+    """Least squares fit of host time against byte offset with exponential forgetting.
+
+    Args:
+        NominalByteRate (float, optional): Byte rate of the device at its nominal clock, used to report the drift. Defaults to None.
+        Forgetting (float, optional): Weight of the existing fit per added point, close to 1 for slowly changing clocks. Defaults to 0.999.
+    """
+    def __init__(self, NominalByteRate=None, Forgetting=0.999):
+        self.NominalByteRate = NominalByteRate
+        self.Forgetting = Forgetting
+        self.Reset()
+
+    def Reset(self):
+        """Discard all points."""
+        self._origin = None
+        self._w = self._x = self._y = self._xx = self._xy = 0.0
+        self._slope = None
+        self._intercept = None
+        return None
+
+    def Add(self, Offset, Time):
+        """Add the host time at which the byte at Offset arrived."""
+        if self._origin is None:
+            self._origin = (Offset, Time)
+        x = float(Offset - self._origin[0])
+        y = Time - self._origin[1]
+        f = self.Forgetting
+        self._w = self._w * f + 1.0
+        self._x = self._x * f + x
+        self._y = self._y * f + y
+        self._xx = self._xx * f + x * x
+        self._xy = self._xy * f + x * y
+        denominator = self._w * self._xx - self._x * self._x
+        if denominator > 0:
+            self._slope = (self._w * self._xy - self._x * self._y) / denominator
+            self._intercept = (self._y - self._slope * self._x) / self._w
+        elif self.NominalByteRate:
+            self._slope = 1.0 / self.NominalByteRate
+            self._intercept = y - self._slope * x
+        return None
+
+    @property
+    def SecondsPerByte(self):
+        """Estimated host seconds per byte, None until enough points were added."""
+        return self._slope
+
+    @property
+    def ClockOffset(self):
+        """Estimated host time at which byte 0 arrived, None until enough points were added."""
+        if self._slope is None:
+            return None
+        return self._origin[1] + self._intercept - self._slope * self._origin[0]
+
+    @property
+    def Drift(self):
+        """Relative deviation of the device clock from its nominal rate, e.g. 20e-6 for 20 ppm slow. None if unknown."""
+        if self._slope is None or not self.NominalByteRate:
+            return None
+        return self._slope * self.NominalByteRate - 1.0
+
+    def TimeOf(self, Offset):
+        """Estimated host time at which the byte at Offset arrived, None if unknown."""
+        if self._slope is None:
+            return None
+        return self._origin[1] + self._intercept + self._slope * (Offset - self._origin[0])
+
+
+class TimestampedReader(object):
+    """Read a stream in chunks with host timestamps and clock correlation.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        ChunkSize (int, optional): Number of bytes requested per FT_Read. Defaults to 65536.
+        BytesPerSample (int, optional): Size of one sample, used for the per chunk sample interval. Defaults to 1.
+        NominalByteRate (float, optional): Byte rate of the device at its nominal clock. Defaults to None.
+        Forgetting (float, optional): See ClockEstimator. Defaults to 0.999.
+
+    Attributes:
+        Clock (ClockEstimator): The clock estimation of this stream.
+        Offset (int): Number of bytes read so far.
+    """
+    def __init__(self, Handle, ChunkSize=65536, BytesPerSample=1, NominalByteRate=None, Forgetting=0.999):
+        self.Handle = Handle
+        self.ChunkSize = ChunkSize
+        self.BytesPerSample = BytesPerSample
+        self.Clock = ClockEstimator(NominalByteRate, Forgetting)
+        self.Offset = 0
+
+    def ReadChunk(self):
+        """Read one chunk.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            dict: A dict also accecible as a munch.
+                Data (bytes): The bytes read, may be empty after a timeout.
+                HostTime (float): time.perf_counter() when the read returned.
+                Offset (int): Stream offset of the first byte of Data.
+                Start (float): Estimated host time of the first sample, None while unknown.
+                Interval (float): Estimated host seconds per sample, None while unknown.
+        """
+        data = _ft.Read(self.Handle, self.ChunkSize)
+        now = _time.perf_counter()
+        offset = self.Offset
+        if data:
+            self.Offset += len(data)
+            self.Clock.Add(self.Offset - 1, now)
+        slope = self.Clock.SecondsPerByte
+        return _ret(Data=data, HostTime=now, Offset=offset, Start=self.Clock.TimeOf(offset),
+                Interval=None if slope is None else slope * self.BytesPerSample)
+
+    def Chunks(self):
+        """Yield chunks with data, see ReadChunk.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+        """
+        while True:
+            chunk = self.ReadChunk()
+            if chunk.Data:
+                yield chunk
+
+    def __iter__(self):
+        return self.Chunks()
@@ -0,0 +1,218 @@
+"""
+Cached access to the EEPROM user area. D2XX only transfers the user area
+from its start, so a UserArea reads the shortest prefix covering what is
+requested and keeps it for the rest of the session; later reads, also from
+other UserArea objects of the same device, are served from memory. Writes
+transfer the prefix up to the end of the change and update the cache once
+the device accepted it.
+
+The area can be split into named regions. Each region stores its data
+followed by a CRC-32 (4 bytes, little endian), so corrupted or never written
+regions are detected instead of being used as calibration data.
+"""
+
+import struct as _struct
+import threading as _threading
+import zlib as _zlib
+from . import pyftd2xx as _ft
+
+
+_CRC = _struct.Struct('<I')
+
+_cache_lock = _threading.Lock()
+_cache = {}
+
+
+class ChecksumError(ValueError):
+    """The CRC of a user area region does not match its data.
+
+    Attributes:
+        Region (str): Name of the region.
+    """
+    def __init__(self, Region):
+        ValueError.__init__(self, 'CRC mismatch in user area region %r' % Region)
+        self.Region = Region
+
+
+class UserArea(object):
+    """Cached, validated view of the EEPROM user area of an open device.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Regions (dict, optional): Maps region names to (Offset, Size), the size excluding the
+            4 byte CRC stored after the data. Defaults to None, no regions.
+
+    Raises:
+        StatusError: Gives a FT device error message.
+        ValueError: Regions overlap or do not fit into the user area.
+    """
+    def __init__(self, Handle, Regions=None):
+        self.Handle = Handle
+        self.Size = _ft.EE_UASize(Handle)
+        self.Regions = dict(Regions or {})
+        spans = sorted((offset, offset + size + _CRC.size, name) for name, (offset, size) in self.Regions.items())
+        for (_, end, name), (start, _, following) in zip(spans, spans[1:]):
+            if end > start:
+                raise ValueError('User area regions %r and %r overlap' % (name, following))
+        if spans and (spans[0][0] < 0 or spans[-1][1] > self.Size):
+            raise ValueError('User area regions do not fit into %d bytes' % self.Size)
+        # Devices are cached by serial number, which stays valid across reopening
+        self._key = _ft.GetDeviceInfo(Handle).SerialNumber
+        with _cache_lock:
+            self._data = _cache.setdefault(self._key, bytearray())
+
+    def _load(self, end):
+        """Make sure the cache covers the first end bytes."""
+        data = self._data
+        if len(data) < end:
+            with _cache_lock:
+                self._fill(end)
+        return data
+
+    def _fill(self, end):
+        """Like _load, with _cache_lock held."""
+        data = self._data
+        if len(data) < end:
+            buffer = bytearray(end)
+            count = _ft.EE_UARead(self.Handle, end, buffer)
+            if count < end:
+                raise IOError('Read %d of %d bytes from the user area' % (count, end))
+            data[:] = buffer
+        return data
+
+    def _check(self, offset, size):
+        if offset < 0 or size < 0 or offset + size > self.Size:
+            raise ValueError('%d bytes at %d exceed the user area of %d bytes' % (size, offset, self.Size))
+
+    def Read(self, Offset=0, Size=None):
+        """Return bytes of the user area, transferring them only on first use.
+
+        Args:
+            Offset (int, optional): Start of the bytes. Defaults to 0.
+            Size (int, optional): Number of bytes. Defaults to the rest of the area.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            IOError: The device returned fewer bytes than requested.
+
+        Returns:
+            bytes: The bytes.
+        """
+        if Size is None:
+            Size = self.Size - Offset
+        self._check(Offset, Size)
+        return bytes(self._load(Offset + Size)[Offset:Offset + Size])
+
+    def ReadInto(self, Buffer, Offset=0):
+        """Copy bytes of the user area into a writable buffer.
+
+        Args:
+            Buffer (bytearray, memoryview): The buffer, filled completely.
+            Offset (int, optional): Start of the bytes. Defaults to 0.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            IOError: The device returned fewer bytes than requested.
+
+        Returns:
+            int: The number of bytes copied.
+        """
+        view = memoryview(Buffer).cast('B')
+        self._check(Offset, len(view))
+        view[:] = memoryview(self._load(Offset + len(view)))[Offset:Offset + len(view)]
+        return len(view)
+
+    def Write(self, Data, Offset=0):
+        """Write bytes to the user area. Nothing is transferred if they are unchanged.
+
+        Args:
+            Data (bytes, bytearray, memoryview): The bytes to write.
+            Offset (int, optional): Start of the bytes. Defaults to 0.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            IOError: The device returned fewer bytes than requested.
+
+        Returns:
+            bool: True if the device was written.
+        """
+        data = memoryview(Data).cast('B')
+        end = Offset + len(data)
+        self._check(Offset, len(data))
+        with _cache_lock:
+            cache = self._fill(end)
+            if cache[Offset:end] == data:
+                return False
+            # Change a copy, the cache is only updated once the device accepted it
+            contents = cache[:end]
+            contents[Offset:end] = data
+            _ft.EE_UAWrite(self.Handle, contents)
+            cache[Offset:end] = data
+        return True
+
+    def ReadRegion(self, Name):
+        """Return the data of a region after checking its CRC.
+
+        Args:
+            Name (str): The region name.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            ChecksumError: The CRC does not match the data.
+
+        Returns:
+            bytes: The data of the region.
+        """
+        offset, size = self.Regions[Name]
+        data = self.Read(offset, size + _CRC.size)
+        if _zlib.crc32(data[:size]) != _CRC.unpack_from(data, size)[0]:
+            raise ChecksumError(Name)
+        return data[:size]
+
+    def WriteRegion(self, Name, Data):
+        """Write the data of a region followed by its CRC.
+
+        Args:
+            Name (str): The region name.
+            Data (bytes): The data, padded with zeros to the size of the region.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            ValueError: Data is larger than the region.
+
+        Returns:
+            bool: True if the device was written.
+        """
+        offset, size = self.Regions[Name]
+        if len(Data) > size:
+            raise ValueError('%d bytes do not fit into region %r of %d bytes' % (len(Data), Name, size))
+        data = bytes(Data) + bytes(size - len(Data))
+        return self.Write(data + _CRC.pack(_zlib.crc32(data)), offset)
+
+    def Validate(self):
+        """Check the CRC of every region.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            dict: Maps each region name to True if its CRC matches.
+        """
+        valid = {}
+        for name in self.Regions:
+            try:
+                self.ReadRegion(name)
+                valid[name] = True
+            except ChecksumError:
+                valid[name] = False
+        return valid
+
+    def Invalidate(self):
+        """Discard the cached content, e.g. after the area was written by another program.
+
+        Returns:
+            None
+        """
+        with _cache_lock:
+            del self._data[:]
+        return None
@@ -0,0 +1,471 @@
+"""
+Write combining. Every Write is its own FT_Write and its own USB transfer,
+so producers making many small writes are limited by the transfer rate,
+not by the bandwidth. A CoalescingWriter copies small writes into a
+preallocated buffer and transfers it as one FT_Write when it reaches a size
+threshold, when the oldest buffered byte is older than a deadline, or on an
+explicit Flush.
+
+There are two buffers: while the flusher transfers one, producers fill the
+other, so a Write only blocks when both are full. Writes at least as large
+as the threshold are not copied but passed through after the buffered data.
+Data always reaches the device in the order it was written. When a transfer
+fails, the bytes the device did not take are kept and sent first by the
+next transfer, after the error was raised.
+
+A PacedWriter applies backpressure instead: it keeps the transmit queue of
+the device between a low and a high watermark, so long output streams flow
+steadily rather than stalling in FT_Write whenever the queue is full.
+"""
+
+import sys as _sys
+import threading as _threading
+import time as _time
+import ctypes as _c
+from munch import Munch as _ret
+from . import _ftd2xx as _lib
+from .stream import _release
+
+
+SIZE = 'Size'
+DEADLINE = 'Deadline'
+EXPLICIT = 'Explicit'
+
+
+class CoalescingWriter(object):
+    """Combine small writes to a device into large transfers.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        Size (int, optional): Size in bytes of each of the two buffers. Defaults to 65536.
+        Threshold (int, optional): Buffered bytes starting a transfer, also the size from which
+            writes are passed through. Defaults to half of Size.
+        Deadline (float, optional): Longest time in seconds a byte stays buffered. Defaults to 0.002.
+
+    Raises:
+        ValueError: Threshold is not between 1 and Size.
+    """
+    def __init__(self, Handle, Size=65536, Threshold=None, Deadline=0.002):
+        if Threshold is None:
+            Threshold = Size // 2
+        if not 0 < Threshold <= Size:
+            raise ValueError('Threshold must be between 1 and %d, not %r' % (Size, Threshold))
+        self.Handle = Handle
+        self.Size = Size
+        self.Threshold = Threshold
+        self.Deadline = Deadline
+        self._buffers = [bytearray(Size), bytearray(Size)]
+        # Exported once, the buffers are never resized
+        self._arrays = [(_c.c_char * Size).from_buffer(buffer) for buffer in self._buffers]
+        self._active = 0
+        self._fill = 0
+        self._first = None
+        self._flush_requested = False
+        self._error = None
+        # Bytes of a failed transfer, sent before anything else
+        self._unsent = None
+        # _io orders the transfers, _cond guards the active buffer; _io is always taken first
+        self._io = _threading.Lock()
+        self._cond = _threading.Condition(_threading.Lock())
+        self._written = _lib.DWORD()
+        self._thread = None
+        self._stop = False
+        self._stats = _ret(Writes=0, Bytes=0, Transfers=0, PassThrough=0,
+                SizeFlushes=0, DeadlineFlushes=0, ExplicitFlushes=0)
+
+    def _raise(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _transfer(self, data, size):
+        self._written.value = 0
+        _lib.FT_Write(self.Handle, data, _lib.DWORD(size), _c.byref(self._written))
+        self._stats.Transfers += 1
+        if self._written.value < size:
+            raise TimeoutError('Wrote %d of %d bytes within the write timeout' % (self._written.value, size))
+
+    def _flush(self, Reason, Then=None):
+        """Transfer unsent and buffered data, followed by Then if given. _io must be held."""
+        with self._cond:
+            index, size = self._active, self._fill
+            self._active ^= 1
+            self._fill = 0
+            self._first = None
+            self._flush_requested = False
+            self._cond.notify_all()
+        pending = []
+        if self._unsent:
+            pending.append((self._unsent, len(self._unsent)))
+            self._unsent = None
+        if size:
+            self._stats[Reason + 'Flushes'] += 1
+            pending.append((self._arrays[index], size))
+        for position, (data, count) in enumerate(pending):
+            try:
+                self._transfer(data, count)
+            except BaseException:
+                # Keep what the device did not take, in order, for the next transfer
+                unsent = [memoryview(data)[self._written.value:count]]
+                unsent.extend(memoryview(data)[:count] for data, count in pending[position + 1:])
+                self._unsent = b''.join(unsent)
+                raise
+        if Then is not None:
+            self._transfer(Then, len(Then))
+
+    def Write(self, Data):
+        """Buffer data for the device.
+
+        Args:
+            Data (bytes, bytearray, memoryview): The bytes to write.
+
+        Raises:
+            StatusError: Gives a FT device error message, possibly of an earlier background transfer.
+            TimeoutError: A transfer did not complete within the write timeout.
+
+        Returns:
+            int: The number of bytes accepted, always len(Data).
+        """
+        self._raise()
+        view = memoryview(Data).cast('B')
+        size = len(view)
+        stats = self._stats
+        stats.Writes += 1
+        stats.Bytes += size
+        if size >= self.Threshold:
+            stats.PassThrough += 1
+            if isinstance(Data, bytes):
+                data = Data
+            elif view.readonly:
+                data = (_c.c_char * size).from_buffer_copy(view)
+            else:
+                data = (_c.c_char * size).from_buffer(view)
+            try:
+                with self._io:
+                    self._flush(SIZE, data)
+            finally:
+                del data
+                _release(view)
+            return size
+        with self._cond:
+            appended = self._fill + size <= self.Size
+            if appended:
+                self._append(view, size)
+        if not appended:
+            # Both buffers are full, transfer in this thread
+            with self._io:
+                with self._cond:
+                    appended = self._fill + size <= self.Size
+                    if appended:
+                        self._append(view, size)
+                if not appended:
+                    self._flush(SIZE)
+                    with self._cond:
+                        self._append(view, size)
+        self._flush_pending()
+        return size
+
+    def _append(self, view, size):
+        """Copy into the active buffer. _cond must be held."""
+        fill = self._fill
+        self._buffers[self._active][fill:fill + size] = view
+        self._fill = fill + size
+        if not fill:
+            self._first = _time.perf_counter()
+        if not fill or self._fill >= self.Threshold:
+            self._cond.notify_all()
+        if self._thread is None and (self._fill >= self.Threshold or
+                _time.perf_counter() - self._first >= self.Deadline):
+            # No flusher running, keep the promises of threshold and deadline here
+            self._flush_requested = True
+
+    def _flush_pending(self):
+        if self._flush_requested:
+            with self._io:
+                self._flush(SIZE if self._fill >= self.Threshold else DEADLINE)
+
+    def Flush(self):
+        """Transfer all buffered data now and return when it was written.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: A transfer did not complete within the write timeout.
+
+        Returns:
+            None
+        """
+        self._raise()
+        with self._io:
+            self._flush(EXPLICIT)
+        return None
+
+    def _run(self):
+        clock = _time.perf_counter
+        while True:
+            with self._cond:
+                while not self._fill and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    break
+                reason = SIZE
+                while self._fill < self.Threshold and not self._stop:
+                    remaining = self._first + self.Deadline - clock()
+                    if remaining <= 0:
+                        reason = DEADLINE
+                        break
+                    self._cond.wait(remaining)
+                    if not self._fill:
+                        break
+            try:
+                with self._io:
+                    if self._fill:
+                        self._flush(reason)
+            except Exception:
+                # Handed to the producer on its next call
+                self._error = _sys.exc_info()[1]
+
+    def GetStatistics(self):
+        """Return the write counters.
+
+        Returns:
+            dict: A dict also accecible as a munch.
+                Writes (int): Number of Write calls.
+                Bytes (int): Number of bytes written.
+                Transfers (int): Number of FT_Write calls.
+                PassThrough (int): Number of writes passed through without copying into the buffer.
+                SizeFlushes (int): Transfers started by the threshold.
+                DeadlineFlushes (int): Transfers started by the deadline.
+                ExplicitFlushes (int): Transfers started by Flush or Close.
+                Amplification (float): Transfers per write, 1.0 without coalescing, None before the first write.
+                MeanTransfer (float): Mean bytes per transfer, None before the first transfer.
+        """
+        stats = _ret(self._stats)
+        stats.Amplification = stats.Transfers / stats.Writes if stats.Writes else None
+        stats.MeanTransfer = stats.Bytes / stats.Transfers if stats.Transfers else None
+        return stats
+
+    def Start(self):
+        """Start the background flusher thread."""
+        if self._thread is None:
+            self._stop = False
+            self._thread = _threading.Thread(target=self._run, name='pyftd2xx-writer', daemon=True)
+            self._thread.start()
+        return None
+
+    def Stop(self):
+        """Stop the background flusher thread. Buffered data is kept until the next Flush."""
+        if self._thread is not None:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+        return None
+
+    def Close(self):
+        """Stop the flusher and transfer the buffered data.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: A transfer did not complete within the write timeout.
+
+        Returns:
+            None
+        """
+        self.Stop()
+        self.Flush()
+        return None
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.Close()
+
+
+class PacedWriter(object):
+    """Write to a device keeping its transmit queue between two watermarks.
+
+    Data is written in chunks that fill the transmit queue up to High. Once the queue
+    reached High, the writer waits until it drained to Low, so FT_Write never blocks on
+    a full queue. The queue depth is read with FT_GetStatus only when the bytes written
+    since the last reading could have reached High, and the waits are sized from the
+    measured drain rate instead of polling at a fixed interval. D2XX has no transmit
+    event, so there is no notification to wait for.
+
+    FT_GetStatus also returns and resets the event status, so do not combine a
+    PacedWriter with an EventDispatcher polling the same handle.
+
+    Args:
+        Handle (ctypes.c_void_p): Ctypes pointer to the handle of the device.
+        High (int, optional): Largest number of bytes queued for transmission. Defaults to 4096.
+        Low (int, optional): Queue depth at which writing resumes. Defaults to a quarter of High.
+        MinInterval (float, optional): Shortest wait in seconds between queue readings. Defaults to 0.0002.
+        MaxInterval (float, optional): Longest wait in seconds between queue readings. Defaults to 0.01.
+
+    Raises:
+        ValueError: Low is not below High.
+    """
+    def __init__(self, Handle, High=4096, Low=None, MinInterval=0.0002, MaxInterval=0.01):
+        if Low is None:
+            Low = High // 4
+        if not 0 <= Low < High:
+            raise ValueError('Low must be between 0 and %d, not %r' % (High - 1, Low))
+        self.Handle = Handle
+        self.High = High
+        self.Low = Low
+        self.MinInterval = MinInterval
+        self.MaxInterval = MaxInterval
+        self._estimate = None
+        self._rate = None
+        self._lock = _threading.Lock()
+        self._rx = _lib.DWORD()
+        self._tx = _lib.DWORD()
+        self._event = _lib.DWORD()
+        self._written = _lib.DWORD()
+        self._stats = _ret(Writes=0, Bytes=0, Transfers=0, Polls=0, Stalls=0, StallTime=0.0, MaxStall=0.0)
+
+    def GetQueueDepth(self):
+        """Read the number of bytes in the transmit queue of the device.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            int: The bytes queued for transmission.
+        """
+        _lib.FT_GetStatus(self.Handle, _c.byref(self._rx), _c.byref(self._tx), _c.byref(self._event))
+        self._stats.Polls += 1
+        self._estimate = self._tx.value
+        return self._estimate
+
+    def _pace(self, address, size):
+        """Write size bytes at address, yielding the times to wait in between."""
+        clock = _time.perf_counter
+        offset = 0
+        while offset < size:
+            if self._estimate is None:
+                self.GetQueueDepth()
+            if self._estimate >= self.High:
+                queued = self.GetQueueDepth()
+                # Resume only at Low, refilling a nearly full queue would write tiny chunks
+                if queued > self.Low:
+                    start = clock()
+                    last, last_time = queued, start
+                    while queued > self.Low:
+                        if self._rate:
+                            delay = (queued - self.Low) / self._rate
+                        else:
+                            delay = self.MinInterval
+                        yield min(max(delay, self.MinInterval), self.MaxInterval)
+                        queued = self.GetQueueDepth()
+                        now = clock()
+                        if queued < last:
+                            self._rate = (last - queued) / (now - last_time)
+                        last, last_time = queued, now
+                    stall = clock() - start
+                    stats = self._stats
+                    stats.Stalls += 1
+                    stats.StallTime += stall
+                    stats.MaxStall = max(stats.MaxStall, stall)
+            count = min(self.High - self._estimate, size - offset)
+            _lib.FT_Write(self.Handle, _c.c_void_p(address + offset), _lib.DWORD(count), _c.byref(self._written))
+            self._stats.Transfers += 1
+            written = self._written.value
+            # An upper bound until the next reading, the device drains meanwhile
+            self._estimate += written
+            offset += written
+            if written < count:
+                raise TimeoutError('Wrote %d of %d bytes within the write timeout' % (offset, size))
+
+    def _writes(self, Data):
+        """Yield the waits of writing Data, keeping the memory of Data valid meanwhile."""
+        if isinstance(Data, bytes):
+            size = len(Data)
+            address = _c.cast(_c.c_char_p(Data), _c.c_void_p).value
+            array = view = None
+        else:
+            view = memoryview(Data).cast('B')
+            size = len(view)
+            if view.readonly:
+                array = (_c.c_char * size).from_buffer_copy(view)
+            else:
+                array = (_c.c_char * size).from_buffer(view)
+            address = _c.addressof(array)
+        stats = self._stats
+        stats.Writes += 1
+        stats.Bytes += size
+        try:
+            if size:
+                yield from self._pace(address, size)
+        finally:
+            del array
+            if view is not None:
+                _release(view)
+
+    def Write(self, Data):
+        """Write data, waiting while the transmit queue is above the watermarks.
+
+        Args:
+            Data (bytes, bytearray, memoryview): The bytes to write.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: A write did not complete within the write timeout.
+
+        Returns:
+            int: The number of bytes written, always len(Data).
+        """
+        with self._lock:
+            for delay in self._writes(Data):
+                _time.sleep(delay)
+        return memoryview(Data).nbytes
+
+    async def WriteAsync(self, Data):
+        """Write data like Write, awaiting instead of blocking while the queue drains.
+        Calls must not overlap.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+            TimeoutError: A write did not complete within the write timeout.
+
+        Returns:
+            int: The number of bytes written, always len(Data).
+        """
+        import asyncio
+        for delay in self._writes(Data):
+            await asyncio.sleep(delay)
+        return memoryview(Data).nbytes
+
+    def Drain(self, Level=0):
+        """Wait until at most Level bytes are queued for transmission.
+
+        Raises:
+            StatusError: Gives a FT device error message.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            while self.GetQueueDepth() > Level:
+                _time.sleep(self.MinInterval)
+        return None
+
+    def GetStatistics(self):
+        """Return the pacing counters.
+
+        Returns:
+            dict: A dict also accecible as a munch.
+                Writes (int): Number of Write calls.
+                Bytes (int): Number of bytes written.
+                Transfers (int): Number of FT_Write calls.
+                Polls (int): Number of transmit queue readings.
+                Stalls (int): Number of waits for the queue to drain to Low.
+                StallTime (float): Total time in seconds spent waiting.
+                MaxStall (float): Longest single wait in seconds.
+                DrainRate (float): Last measured drain rate in bytes per second, None before the first stall.
+        """
+        stats = _ret(self._stats)
+        stats.DrainRate = self._rate
+        return stats
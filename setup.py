@@ -29,5 +29,12 @@ setup(
         "Operating System :: OS Independent",
     ],
     url='https://github.com/JulianS-Uni/pyftd2xx',  # project home page, if any
-    install_requires=([])
+    install_requires=([]),
+    extras_require={
+        'numpy': ['numpy'],
+        'cffi': ['cffi'],
+    },
+    entry_points={
+        'console_scripts': ['pyftd2xx = pyftd2xx.cli:main'],
+    },
 )
@@ -0,0 +1,24 @@
+import pytest
+import pyftd2xx as ft
+from pyftd2xx import _ftd2xx as _lib
+
+
+@pytest.fixture
+def sim():
+    """Bind the wrappers to two simulated loopback devices and restore the previous backend."""
+    previous = _lib._library
+    ft.UseBackend('sim:2')
+    try:
+        yield _lib._library
+    finally:
+        ft.UseBackend(previous)
+
+
+@pytest.fixture
+def handle(sim):
+    """An opened handle of the first simulated device."""
+    Handle = ft.Open(0)
+    try:
+        yield Handle
+    finally:
+        ft.Close(Handle)
@@ -0,0 +1,22 @@
+import pyftd2xx as ft
+
+
+def test_device_type():
+    Type = ft.FT.DECODE(ft.FT.DeviceType, ft.FT.FT_DEVICE_232H)
+    assert Type is ft.FT.DeviceType.FT_DEVICE_232H
+    assert str(Type) == 'FT_DEVICE_232H'
+    assert Type == ft.FT.FT_DEVICE_232H and hash(Type) == hash(ft.FT.FT_DEVICE_232H)
+    assert ft.FT.DECODE(ft.FT.DeviceType, 1000) == 1000
+
+
+def test_device_flags():
+    Flags = ft.FT.DECODE(ft.FT.DeviceFlags, 3)
+    assert ft.FT.DeviceFlags.FLAGS_OPENED in Flags
+    assert ft.FT.DeviceFlags.FLAGS_HISPEED in Flags
+    assert ft.FT.DECODE(ft.FT.DeviceFlags, 2) == ft.FT.FLAGS_HISPEED
+    assert ft.FT.DeviceFlags.FLAGS_OPENED not in ft.FT.DECODE(ft.FT.DeviceFlags, 2)
+
+
+def test_join_flags():
+    assert ft.FT.JOIN_FLAGS([ft.FT.LIST_ALL, ft.FT.OPEN_BY_LOCATION]) == ft.FT.LIST_ALL | ft.FT.OPEN_BY_LOCATION
+    assert ft.FT.JOIN_FLAGS(ft.FT.LIST_NUMBER_ONLY) == ft.FT.LIST_NUMBER_ONLY
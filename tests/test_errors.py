@@ -0,0 +1,62 @@
+import ctypes as _c
+import pytest
+import pyftd2xx as ft
+from pyftd2xx import pyftd2xx as _wrappers
+from pyftd2xx._sim import SimulatedLibrary
+
+
+class FailingLibrary(SimulatedLibrary):
+    """Simulated devices whose FT_GetQueueStatus returns Status."""
+    Status = ft.FT.OK
+
+    def FT_GetQueueStatus(self, ftHandle, dwRxBytes):
+        if self.Status != ft.FT.OK:
+            return self.Status
+        return SimulatedLibrary.FT_GetQueueStatus(self, ftHandle, dwRxBytes)
+
+
+def test_invalid_handle(sim):
+    with pytest.raises(ft.InvalidHandleError) as info:
+        ft.GetQueueStatus(_c.c_void_p(0xdead))
+    assert info.value.Status == ft.FT.INVALID_HANDLE
+    assert info.value.Status is ft.FT.Status.INVALID_HANDLE
+    assert info.value.Function == 'FT_GetQueueStatus'
+    assert info.value.Handle == 0xdead
+    assert str(info.value) == 'FT_INVALID_HANDLE (FT_GetQueueStatus)'
+
+
+def test_closed_handle(handle):
+    Handle = ft.Open(1)
+    ft.Close(Handle)
+    with pytest.raises(ft.InvalidHandleError):
+        ft.Read(Handle, 1)
+
+
+@pytest.mark.parametrize('Status, Error', [
+    (ft.FT.DEVICE_NOT_FOUND, ft.DeviceNotFoundError),
+    (ft.FT.IO_ERROR, ft.IoError),
+    (ft.FT.INSUFFICIENT_RESOURCES, ft.InsufficientResourcesError),
+    (ft.FT.DEVICE_LIST_NOT_READY, ft.DeviceListNotReadyError),
+])
+def test_transient_status(sim, Status, Error):
+    Library = FailingLibrary(1)
+    ft.UseBackend(Library)
+    Handle = ft.Open(0)
+    Library.Status = Status
+    with pytest.raises(Error) as info:
+        ft.GetQueueStatus(Handle)
+    assert type(info.value) is Error
+    assert isinstance(info.value, ft.TransientStatusError)
+    assert info.value.Status == Status
+    assert info.value.Function == 'FT_GetQueueStatus'
+    assert Status in ft.TRANSIENT_STATUS
+
+
+def test_permanent_status():
+    assert not issubclass(ft.InvalidHandleError, ft.TransientStatusError)
+    assert ft.FT.INVALID_HANDLE not in ft.TRANSIENT_STATUS
+
+
+def test_status_error_alias():
+    assert _wrappers._StatusError is ft.StatusError
+    assert issubclass(ft.InvalidHandleError, _wrappers._StatusError)
@@ -0,0 +1,32 @@
+import asyncio
+import pyftd2xx as ft
+from pyftd2xx._sim import SimulatedDevice
+
+
+def test_poll(sim):
+    Monitor = ft.HotplugMonitor(FullScanInterval=0.0)
+    assert Monitor.GetDevices() == {('SIM00000', 0x1000), ('SIM00001', 0x1001)}
+    sim.Devices.append(SimulatedDevice(2))
+    Events = Monitor.Poll()
+    assert [(Event.Event, Event.SerialNumber, Event.Location) for Event in Events] == [(ft.ARRIVAL, 'SIM00002', 0x1002)]
+    del sim.Devices[0]
+    assert [(Event.Event, Event.SerialNumber) for Event in Monitor.Poll()] == [(ft.REMOVAL, 'SIM00000')]
+    assert Monitor.Poll() == []
+
+
+def test_async_iteration(sim):
+    Monitor = ft.HotplugMonitor(Interval=0.01)
+
+    async def first_event():
+        with Monitor:
+            async for Event in Monitor:
+                return Event
+
+    async def main():
+        Waiter = asyncio.ensure_future(first_event())
+        await asyncio.sleep(0.1)
+        sim.Devices.append(SimulatedDevice(2))
+        return await asyncio.wait_for(Waiter, 5.0)
+
+    Event = asyncio.run(main())
+    assert (Event.Event, Event.SerialNumber) == (ft.ARRIVAL, 'SIM00002')
@@ -0,0 +1,97 @@
+import pytest
+import pyftd2xx as ft
+
+
+def test_list_devices_number_only(sim):
+    assert ft.ListDevices(ft.FT.LIST_NUMBER_ONLY) == 2
+
+
+def test_list_devices_all_by_serial_number(sim):
+    # The wrapper passes one spare NULL entry to terminate the list of buffers
+    assert ft.ListDevices(ft.FT.LIST_ALL | ft.FT.OPEN_BY_SERIAL_NUMBER) == ['SIM00000', 'SIM00001']
+
+
+def test_list_devices_all_by_description(sim):
+    assert ft.ListDevices(ft.FT.LIST_ALL | ft.FT.OPEN_BY_DESCRIPTION) == ['Simulated FT232H'] * 2
+
+
+def test_list_devices_all_by_location(sim):
+    assert ft.ListDevices(ft.FT.LIST_ALL | ft.FT.OPEN_BY_LOCATION) == [0x1000, 0x1001]
+
+
+def test_list_devices_by_index(sim):
+    assert ft.ListDevices(ft.FT.LIST_BY_INDEX | ft.FT.OPEN_BY_SERIAL_NUMBER, 1) == 'SIM00001'
+    assert ft.ListDevices(ft.FT.LIST_BY_INDEX | ft.FT.OPEN_BY_LOCATION, 1) == 0x1001
+
+
+def test_get_device_info_list(sim):
+    assert ft.CreateDeviceInfoList() == 2
+    Infos = ft.GetDeviceInfoList()
+    assert [Info.Index for Info in Infos] == [0, 1]
+    assert [Info.SerialNumber for Info in Infos] == ['SIM00000', 'SIM00001']
+    assert Infos[0].Type == 'FT_DEVICE_232H'
+    assert Infos[0].Description == 'Simulated FT232H'
+    assert Infos[0].Flags == ['FLAGS_HISPEED']
+    assert dict(Infos[1])['LocId'] == 0x1001
+
+
+def test_get_device_info_detail(sim):
+    ft.CreateDeviceInfoList()
+    Info = ft.GetDeviceInfoDetail(1)
+    Listed = ft.GetDeviceInfoList()[1]
+    assert [Info[Key] for Key in Info if Key != 'Handle'] == [Listed[Key] for Key in Listed if Key != 'Handle']
+    assert Info['SerialNumber'] == 'SIM00001'
+    assert Info.Location == 0x1001
+    assert Info.ID == 0x04036014
+
+
+def test_get_device_info_detail_of_opened_device(handle):
+    ft.CreateDeviceInfoList()
+    Info = ft.GetDeviceInfoDetail(0)
+    assert 'FLAGS_OPENED' in Info.Flags
+    assert Info.Handle.value == handle.value
+
+
+def test_device_info_typed_fields(handle):
+    ft.CreateDeviceInfoList()
+    Info = ft.GetDeviceInfoDetail(0)
+    assert Info.FlagsValue == ft.FT.DeviceFlags.FLAGS_OPENED | ft.FT.DeviceFlags.FLAGS_HISPEED
+    assert ft.FT.DeviceFlags.FLAGS_OPENED in Info.FlagsValue
+    assert Info.TypeValue is ft.FT.DeviceType.FT_DEVICE_232H
+    assert str(Info.TypeValue) == Info.Type
+    assert 'FlagsValue' not in Info
+
+
+@pytest.mark.parametrize('Data', [
+    b'a\0b\0\0c',
+    [97, 0, 98, 0, 0, 99],
+    bytearray(b'a\0b\0\0c'),
+    memoryview(b'axx\0xxbxx\0xx\0xxcxx')[::3],
+], ids=['bytes', 'list', 'bytearray', 'strided-memoryview'])
+def test_write_read_with_nuls(handle, Data):
+    assert ft.Write(handle, Data) == 6
+    assert ft.GetQueueStatus(handle) == 6
+    assert ft.Read(handle, 16) == b'a\0b\0\0c'
+    assert ft.GetQueueStatus(handle) == 0
+
+
+def test_read_returns_what_is_queued(handle):
+    ft.Write(handle, b'\0' * 4)
+    assert ft.Read(handle, 2) == b'\0\0'
+    assert ft.Read(handle, 8) == b'\0\0'
+    assert ft.Read(handle, 8) == b''
+
+
+def test_user_area(handle):
+    assert ft.EE_UASize(handle) == 256
+    ft.EE_UAWrite(handle, b'id\0\x01')
+    assert ft.EE_UARead(handle, 4) == b'id\0\x01'
+    ft.EE_UAWrite(handle, bytearray(b'xyz'), 2)
+    assert ft.EE_UARead(handle, 4) == b'xy\0\x01'
+
+
+def test_user_area_into_buffer(handle):
+    ft.EE_UAWrite(handle, memoryview(b'\x01\x02\x03'))
+    Buffer = bytearray(8)
+    assert ft.EE_UARead(handle, 3, Buffer) == 3
+    assert Buffer == b'\x01\x02\x03' + bytes(5)
@@ -0,0 +1,90 @@
+import ctypes as _c
+import threading as _threading
+import pytest
+import pyftd2xx as ft
+from pyftd2xx import _backend
+from pyftd2xx._sim import SimulatedLibrary
+
+
+class RecordingLibrary(object):
+    """Serves the calls from simulated devices and records them. Unlike a Python
+    backend it is treated like the native library, so FT_Read is expected to block."""
+    def __init__(self, Library):
+        self.Library = Library
+        self.Calls = []
+
+    def __getattr__(self, name):
+        if not name.startswith('FT_'):
+            raise AttributeError(name)
+        implementation = getattr(self.Library, name).implementation
+        def record(*args):
+            self.Calls.append((name, args))
+            return implementation(*args)
+        function = _backend.Function(name, record)
+        setattr(self, name, function)
+        return function
+
+    def Timeouts(self):
+        return list(tuple(_backend.Value(arg) for arg in args[1:])
+                for name, args in self.Calls if name == 'FT_SetTimeouts')
+
+
+@pytest.fixture
+def recording(sim):
+    Library = RecordingLibrary(SimulatedLibrary(1))
+    ft.UseBackend(Library)
+    Handle = ft.Open(0)
+    try:
+        yield Library, Handle
+    finally:
+        ft.Close(Handle)
+
+
+def test_read_at_least_queued(handle):
+    ft.Write(handle, b'abcdef')
+    assert ft.ReadAtLeast(handle, 2, 4) == b'abcd'
+    assert ft.ReadAtLeast(handle, 1) == b'ef'
+
+
+def test_read_at_least_polls_python_backend(handle):
+    Timer = _threading.Timer(0.02, ft.Write, (handle, b'abc'))
+    Timer.start()
+    try:
+        assert ft.ReadAtLeast(handle, 3, Timeout=2.0) == b'abc'
+    finally:
+        Timer.join()
+    assert ft.ReadAtLeast(handle, 1, Timeout=0.01) == b''
+
+
+def test_read_at_least_into_buffer(handle):
+    ft.Write(handle, b'abc')
+    Buffer = bytearray(8)
+    assert ft.ReadAtLeast(handle, 3, Buffer=Buffer) == 3
+    assert Buffer[:3] == b'abc'
+
+
+def test_read_at_least_sets_known_timeouts(recording):
+    Library, Handle = recording
+    ft.SetTimeouts(Handle, 500, 100)
+    assert ft.ReadAtLeast(Handle, 4, Timeout=0.2) == b''
+    Timeouts = Library.Timeouts()
+    assert len(Timeouts) == 3
+    assert Timeouts[0] == (500, 100)
+    assert 1 <= Timeouts[1][0] <= 200 and Timeouts[1][1] == 100
+    assert Timeouts[2] == (500, 100)
+
+
+def test_read_at_least_polls_unknown_timeouts(recording):
+    Library, Handle = recording
+    assert ft.ReadAtLeast(Handle, 4, Timeout=0.01) == b''
+    assert Library.Timeouts() == []
+    assert sum(name == 'FT_GetQueueStatusEx' for name, args in Library.Calls) > 1
+
+
+def test_read_at_least_forgets_timeouts_on_close(recording):
+    Library, Handle = recording
+    ft.SetTimeouts(Handle, 500, 100)
+    ft.Close(Handle)
+    Handle = ft.Open(0)
+    ft.ReadAtLeast(Handle, 4, Timeout=0.01)
+    assert Library.Timeouts() == [(500, 100)]
@@ -0,0 +1,28 @@
+import pyftd2xx as ft
+
+
+def _session():
+    Handle = ft.Open(1)
+    try:
+        Results = [ft.Write(Handle, b'ab\0c'), ft.GetQueueStatus(Handle), ft.Read(Handle, 3),
+                ft.GetQueueStatus(Handle), ft.Read(Handle, 8)]
+    finally:
+        ft.Close(Handle)
+    Handle = ft.OpenEx(0x1000, ft.FT.OPEN_BY_LOCATION)
+    ft.Close(Handle)
+    ft.CreateDeviceInfoList()
+    Results.append([dict((Key, Info[Key]) for Key in Info if Key != 'Handle') for Info in ft.GetDeviceInfoList()])
+    return Results
+
+
+def test_record_and_replay(sim, tmp_path):
+    Path = str(tmp_path / 'session.ftrec')
+    with ft.Recorder(Path) as Recording:
+        Recorded = _session()
+    assert Recording.Calls > 0
+    assert Recorded[:5] == [4, 4, b'ab\0', 1, b'c']
+
+    Library = ft.ReplayLibrary(Path, Speed=None)
+    ft.UseBackend(Library)
+    assert _session() == Recorded
+    assert Library.Remaining == 0
@@ -0,0 +1,102 @@
+import pytest
+import pyftd2xx as ft
+from pyftd2xx._sim import SimulatedLibrary
+
+
+class FlakyLibrary(SimulatedLibrary):
+    """Simulated devices failing the next calls of a function with the queued statuses.
+    CyclePort power cycles the device, which loses its configuration."""
+    def __init__(self, Devices=1):
+        SimulatedLibrary.__init__(self, Devices)
+        self.Failures = {}
+        self.Cycles = 0
+
+    def Fail(self, Name, *Statuses):
+        self.Failures.setdefault(Name, []).extend(Statuses)
+
+    def _fail(self, name):
+        statuses = self.Failures.get(name)
+        return statuses.pop(0) if statuses else ft.FT.OK
+
+    def FT_Read(self, ftHandle, lpBuffer, dwBytesToRead, lpBytesReturned):
+        return self._fail('FT_Read') or SimulatedLibrary.FT_Read(self, ftHandle, lpBuffer, dwBytesToRead, lpBytesReturned)
+
+    def FT_Write(self, ftHandle, lpBuffer, dwBytesToWrite, lpBytesWritten):
+        return self._fail('FT_Write') or SimulatedLibrary.FT_Write(self, ftHandle, lpBuffer, dwBytesToWrite, lpBytesWritten)
+
+    def FT_CyclePort(self, ftHandle):
+        device = self._device(ftHandle)
+        if device is None:
+            return ft.FT.INVALID_HANDLE
+        device.LatencyTimer = 16
+        device.BitMode = 0
+        self.Cycles += 1
+        return ft.FT.OK
+
+
+@pytest.fixture
+def flaky(sim):
+    Library = FlakyLibrary()
+    ft.UseBackend(Library)
+    return Library
+
+
+def _policy(**Args):
+    return ft.RetryPolicy(Backoff=0.0, ReopenDelay=0.0, **Args)
+
+
+def test_retry_recovers(flaky):
+    with ft.ResilientDevice('SIM00000', ft.FT.OPEN_BY_SERIAL_NUMBER, _policy()) as Device:
+        Device.Write(b'abc')
+        flaky.Fail('FT_Read', ft.FT.IO_ERROR)
+        # The first escalation step purges the receive queue
+        assert Device.Read(3) == b''
+        Metrics = Device.GetMetrics()
+        assert (Metrics.Calls, Metrics.Retries, Metrics.Recoveries, Metrics.Failures) == (2, 1, 1, 0)
+        assert Metrics.Escalations.Purge == 1
+
+
+def test_configuration_restored_after_reopen(flaky):
+    Device = flaky.Devices[0]
+    with ft.ResilientDevice(0x1000, ft.FT.OPEN_BY_LOCATION, _policy()) as Resilient:
+        Resilient.SetLatencyTimer(2)
+        Resilient.SetBitMode(0xff, ft.FT.BITMODE_SYNC_FIFO)
+        flaky.Fail('FT_Read', ft.FT.IO_ERROR, ft.FT.DEVICE_NOT_FOUND, ft.FT.IO_ERROR, ft.FT.DEVICE_NOT_FOUND)
+        assert Resilient.Read(1) == b''
+        assert flaky.Cycles == 1
+        assert Resilient.GetMetrics().Reopens == 1
+        assert (Device.LatencyTimer, Device.BitMode) == (2, ft.FT.BITMODE_SYNC_FIFO)
+        assert Device.Opened
+
+
+def test_retry_gives_up(flaky):
+    with ft.ResilientDevice('SIM00000', ft.FT.OPEN_BY_SERIAL_NUMBER, _policy(MaxAttempts=2, Escalation=())) as Device:
+        flaky.Fail('FT_Read', ft.FT.IO_ERROR, ft.FT.IO_ERROR)
+        with pytest.raises(ft.IoError):
+            Device.Read(1)
+        Metrics = Device.GetMetrics()
+        assert (Metrics.Retries, Metrics.Failures) == (1, 1)
+
+
+def test_permanent_error_not_retried(flaky):
+    with ft.ResilientDevice('SIM00000', ft.FT.OPEN_BY_SERIAL_NUMBER, _policy()) as Device:
+        flaky.Fail('FT_Read', ft.FT.INVALID_PARAMETER)
+        with pytest.raises(ft.InvalidParameterError):
+            Device.Read(1)
+        assert Device.GetMetrics().Retries == 0
+
+
+def test_write_not_retried_by_default(flaky):
+    with ft.ResilientDevice('SIM00000', ft.FT.OPEN_BY_SERIAL_NUMBER, _policy()) as Device:
+        flaky.Fail('FT_Write', ft.FT.IO_ERROR)
+        with pytest.raises(ft.IoError):
+            Device.Write(b'abc')
+        assert Device.GetMetrics().Retries == 0
+
+
+def test_write_retried_when_allowed(flaky):
+    with ft.ResilientDevice('SIM00000', ft.FT.OPEN_BY_SERIAL_NUMBER, _policy(RetryWrites=True, Escalation=())) as Device:
+        flaky.Fail('FT_Write', ft.FT.IO_ERROR)
+        assert Device.Write(b'abc') == 3
+        assert Device.Read(3) == b'abc'
+        assert Device.GetMetrics().Retries == 1